@@ -1,15 +1,63 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, Iterator, Optional
 
+from app.instrumentation import OperationDetail, argument, instrumented
 from app.settings import get_db_path
+from app.text import book_search_text
+
+# Версия схемы (PRAGMA user_version); увеличивается при каждом её изменении
+SCHEMA_VERSION = 2
+
+# Сколько ждать освобождения БД другим процессом/соединением
+BUSY_TIMEOUT_MS = 30_000
+
+# Сколько простаивающих соединений фоновых потоков держать открытыми
+_POOL_SIZE = 4
+
+# Настройки, применяемые к каждому соединению
+_CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON;",
+    # В режиме WAL фиксация без fsync журнала остаётся согласованной
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA cache_size = -16000;",
+    "PRAGMA mmap_size = 268435456;",
+    "PRAGMA temp_store = MEMORY;",
+)
+
+
+def _describe_sql(args: tuple, kwargs: dict, result: Any) -> OperationDetail:
+    """Подробности запроса для замеров: SQL одной строкой."""
+    return OperationDetail(" ".join(str(argument(args, kwargs, 1, "sql")).split()))
+
+
+class _SharedState:
+    """Общее состояние всех соединений с одной БД (основного и фоновых)."""
+
+    def __init__(self) -> None:
+        # Писатель в SQLite всегда один: запись сериализуется внутри процесса,
+        # а не через повторные попытки по SQLITE_BUSY
+        self.write_lock = threading.RLock()
+        self.idle: list[sqlite3.Connection] = []
+        self.pool_lock = threading.Lock()
 
 
 class Database:
-    """Низкоуровневый доступ к SQLite (соединение + выполнение запросов)."""
+    """Низкоуровневый доступ к SQLite (соединение + выполнение запросов).
+
+    БД работает в режиме WAL: читатели не блокируют писателя и друг друга,
+    поэтому фоновые задачи (через `clone()`) читают и пишут, пока окно
+    выполняет запросы. Запись сериализуется общей блокировкой, соединения
+    фоновых задач после `close()` возвращаются в небольшой пул.
+
+    Вне транзакции каждый вызов `execute()`/`executemany()` фиксируется сразу;
+    внутри `transaction()` изменения фиксируются один раз в конце блока.
+    """
 
     def __init__(self, db_path: Optional[Path] = None) -> None:
         """Инициализирует объект БД.
@@ -19,6 +67,10 @@ class Database:
         """
         self._db_path = str(db_path or get_db_path())
         self._conn: Optional[sqlite3.Connection] = None
+        self._shared = _SharedState()
+        self._pooled = False
+        # Глубина вложенности transaction() (больше 1 — точки сохранения)
+        self._tx_depth = 0
 
     @property
     def conn(self) -> sqlite3.Connection:
@@ -36,12 +88,131 @@ class Database:
             )
         return self._conn
 
+    @property
+    def path(self) -> str:
+        """Путь к файлу БД."""
+        return self._db_path
+
     def initialize(self) -> None:
-        """Открывает соединение и создаёт схему БД, если её нет."""
-        self._conn = sqlite3.connect(self._db_path)
-        self._conn.row_factory = sqlite3.Row
-        self._conn.execute("PRAGMA foreign_keys = ON;")
-        self._create_schema()
+        """Открывает соединение и создаёт схему БД, если её нет.
+
+        Проверка и миграция схемы выполняются, только если версия схемы
+        в файле БД отличается от `SCHEMA_VERSION`, поэтому обычный запуск
+        обходится одним чтением заголовка БД.
+        """
+        self._conn = self._connect()
+        # Режим журнала хранится в файле БД и действует для всех соединений
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        version = self._conn.execute("PRAGMA user_version;").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._create_schema()
+
+    def clone(self) -> "Database":
+        """Выдаёт отдельное соединение с той же БД для фонового потока.
+
+        Соединение одновременно используется только одним потоком, поэтому
+        фоновые задачи работают через собственный экземпляр Database.
+        Соединение берётся из пула простаивающих (или открывается новое) и
+        возвращается туда при `close()`. Схема при этом не создаётся —
+        предполагается, что initialize() уже вызван.
+
+        Returns:
+            Новый Database с открытым соединением.
+        """
+        other = Database(Path(self._db_path))
+        other._shared = self._shared
+        other._pooled = True
+        with self._shared.pool_lock:
+            conn = self._shared.idle.pop() if self._shared.idle else None
+        other._conn = conn or other._connect()
+        return other
+
+    def close(self) -> None:
+        """Закрывает соединение (соединение клона возвращается в пул)."""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+
+        if self._pooled:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._shared.pool_lock:
+                if len(self._shared.idle) < _POOL_SIZE:
+                    self._shared.idle.append(conn)
+                    return
+            conn.close()
+            return
+
+        # Основное соединение закрывает и пул
+        with self._shared.pool_lock:
+            idle, self._shared.idle = self._shared.idle, []
+        for other in idle:
+            other.close()
+        conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Выполняет блок как одну транзакцию записи.
+
+        Транзакция начинается с `BEGIN IMMEDIATE` под общей блокировкой
+        писателя, фиксируется при успешном завершении блока и откатывается
+        при исключении. Вложенный вызов создаёт точку сохранения: ошибка
+        внутри него откатывает только его изменения, а исключение
+        передаётся дальше.
+
+        Yields:
+            Соединение текущего экземпляра.
+        """
+        conn = self.conn
+        with self._shared.write_lock:
+            if self._tx_depth:
+                name = f"sp_{self._tx_depth}"
+                conn.execute(f"SAVEPOINT {name};")
+                self._tx_depth += 1
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute(f"ROLLBACK TO {name};")
+                    raise
+                finally:
+                    self._tx_depth -= 1
+                    conn.execute(f"RELEASE {name};")
+                return
+
+            conn.execute("BEGIN IMMEDIATE;")
+            self._tx_depth = 1
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                self._tx_depth = 0
+
+    @property
+    def in_transaction(self) -> bool:
+        """Выполняется ли сейчас блок `transaction()`."""
+        return self._tx_depth > 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Создаёт и настраивает новое соединение.
+
+        Returns:
+            sqlite3.Connection.
+        """
+        # Соединения пула переходят между потоками, но используются
+        # только одним потоком одновременно
+        conn = sqlite3.connect(
+            self._db_path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
 
     def _create_schema(self) -> None:
         """Создаёт таблицы приложения."""
@@ -55,22 +226,193 @@ class Database:
                 size_bytes INTEGER NOT NULL DEFAULT 0,
                 format TEXT NOT NULL DEFAULT 'pdf',
                 added_at TEXT NOT NULL,
-                note TEXT NOT NULL DEFAULT ''
+                note TEXT NOT NULL DEFAULT '',
+                mtime REAL NOT NULL DEFAULT 0,
+                fingerprint TEXT NOT NULL DEFAULT '',
+                search_text TEXT NOT NULL DEFAULT '',
+                content_hash TEXT NOT NULL DEFAULT ''
             );
 
             CREATE INDEX IF NOT EXISTS idx_books_title ON books(title);
+            CREATE INDEX IF NOT EXISTS idx_books_title_nocase
+                ON books(title COLLATE NOCASE);
             CREATE INDEX IF NOT EXISTS idx_books_added_at ON books(added_at);
+            CREATE INDEX IF NOT EXISTS idx_books_size ON books(size_bytes);
 
             CREATE TABLE IF NOT EXISTS settings (
                 key TEXT PRIMARY KEY,
                 value TEXT NOT NULL
             );
+
+            CREATE TABLE IF NOT EXISTS book_index (
+                book_id INTEGER PRIMARY KEY REFERENCES books(id) ON DELETE CASCADE,
+                page_count INTEGER NOT NULL DEFAULT 0,
+                indexed_at TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS watched_folders (
+                path TEXT PRIMARY KEY,
+                added_at TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                book_id INTEGER PRIMARY KEY REFERENCES books(id) ON DELETE CASCADE,
+                fingerprint TEXT NOT NULL DEFAULT '',
+                png BLOB NOT NULL
+            );
             """
         )
+        added = self._add_missing_columns(
+            "books",
+            {
+                "mtime": "REAL NOT NULL DEFAULT 0",
+                "fingerprint": "TEXT NOT NULL DEFAULT ''",
+                "search_text": "TEXT NOT NULL DEFAULT ''",
+                "content_hash": "TEXT NOT NULL DEFAULT ''",
+            },
+        )
+        if "search_text" in added:
+            self._fill_search_text()
+        self._create_fulltext_schema()
+        self._create_search_schema()
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
         self.conn.commit()
 
+    def _add_missing_columns(self, table: str, columns: dict[str, str]) -> list[str]:
+        """Добавляет в существующую таблицу колонки, появившиеся в новых версиях.
+
+        Args:
+            table: Имя таблицы.
+            columns: Словарь {имя колонки: SQL определение}.
+
+        Returns:
+            Имена добавленных колонок.
+        """
+        existing = {
+            row["name"] for row in self.conn.execute(f"PRAGMA table_info({table});")
+        }
+        added = []
+        for name, definition in columns.items():
+            if name not in existing:
+                self.conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {name} {definition};"
+                )
+                added.append(name)
+        return added
+
+    def _fill_search_text(self) -> None:
+        """Заполняет поисковый текст книг из версии без него."""
+        rows = self.conn.execute("SELECT id, title, author, note FROM books;")
+        self.conn.executemany(
+            "UPDATE books SET search_text = ? WHERE id = ?;",
+            [
+                (book_search_text(r["title"], r["author"], r["note"]), r["id"])
+                for r in rows.fetchall()
+            ],
+        )
+
+    def _create_fulltext_schema(self) -> None:
+        """Создаёт полнотекстовый индекс страниц книг (FTS5).
+
+        Предпочтительно используется токенизатор trigram (поиск подстроки,
+        как у `page.search_for()`); если SQLite собран без него (< 3.34),
+        используется unicode61 с поиском по префиксам слов.
+        """
+        try:
+            self.conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS book_pages USING fts5(
+                    text, book_id UNINDEXED, page_index UNINDEXED,
+                    tokenize = 'trigram'
+                );
+                """
+            )
+        except sqlite3.OperationalError:
+            self.conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS book_pages USING fts5(
+                    text, book_id UNINDEXED, page_index UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                );
+                """
+            )
+
+        # Страницы удалённой книги удаляются вместе с ней
+        self.conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_books_delete_pages
+            AFTER DELETE ON books
+            BEGIN
+                DELETE FROM book_pages WHERE book_id = old.id;
+            END;
+            """
+        )
+
+    def _create_search_schema(self) -> None:
+        """Создаёт индекс поиска книг по названию, автору и заметке.
+
+        Индексируется колонка `books.search_text` (casefold выполняется в Python,
+        так как `lower()` SQLite не приводит регистр кириллицы). Таблица FTS5
+        хранит только индекс (external content) и поддерживается триггерами.
+        """
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'book_search';"
+        ).fetchone()
+        if exists:
+            return
+
+        options = "content = 'books', content_rowid = 'id'"
+        try:
+            self.conn.execute(
+                f"""
+                CREATE VIRTUAL TABLE book_search USING fts5(
+                    search_text, {options}, tokenize = 'trigram'
+                );
+                """
+            )
+        except sqlite3.OperationalError:
+            self.conn.execute(
+                f"""
+                CREATE VIRTUAL TABLE book_search USING fts5(
+                    search_text, {options}, tokenize = 'unicode61 remove_diacritics 2'
+                );
+                """
+            )
+
+        self.conn.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_books_search_insert
+            AFTER INSERT ON books
+            BEGIN
+                INSERT INTO book_search(rowid, search_text)
+                VALUES (new.id, new.search_text);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_books_search_delete
+            AFTER DELETE ON books
+            BEGIN
+                INSERT INTO book_search(book_search, rowid, search_text)
+                VALUES ('delete', old.id, old.search_text);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_books_search_update
+            AFTER UPDATE OF search_text ON books
+            BEGIN
+                INSERT INTO book_search(book_search, rowid, search_text)
+                VALUES ('delete', old.id, old.search_text);
+                INSERT INTO book_search(rowid, search_text)
+                VALUES (new.id, new.search_text);
+            END;
+            """
+        )
+        # Индекс для книг, добавленных до появления таблицы
+        self.conn.execute("INSERT INTO book_search(book_search) VALUES ('rebuild');")
+
+    @instrumented("db.execute", _describe_sql)
     def execute(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
-        """Выполняет SQL запрос (INSERT/UPDATE/DELETE) и фиксирует транзакцию.
+        """Выполняет SQL запрос (INSERT/UPDATE/DELETE).
+
+        Вне `transaction()` изменение сразу фиксируется.
 
         Args:
             sql: SQL строка.
@@ -79,10 +421,33 @@ class Database:
         Returns:
             sqlite3.Cursor.
         """
-        cur = self.conn.execute(sql, tuple(params))
-        self.conn.commit()
-        return cur
+        if self._tx_depth:
+            return self.conn.execute(sql, tuple(params))
+        with self.transaction() as conn:
+            return conn.execute(sql, tuple(params))
+
+    @instrumented("db.executemany", _describe_sql)
+    def executemany(
+        self, sql: str, seq_of_params: Iterable[Iterable[Any]]
+    ) -> sqlite3.Cursor:
+        """Выполняет SQL запрос для каждого набора параметров.
+
+        Вне `transaction()` все изменения фиксируются одной транзакцией.
+
+        Args:
+            sql: SQL строка.
+            seq_of_params: Наборы параметров.
+
+        Returns:
+            sqlite3.Cursor.
+        """
+        rows = (tuple(p) for p in seq_of_params)
+        if self._tx_depth:
+            return self.conn.executemany(sql, rows)
+        with self.transaction() as conn:
+            return conn.executemany(sql, rows)
 
+    @instrumented("db.query", _describe_sql)
     def query(self, sql: str, params: Iterable[Any] = ()) -> list[sqlite3.Row]:
         """Выполняет SELECT и возвращает строки результата.
 
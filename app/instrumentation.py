@@ -0,0 +1,433 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from app.settings import get_app_dir
+
+# Переменная окружения, включающая замеры (читается один раз при запуске)
+PROFILE_ENV = "BOOKVAULT_PROFILE"
+# Переменная окружения с порогом медленной операции (мс)
+SLOW_MS_ENV = "BOOKVAULT_SLOW_MS"
+
+ENABLED = bool(os.environ.get(PROFILE_ENV))
+
+# Операции дольше порога попадают в журнал медленных операций
+DEFAULT_SLOW_MS = 250
+# Верхние границы корзин гистограммы задержек (мс); последняя корзина — выше
+LATENCY_BOUNDS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+# Размер журнала, после которого он переименовывается в *.1
+SLOW_LOG_MAX_BYTES = 1_000_000
+# Сколько последних медленных операций показывать в отчёте
+_RECENT_SLOW = 50
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class OperationDetail:
+    """Подробности вызова для статистики и журнала медленных операций.
+
+    Attributes:
+        subject: Файл, папка, запрос или SQL, над которым выполнялась операция.
+        pages: Сколько страниц обработано.
+        nbytes: Сколько байт обработано.
+    """
+
+    subject: str = ""
+    pages: int = 0
+    nbytes: int = 0
+
+
+# Описание вызова: (позиционные аргументы, именованные, результат) -> подробности.
+# Для генераторов вместо результата передаётся число выданных элементов.
+Describe = Callable[[tuple, dict, Any], OperationDetail]
+
+
+@dataclass
+class OperationStats:
+    """Накопленная статистика одной операции."""
+
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    pages: int = 0
+    nbytes: int = 0
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BOUNDS_MS) + 1)
+    )
+
+    def add(
+        self, seconds: float, detail: Optional[OperationDetail], error: bool
+    ) -> None:
+        """Учитывает один вызов."""
+        self.count += 1
+        self.errors += error
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if detail is not None:
+            self.pages += detail.pages
+            self.nbytes += detail.nbytes
+        ms = seconds * 1000
+        for index, bound in enumerate(LATENCY_BOUNDS_MS):
+            if ms <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    @property
+    def mean_ms(self) -> float:
+        """Средняя задержка (мс)."""
+        return self.total_seconds * 1000 / self.count if self.count else 0.0
+
+    def quantile_ms(self, q: float) -> float:
+        """Оценка квантиля задержки по гистограмме (верхняя граница корзины).
+
+        Args:
+            q: Квантиль от 0 до 1.
+
+        Returns:
+            Задержка в миллисекундах (для последней корзины — максимум).
+        """
+        target = q * self.count
+        seen = 0
+        for index, bound in enumerate(LATENCY_BOUNDS_MS):
+            seen += self.buckets[index]
+            if seen >= target:
+                return float(bound)
+        return self.max_seconds * 1000
+
+
+@dataclass(frozen=True)
+class SlowOperation:
+    """Запись журнала медленных операций."""
+
+    at: str
+    name: str
+    ms: float
+    subject: str
+    pages: int
+    nbytes: int
+    thread: str
+    error: bool
+
+
+class Metrics:
+    """Счётчики, гистограммы задержек и журнал медленных операций.
+
+    Потокобезопасен: операции записываются из окна и фоновых потоков.
+    Медленные операции дописываются в журнал (JSON по строке на запись)
+    и хранятся в памяти для отчёта `dump()`.
+    """
+
+    def __init__(
+        self, log_path: Optional[Path], slow_ms: float = DEFAULT_SLOW_MS
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            log_path: Путь к журналу медленных операций (None — без журнала).
+            slow_ms: Порог медленной операции (мс).
+        """
+        self._log_path = log_path
+        self._slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._stats: dict[str, OperationStats] = {}
+        self._recent: deque[SlowOperation] = deque(maxlen=_RECENT_SLOW)
+        self._started = datetime.now()
+
+    @property
+    def log_path(self) -> Optional[Path]:
+        """Путь к журналу медленных операций."""
+        return self._log_path
+
+    @property
+    def slow_ms(self) -> float:
+        """Порог медленной операции (мс)."""
+        return self._slow_ms
+
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        detail: Optional[OperationDetail] = None,
+        error: bool = False,
+        slow_ms: Optional[float] = None,
+    ) -> None:
+        """Учитывает вызов операции.
+
+        Args:
+            name: Название операции (например, "pdf.render_page").
+            seconds: Длительность.
+            detail: Подробности вызова.
+            error: Вызов завершился исключением.
+            slow_ms: Порог медленной операции для неё (None — общий).
+        """
+        threshold = self._slow_ms if slow_ms is None else slow_ms
+        slow = None
+        if seconds * 1000 >= threshold:
+            detail = detail or OperationDetail()
+            slow = SlowOperation(
+                at=datetime.now().isoformat(timespec="milliseconds"),
+                name=name,
+                ms=round(seconds * 1000, 1),
+                subject=detail.subject,
+                pages=detail.pages,
+                nbytes=detail.nbytes,
+                thread=threading.current_thread().name,
+                error=error,
+            )
+
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = OperationStats()
+            stats.add(seconds, detail, error)
+            if slow is not None:
+                self._recent.append(slow)
+                self._write_slow(slow)
+
+    def stats(self) -> dict[str, OperationStats]:
+        """Возвращает копию статистики по операциям."""
+        with self._lock:
+            return {
+                name: OperationStats(
+                    s.count,
+                    s.errors,
+                    s.total_seconds,
+                    s.max_seconds,
+                    s.pages,
+                    s.nbytes,
+                    list(s.buckets),
+                )
+                for name, s in self._stats.items()
+            }
+
+    def recent_slow(self) -> list[SlowOperation]:
+        """Последние медленные операции (старые первыми)."""
+        with self._lock:
+            return list(self._recent)
+
+    def reset(self) -> None:
+        """Сбрасывает статистику (журнал на диске сохраняется)."""
+        with self._lock:
+            self._stats.clear()
+            self._recent.clear()
+            self._started = datetime.now()
+
+    def dump(self) -> str:
+        """Текстовый отчёт: статистика операций и последние медленные операции."""
+        stats = self.stats()
+        lines = [
+            f"BookVault — диагностика ({datetime.now().isoformat(timespec='seconds')})",
+            f"Замеры с {self._started.isoformat(timespec='seconds')}; "
+            f"медленные операции: от {self._slow_ms:.0f} ms"
+            + (f", журнал: {self._log_path}" if self._log_path else ""),
+            "",
+        ]
+        if not stats:
+            lines.append("Операций не было.")
+        else:
+            header = (
+                f"{'Операция':<32}{'Вызовы':>8}{'Ошибки':>8}{'Сред.':>9}"
+                f"{'p95≤':>8}{'Макс.':>9}{'Стр.':>8}{'МБ':>9}"
+            )
+            lines.append(header)
+            for name in sorted(stats, key=lambda n: -stats[n].total_seconds):
+                s = stats[name]
+                lines.append(
+                    f"{name:<32}{s.count:>8}{s.errors:>8}{s.mean_ms:>9.1f}"
+                    f"{s.quantile_ms(0.95):>8.0f}{s.max_seconds * 1000:>9.1f}"
+                    f"{s.pages:>8}{s.nbytes / 1_048_576:>9.1f}"
+                )
+            lines.append("")
+            bounds = [f"≤{b}" for b in LATENCY_BOUNDS_MS]
+            bounds.append(f">{LATENCY_BOUNDS_MS[-1]}")
+            lines.append("Гистограмма задержек (ms): " + " ".join(bounds))
+            for name in sorted(stats):
+                lines.append(f"  {name:<30} " + " ".join(map(str, stats[name].buckets)))
+
+        recent = self.recent_slow()
+        if recent:
+            lines.append("")
+            lines.append("Последние медленные операции:")
+            for op in reversed(recent):
+                pages = f", стр. {op.pages}" if op.pages else ""
+                failed = " (ошибка)" if op.error else ""
+                lines.append(
+                    f"  {op.at} {op.name} {op.ms:.0f} ms {op.subject}{pages}{failed}"
+                )
+        return "\n".join(lines)
+
+    def _write_slow(self, op: SlowOperation) -> None:
+        """Дописывает медленную операцию в журнал (под блокировкой)."""
+        if self._log_path is None:
+            return
+        path = self._log_path
+        try:
+            if path.exists() and path.stat().st_size > SLOW_LOG_MAX_BYTES:
+                os.replace(path, path.with_name(path.name + ".1"))
+            with path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(op.__dict__, ensure_ascii=False) + "\n")
+        except OSError:
+            # Журнал — вспомогательный: ошибка записи не мешает работе
+            pass
+
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+
+def metrics() -> Metrics:
+    """Общий сборщик замеров приложения (журнал — в директории приложения)."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            try:
+                slow_ms = float(os.environ.get(SLOW_MS_ENV, DEFAULT_SLOW_MS))
+            except ValueError:
+                slow_ms = DEFAULT_SLOW_MS
+            _metrics = Metrics(get_app_dir() / "slow_operations.log", slow_ms)
+        return _metrics
+
+
+def instrumented(
+    name: str,
+    describe: Optional[Describe] = None,
+    slow_ms: Optional[float] = None,
+) -> Callable[[F], F]:
+    """Декоратор замера операции.
+
+    При выключенных замерах (без `BOOKVAULT_PROFILE`) возвращает исходную
+    функцию без обёртки, поэтому ничего не стоит. У генераторов замеряется
+    только время внутри генератора, без времени потребителя.
+
+    Args:
+        name: Название операции.
+        describe: Функция подробностей вызова (файл, страницы, байты).
+        slow_ms: Порог медленной операции (None — общий).
+
+    Returns:
+        Декоратор.
+    """
+
+    def decorate(fn: F) -> F:
+        if not ENABLED:
+            return fn
+
+        def finish(
+            seconds: float, args: tuple, kwargs: dict, result: Any, error: bool
+        ) -> None:
+            detail = None
+            if describe is not None:
+                try:
+                    detail = describe(args, kwargs, result)
+                except Exception:
+                    detail = None
+            metrics().record(name, seconds, detail, error, slow_ms)
+
+        if inspect.isgeneratorfunction(fn):
+
+            @functools.wraps(fn)
+            def generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+                it = fn(*args, **kwargs)
+                spent = 0.0
+                items = 0
+                error = False
+                try:
+                    while True:
+                        started = time.perf_counter()
+                        try:
+                            item = next(it)
+                        except StopIteration:
+                            spent += time.perf_counter() - started
+                            return
+                        except BaseException:
+                            spent += time.perf_counter() - started
+                            error = True
+                            raise
+                        spent += time.perf_counter() - started
+                        items += 1
+                        yield item
+                finally:
+                    it.close()
+                    finish(spent, args, kwargs, items, error)
+
+            return generator_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                finish(time.perf_counter() - started, args, kwargs, None, True)
+                raise
+            finish(time.perf_counter() - started, args, kwargs, result, False)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def argument(args: tuple, kwargs: dict, index: int, name: str) -> Any:
+    """Достаёт аргумент вызова по позиции или имени (для функций `describe`).
+
+    Args:
+        args: Позиционные аргументы (у методов первый — self).
+        kwargs: Именованные аргументы.
+        index: Позиция аргумента.
+        name: Имя аргумента.
+
+    Returns:
+        Значение аргумента или None.
+    """
+    if name in kwargs:
+        return kwargs[name]
+    return args[index] if len(args) > index else None
+
+
+def describe_argument(index: int, name: str) -> Describe:
+    """Функция `describe`, подписывающая вызов значением одного аргумента.
+
+    Args:
+        index: Позиция аргумента (у методов первый — self).
+        name: Имя аргумента.
+
+    Returns:
+        Describe.
+    """
+
+    def describe(args: tuple, kwargs: dict, result: Any) -> OperationDetail:
+        return OperationDetail(repr(argument(args, kwargs, index, name)))
+
+    return describe
+
+
+def file_detail(path: Any, pages: int = 0) -> OperationDetail:
+    """Подробности операции над файлом (размер файла — как обработанные байты).
+
+    Args:
+        path: Путь к файлу.
+        pages: Сколько страниц обработано.
+
+    Returns:
+        OperationDetail.
+    """
+    try:
+        size = os.path.getsize(path)
+    except (OSError, TypeError):
+        size = 0
+    return OperationDetail(str(path), pages, size)
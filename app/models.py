@@ -1,19 +1,115 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
 
-@dataclass
 class Book:
-    """Модель книги (DTO для передачи между слоями)."""
-
-    id: Optional[int]
-    title: str
-    author: str
-    path: str
-    size_bytes: int
-    format: str
-    added_at: datetime
-    note: str
+    """Модель книги (DTO для передачи между слоями).
+
+    Компактная запись со `__slots__`: списки библиотеки держат в памяти
+    тысячи экземпляров. Дата добавления может быть передана строкой ISO
+    из БД и разбирается при первом обращении. `note` равна None, пока
+    заметка не загружена: списки книг её не читают
+    (см. `LibraryService.load_note()`).
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "author",
+        "path",
+        "size_bytes",
+        "format",
+        "_added_at",
+        "note",
+    )
+
+    def __init__(
+        self,
+        id: Optional[int],
+        title: str,
+        author: str,
+        path: str,
+        size_bytes: int,
+        format: str,
+        added_at: datetime | str,
+        note: Optional[str] = None,
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            id: ID книги (None — ещё не сохранена).
+            title: Название.
+            author: Автор.
+            path: Путь к файлу.
+            size_bytes: Размер файла.
+            format: Формат файла.
+            added_at: Дата добавления (datetime или строка ISO).
+            note: Заметка (None — не загружена).
+        """
+        self.id = id
+        self.title = title
+        self.author = author
+        self.path = path
+        self.size_bytes = size_bytes
+        self.format = format
+        self._added_at = added_at
+        self.note = note
+
+    @property
+    def added_at(self) -> datetime:
+        """Дата добавления книги."""
+        if isinstance(self._added_at, str):
+            self._added_at = datetime.fromisoformat(self._added_at)
+        return self._added_at
+
+    @added_at.setter
+    def added_at(self, value: datetime | str) -> None:
+        self._added_at = value
+
+    def _key(self) -> tuple:
+        """Значения полей для сравнения (без даты добавления)."""
+        return (
+            self.id,
+            self.title,
+            self.author,
+            self.path,
+            self.size_bytes,
+            self.format,
+            self.note,
+        )
+
+    def same_added_at(self, other: "Book") -> bool:
+        """Сравнивает даты добавления, не разбирая строки из БД.
+
+        Args:
+            other: Другая книга.
+
+        Returns:
+            True, если даты совпадают.
+        """
+        mine, theirs = self._added_at, other._added_at
+        if type(mine) is type(theirs):
+            return mine == theirs
+        # Строка и datetime: сравниваются в ISO-виде, как дата хранится в БД
+        if isinstance(mine, datetime):
+            mine = mine.isoformat()
+        if isinstance(theirs, datetime):
+            theirs = theirs.isoformat()
+        return mine == theirs
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Book):
+            return NotImplemented
+        return self._key() == other._key() and self.same_added_at(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"Book(id={self.id!r}, title={self.title!r}, author={self.author!r}, "
+            f"path={self.path!r}, size_bytes={self.size_bytes!r}, "
+            f"format={self.format!r}, added_at={self._added_at!r}, "
+            f"note={self.note!r})"
+        )
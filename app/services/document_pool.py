@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    import fitz  # PyMuPDF
+
+# Сколько документов держать открытыми по умолчанию
+DEFAULT_CAPACITY = 8
+
+
+class _Entry:
+    """Открытый документ в пуле."""
+
+    __slots__ = ("doc", "size", "mtime_ns", "lock", "users", "stale")
+
+    def __init__(self, doc: fitz.Document, size: int, mtime_ns: int) -> None:
+        self.doc = doc
+        self.size = size
+        self.mtime_ns = mtime_ns
+        # fitz.Document не потокобезопасен: одновременно с ним работает один поток
+        self.lock = threading.RLock()
+        self.users = 0
+        self.stale = False
+
+
+class DocumentPool:
+    """Ограниченный LRU-пул открытых `fitz.Document`.
+
+    Повторные операции с одной книгой не платят за `fitz.open` (разбор xref и
+    дерева страниц). Документ переоткрывается, если у файла изменились размер
+    или mtime. Документ, вытесненный или устаревший во время использования,
+    закрывается, когда его отпустит последний пользователь.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Инициализация.
+
+        Args:
+            capacity: Максимальное число одновременно открытых документов.
+        """
+        self._capacity = max(1, capacity)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    @contextmanager
+    def open(self, path: str) -> Iterator[fitz.Document]:
+        """Выдаёт открытый документ на время блока `with`.
+
+        Args:
+            path: Путь к PDF.
+
+        Yields:
+            fitz.Document (не закрывать вручную).
+
+        Raises:
+            OSError: Если файл недоступен.
+        """
+        entry = self._checkout(path)
+        try:
+            with entry.lock:
+                yield entry.doc
+        finally:
+            self._release(entry)
+
+    def invalidate(self, path: str) -> None:
+        """Убирает документ из пула (например, после удаления книги).
+
+        Args:
+            path: Путь к PDF.
+        """
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._retire(entry)
+
+    def close_all(self) -> None:
+        """Закрывает все документы пула."""
+        with self._lock:
+            while self._entries:
+                _, entry = self._entries.popitem()
+                self._retire(entry)
+
+    def _checkout(self, path: str) -> _Entry:
+        """Находит актуальный документ в пуле или открывает новый."""
+        st = os.stat(path)
+        state = (st.st_size, st.st_mtime_ns)
+
+        with self._lock:
+            entry = self._lookup(path, state)
+            if entry is not None:
+                return entry
+
+        # Открываем вне блокировки пула, чтобы не задерживать другие потоки
+        import fitz  # PyMuPDF
+
+        doc = fitz.open(path)
+        with self._lock:
+            entry = self._lookup(path, state)
+            if entry is not None:
+                doc.close()
+                return entry
+
+            entry = _Entry(doc, *state)
+            entry.users += 1
+            self._entries[path] = entry
+            self._evict()
+            return entry
+
+    def _lookup(self, path: str, state: tuple[int, int]) -> Optional[_Entry]:
+        """Возвращает актуальный документ и занимает его (под блокировкой)."""
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if (entry.size, entry.mtime_ns) != state:
+            del self._entries[path]
+            self._retire(entry)
+            return None
+        entry.users += 1
+        self._entries.move_to_end(path)
+        return entry
+
+    def _release(self, entry: _Entry) -> None:
+        """Отпускает документ; закрывает его, если он уже выведен из пула."""
+        with self._lock:
+            entry.users -= 1
+            if entry.stale and entry.users == 0:
+                entry.doc.close()
+
+    def _retire(self, entry: _Entry) -> None:
+        """Выводит документ из пула (под блокировкой)."""
+        entry.stale = True
+        if entry.users == 0:
+            entry.doc.close()
+
+    def _evict(self) -> None:
+        """Вытесняет давно не использованные документы сверх лимита."""
+        for path in list(self._entries):
+            if len(self._entries) <= self._capacity:
+                break
+            entry = self._entries[path]
+            if entry.users == 0:
+                del self._entries[path]
+                self._retire(entry)
+
+
+_default_pool: Optional[DocumentPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def default_document_pool() -> DocumentPool:
+    """Возвращает общий для приложения пул документов.
+
+    Returns:
+        DocumentPool.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DocumentPool()
+        return _default_pool
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+from app.db import Database
+
+# Размер блока при полном хэшировании файла
+HASH_BLOCK = 1024 * 1024
+
+# Сколько потоков считают полные хэши (hashlib отпускает GIL на больших блоках)
+HASH_WORKERS = 4
+
+# Сколько параметров передавать в одном SQL IN (...)
+_SQL_VARS_CHUNK = 500
+
+
+def content_hash(path: str) -> str:
+    """Вычисляет хэш всего содержимого файла.
+
+    Args:
+        path: Путь к файлу.
+
+    Returns:
+        Hex-строка хэша BLAKE2b.
+
+    Raises:
+        OSError: Если файл недоступен.
+    """
+    h = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        while block := f.read(HASH_BLOCK):
+            h.update(block)
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class HashCandidate:
+    """Файл, проверяемый перед импортом.
+
+    Attributes:
+        path: Путь к файлу.
+        size_bytes: Размер файла.
+        fingerprint: Отпечаток начала и конца файла (`file_fingerprint`).
+    """
+
+    path: str
+    size_bytes: int
+    fingerprint: str
+
+
+@dataclass(frozen=True)
+class ContentCopy:
+    """Файл, совпадающий по содержимому с другим.
+
+    Attributes:
+        path: Путь к копии.
+        original_path: Путь к оригиналу.
+        book_id: ID книги-оригинала (None — оригинал импортируется вместе
+            с копией и ещё не сохранён).
+    """
+
+    path: str
+    original_path: str
+    book_id: Optional[int] = None
+
+
+@dataclass
+class DuplicateScan:
+    """Итог поиска копий.
+
+    Attributes:
+        copies: Копии по пути файла.
+        hashes: Посчитанные полные хэши проверяемых файлов (по пути).
+        book_hashes: Посчитанные полные хэши книг библиотеки (по ID книги).
+    """
+
+    copies: dict[str, ContentCopy] = field(default_factory=dict)
+    hashes: dict[str, str] = field(default_factory=dict)
+    book_hashes: dict[int, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class _Member:
+    """Участник группы возможных копий: книга библиотеки или новый файл."""
+
+    path: str
+    book_id: Optional[int] = None
+    stored_hash: str = ""
+
+
+class DuplicateFinder:
+    """Поиск файлов, которые уже есть в библиотеке под другим путём.
+
+    Проверка идёт по ступеням, каждая — только для оставшихся кандидатов:
+    размер файла (запрос по индексу) → отпечаток начала и конца файла
+    (уже посчитан при импорте) → полный хэш содержимого, который считается
+    пулом потоков лишь при совпадении отпечатков. Полные хэши книг
+    сохраняются в `books.content_hash`, поэтому каждая книга хэшируется
+    не больше одного раза.
+    """
+
+    def __init__(self, db: Database, workers: int = HASH_WORKERS) -> None:
+        """Инициализация.
+
+        Args:
+            db: Экземпляр Database.
+            workers: Число потоков полного хэширования.
+        """
+        self._db = db
+        self._workers = max(1, workers)
+
+    def find(self, candidates: Sequence[HashCandidate]) -> DuplicateScan:
+        """Находит копии среди файлов и книг библиотеки.
+
+        Оригиналом считается книга библиотеки (с меньшим ID), а среди новых
+        файлов — первый по порядку. Файлы, чей путь уже есть в библиотеке,
+        не проверяются, даже если файл с тех пор изменился: его обновляет
+        синхронизация.
+
+        Args:
+            candidates: Проверяемые файлы.
+
+        Returns:
+            DuplicateScan.
+        """
+        scan = DuplicateScan()
+        # Пустые файлы совпадают друг с другом, но книгами не являются
+        candidates = [c for c in candidates if c.size_bytes > 0 and c.fingerprint]
+        known = self._known_paths([c.path for c in candidates])
+        candidates = [c for c in candidates if c.path not in known]
+        if not candidates:
+            return scan
+
+        # 1. Размер: только файлы, размер которых встречается хотя бы дважды
+        books_by_size = self._books_by_size({c.size_bytes for c in candidates})
+        new_by_size: dict[int, list[HashCandidate]] = defaultdict(list)
+        for c in candidates:
+            new_by_size[c.size_bytes].append(c)
+
+        # 2. Отпечаток начала и конца файла
+        groups: list[list[_Member]] = []
+        for size, new in new_by_size.items():
+            books = books_by_size.get(size, [])
+            if len(new) + len(books) < 2:
+                continue
+            known_books: dict[str, list[_Member]] = defaultdict(list)
+            unknown: list[_Member] = []
+            for row in sorted(books, key=lambda r: r["id"]):
+                member = _Member(row["path"], row["id"], row["content_hash"])
+                if row["fingerprint"]:
+                    known_books[row["fingerprint"]].append(member)
+                else:
+                    # Записи из версии без отпечатков сравниваются полным хэшем
+                    unknown.append(member)
+            new_files: dict[str, list[_Member]] = defaultdict(list)
+            for c in new:
+                new_files[c.fingerprint].append(_Member(c.path))
+            for fingerprint, members in new_files.items():
+                # Книги библиотеки идут первыми: оригинал — всегда книга
+                group = known_books.get(fingerprint, []) + unknown + members
+                if len(group) > 1:
+                    groups.append(group)
+
+        if not groups:
+            return scan
+
+        # 3. Полный хэш — только для совпавших отпечатков
+        hashes = self._hash_members([m for group in groups for m in group])
+        for group in groups:
+            originals: dict[str, _Member] = {}
+            for member in group:
+                digest = hashes.get(member)
+                if digest is None:
+                    continue
+                if member.book_id is None:
+                    scan.hashes[member.path] = digest
+                elif not member.stored_hash:
+                    scan.book_hashes[member.book_id] = digest
+
+                original = originals.get(digest)
+                if original is None:
+                    originals[digest] = member
+                elif member.book_id is None:
+                    scan.copies[member.path] = ContentCopy(
+                        member.path, original.path, original.book_id
+                    )
+        return scan
+
+    def _known_paths(self, paths: list[str]) -> set[str]:
+        """Пути из списка, которые уже есть в библиотеке."""
+        known: set[str] = set()
+        for start in range(0, len(paths), _SQL_VARS_CHUNK):
+            chunk = paths[start : start + _SQL_VARS_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            known.update(
+                row["path"]
+                for row in self._db.query(
+                    f"SELECT path FROM books WHERE path IN ({marks});", chunk
+                )
+            )
+        return known
+
+    def _books_by_size(self, sizes: set[int]) -> dict[int, list]:
+        """Книги библиотеки с указанными размерами файла."""
+        values = sorted(sizes)
+        found: dict[int, list] = defaultdict(list)
+        for start in range(0, len(values), _SQL_VARS_CHUNK):
+            chunk = values[start : start + _SQL_VARS_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            for row in self._db.query(
+                f"""
+                SELECT id, path, size_bytes, fingerprint, content_hash
+                FROM books WHERE size_bytes IN ({marks});
+                """,
+                chunk,
+            ):
+                found[row["size_bytes"]].append(row)
+        return found
+
+    def _hash_members(self, members: list[_Member]) -> dict[_Member, str]:
+        """Полные хэши участников (сохранённые или посчитанные пулом потоков).
+
+        Недоступные файлы пропускаются: такой файл не может быть ни копией,
+        ни оригиналом.
+        """
+        result = {m: m.stored_hash for m in members if m.stored_hash}
+        todo = list({m for m in members if not m.stored_hash})
+        if not todo:
+            return result
+
+        # Пул потоков нужен только при совпадениях: не замедляем запуск
+        from concurrent.futures import ThreadPoolExecutor
+
+        def digest(member: _Member) -> Optional[str]:
+            try:
+                return content_hash(member.path)
+            except OSError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(self._workers, len(todo))) as pool:
+            for member, value in zip(todo, pool.map(digest, todo)):
+                if value is not None:
+                    result[member] = value
+        return result
@@ -0,0 +1,123 @@
+"""Функции извлечения текста и метаданных, выполняемые в процессах-воркерах.
+
+Функции модуля должны оставаться функциями верхнего уровня: они передаются
+в `ProcessPoolExecutor` по имени и импортируются дочерними процессами.
+"""
+from __future__ import annotations
+
+import os
+from typing import List, Tuple
+
+from app.services.fingerprint import file_fingerprint
+from app.text import normalize_text
+
+# Метаданные импортируемого файла: (название, автор, отпечаток, ошибка)
+ImportMetadata = Tuple[str, str, str, str]
+
+
+def count_pages(path: str) -> int:
+    """Возвращает число страниц PDF.
+
+    Args:
+        path: Путь к PDF.
+
+    Returns:
+        Число страниц или -1, если файл не читается.
+    """
+    import fitz  # PyMuPDF
+
+    try:
+        doc = fitz.open(path)
+    except Exception:
+        return -1
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+def extract_page_range(
+    path: str, start: int, stop: int
+) -> List[Tuple[int, str]]:
+    """Извлекает и нормализует текст диапазона страниц PDF.
+
+    Args:
+        path: Путь к PDF.
+        start: Первая страница (включительно).
+        stop: Последняя страница (не включительно).
+
+    Returns:
+        Список пар (индекс страницы, нормализованный текст).
+    """
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(path)
+    try:
+        out: List[Tuple[int, str]] = []
+        for i in range(start, min(stop, doc.page_count)):
+            try:
+                text = doc.load_page(i).get_text("text")
+            except Exception:
+                text = ""
+            out.append((i, normalize_text(text)))
+        return out
+    finally:
+        doc.close()
+
+
+def read_metadata(path: str, fmt: str) -> Tuple[str, str]:
+    """Читает название и автора книги.
+
+    Если название в метаданных не задано или файл не читается,
+    названием становится имя файла без расширения.
+
+    Args:
+        path: Путь к файлу.
+        fmt: Формат файла ("pdf").
+
+    Returns:
+        Пара (название, автор).
+    """
+    title = ""
+    author = ""
+
+    if fmt == "pdf":
+        import fitz  # PyMuPDF
+
+        try:
+            doc = fitz.open(path)
+            try:
+                meta = doc.metadata or {}
+            finally:
+                doc.close()
+            title = (meta.get("title") or "").strip()
+            author = (meta.get("author") or "").strip()
+        except Exception:
+            title = ""
+            author = ""
+
+    if not title:
+        title = os.path.splitext(os.path.basename(path))[0]
+    return title, author
+
+
+def read_import_metadata(files: List[Tuple[str, int, str]]) -> List[ImportMetadata]:
+    """Готовит пачку файлов к импорту: метаданные и отпечаток содержимого.
+
+    Args:
+        files: Тройки (путь, размер в байтах, формат).
+
+    Returns:
+        Для каждого файла (название, автор, отпечаток, ошибка); непустая
+        ошибка означает, что файл недоступен и импортировать его нельзя.
+    """
+    out: List[ImportMetadata] = []
+    for path, size_bytes, fmt in files:
+        try:
+            fingerprint = file_fingerprint(path, size_bytes)
+        except OSError as e:
+            out.append(("", "", "", str(e)))
+            continue
+        title, author = read_metadata(path, fmt)
+        out.append((title, author, fingerprint, ""))
+    return out
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from functools import lru_cache
+from typing import Optional
+
+# Размер блока, читаемого из начала и из конца файла
+FINGERPRINT_BLOCK = 64 * 1024
+
+
+def file_fingerprint(path: str, size: Optional[int] = None) -> str:
+    """Вычисляет дешёвый отпечаток содержимого файла.
+
+    Хэшируются размер файла, первый и последний блоки по 64 КиБ, поэтому
+    стоимость не зависит от размера книги. Этого достаточно, чтобы отличить
+    действительно изменённый файл от файла, у которого изменилось только mtime.
+
+    Args:
+        path: Путь к файлу.
+        size: Размер файла, если он уже известен (экономит stat).
+
+    Returns:
+        Hex-строка отпечатка.
+
+    Raises:
+        OSError: Если файл недоступен.
+    """
+    if size is None:
+        size = os.stat(path).st_size
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(size.to_bytes(8, "little"))
+    with open(path, "rb") as f:
+        h.update(f.read(FINGERPRINT_BLOCK))
+        if size > FINGERPRINT_BLOCK:
+            f.seek(max(size - FINGERPRINT_BLOCK, FINGERPRINT_BLOCK))
+            h.update(f.read(FINGERPRINT_BLOCK))
+    return h.hexdigest()
+
+
+def current_fingerprint(path: str) -> str:
+    """Возвращает отпечаток файла, пересчитывая его только после изменения файла.
+
+    Результат кэшируется по (путь, размер, mtime), поэтому повторные вызовы
+    для неизменённого файла стоят одного stat.
+
+    Args:
+        path: Путь к файлу.
+
+    Returns:
+        Hex-строка отпечатка.
+
+    Raises:
+        OSError: Если файл недоступен.
+    """
+    st = os.stat(path)
+    return _fingerprint_for_state(path, st.st_size, st.st_mtime_ns)
+
+
+@lru_cache(maxsize=4096)
+def _fingerprint_for_state(path: str, size: int, mtime_ns: int) -> str:
+    """Кэшируемая обёртка над file_fingerprint (mtime_ns входит в ключ кэша)."""
+    return file_fingerprint(path, size)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from collections import deque
+from itertools import chain, islice
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence
+
+from app.services.extraction import read_import_metadata
+from app.services.indexer import CancelCallback, default_worker_count
+from app.services.scanner import ScannedFile
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+@dataclass(frozen=True)
+class PreparedFile:
+    """Файл, подготовленный к записи в БД."""
+
+    file: ScannedFile
+    title: str = ""
+    author: str = ""
+    fingerprint: str = ""
+    error: str = ""
+
+
+class MetadataStage:
+    """Параллельное извлечение метаданных импортируемых файлов.
+
+    Файлы пачками по `files_per_task` раздаются процессам
+    `ProcessPoolExecutor`; результаты отдаются в исходном порядке, чтобы
+    вызывающий поток мог единолично писать их в SQLite. Число задач в работе
+    ограничено, поэтому на вход можно подавать генератор любой длины; малые
+    входы (в том числе генераторы) обрабатываются без пула.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        files_per_task: int = 16,
+        inline_below: int = 256,
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            workers: Число процессов; None — по числу ядер, 1 — без пула.
+            files_per_task: Сколько файлов обрабатывает одна задача воркера.
+            inline_below: Входы короче этого обрабатываются без пула
+                (запуск процессов дороже самой работы).
+        """
+        self._workers = workers or default_worker_count()
+        self._files_per_task = max(1, files_per_task)
+        self._inline_below = inline_below
+
+    def run(
+        self,
+        files: Iterable[ScannedFile],
+        cancel: Optional[CancelCallback] = None,
+    ) -> Iterator[PreparedFile]:
+        """Извлекает метаданные файлов.
+
+        Args:
+            files: Результаты сканирования.
+            cancel: Функция, возвращающая True, если работу нужно прервать.
+
+        Yields:
+            PreparedFile в порядке входных файлов.
+        """
+        if self._workers <= 1:
+            yield from self._run_inline(files, cancel)
+            return
+        if not isinstance(files, Sequence):
+            # Длина генератора неизвестна: пул запускается, лишь если файлов
+            # набралось не меньше `inline_below`
+            files = iter(files)
+            head = list(islice(files, self._inline_below))
+            if len(head) < self._inline_below:
+                yield from self._run_inline(head, cancel)
+                return
+            files = chain(head, files)
+        elif len(files) < self._inline_below:
+            yield from self._run_inline(files, cancel)
+            return
+
+        # Пул процессов нужен только при импорте: не замедляем запуск
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self._workers, mp_context=ctx) as pool:
+            in_flight: deque[tuple[list[ScannedFile], Future]] = deque()
+            max_in_flight = self._workers * 4
+
+            for chunk in self._chunks(files):
+                if cancel and cancel():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return
+                fut = pool.submit(read_import_metadata, _args(chunk))
+                in_flight.append((chunk, fut))
+                if len(in_flight) >= max_in_flight:
+                    yield from _collect(*in_flight.popleft())
+
+            while in_flight:
+                if cancel and cancel():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return
+                yield from _collect(*in_flight.popleft())
+
+    def _chunks(self, files: Iterable[ScannedFile]) -> Iterator[list[ScannedFile]]:
+        """Делит поток файлов на пачки по `files_per_task`."""
+        chunk: list[ScannedFile] = []
+        for sf in files:
+            chunk.append(sf)
+            if len(chunk) >= self._files_per_task:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _run_inline(
+        self, files: Iterable[ScannedFile], cancel: Optional[CancelCallback]
+    ) -> Iterator[PreparedFile]:
+        """Извлекает метаданные в текущем процессе."""
+        for chunk in self._chunks(files):
+            if cancel and cancel():
+                return
+            yield from _zip(chunk, read_import_metadata(_args(chunk)))
+
+
+def _args(chunk: list[ScannedFile]) -> list[tuple[str, int, str]]:
+    """Аргументы задачи воркера для пачки файлов."""
+    return [(sf.path, sf.size_bytes, sf.format) for sf in chunk]
+
+
+def _collect(chunk: list[ScannedFile], fut: Future) -> Iterator[PreparedFile]:
+    """Дожидается результата задачи; сбой воркера — ошибка для всей пачки."""
+    try:
+        results = fut.result()
+    except Exception as e:
+        results = [("", "", "", str(e) or type(e).__name__)] * len(chunk)
+    yield from _zip(chunk, results)
+
+
+def _zip(chunk: list[ScannedFile], results: list) -> Iterator[PreparedFile]:
+    """Собирает PreparedFile из файлов пачки и результатов воркера."""
+    for sf, (title, author, fingerprint, error) in zip(chunk, results):
+        yield PreparedFile(sf, title, author, fingerprint, error)
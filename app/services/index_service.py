@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable, Optional, Sequence, Tuple
+
+from app.db import Database
+from app.services.pdf_service import PdfService
+from app.text import fts_match_query, normalize_text
+
+# Минимальная длина запроса, при которой работает индекс trigram
+TRIGRAM_MIN_QUERY = 3
+
+
+class IndexService:
+    """Постраничный полнотекстовый индекс книг (таблица FTS5 `book_pages`)."""
+
+    def __init__(self, db: Database, pdf: Optional[PdfService] = None) -> None:
+        """Инициализация.
+
+        Args:
+            db: Экземпляр Database.
+            pdf: Сервис PDF для извлечения текста.
+        """
+        self._db = db
+        self._pdf = pdf or PdfService()
+        self._trigram: Optional[bool] = None
+
+    @property
+    def uses_trigram(self) -> bool:
+        """Признак того, что индекс построен токенизатором trigram."""
+        if self._trigram is None:
+            rows = self._db.query(
+                "SELECT sql FROM sqlite_master WHERE name = 'book_pages';"
+            )
+            self._trigram = bool(rows) and "trigram" in (rows[0]["sql"] or "")
+        return self._trigram
+
+    def write_pages(self, book_id: int, pages: Iterable[Tuple[int, str]]) -> int:
+        """Заменяет проиндексированный текст книги одной транзакцией.
+
+        Args:
+            book_id: ID книги.
+            pages: Пары (индекс страницы, текст).
+
+        Returns:
+            Количество записанных страниц.
+        """
+        rows = [
+            (normalize_text(text), book_id, page_index)
+            for page_index, text in pages
+        ]
+        with self._db.transaction() as conn:
+            self._clear(conn, [book_id])
+            self._insert(conn, rows, [(book_id, len(rows))])
+        return len(rows)
+
+    def clear_books(self, book_ids: Sequence[int]) -> None:
+        """Удаляет индекс указанных книг (они снова считаются непроиндексированными).
+
+        Args:
+            book_ids: ID книг.
+        """
+        with self._db.transaction() as conn:
+            self._clear(conn, book_ids)
+
+    def write_batch(
+        self,
+        page_rows: Sequence[Tuple[str, int, int]],
+        finished: Sequence[Tuple[int, int]] = (),
+    ) -> None:
+        """Записывает пачку уже нормализованных страниц одной транзакцией.
+
+        Args:
+            page_rows: Кортежи (нормализованный текст, ID книги, индекс страницы).
+            finished: Пары (ID книги, число страниц) полностью проиндексированных книг.
+        """
+        with self._db.transaction() as conn:
+            self._insert(conn, page_rows, finished)
+
+    @staticmethod
+    def _clear(conn: sqlite3.Connection, book_ids: Sequence[int]) -> None:
+        """Удаляет страницы и отметки индексации книг (без фиксации)."""
+        params = [(book_id,) for book_id in book_ids]
+        conn.executemany("DELETE FROM book_pages WHERE book_id = ?;", params)
+        conn.executemany("DELETE FROM book_index WHERE book_id = ?;", params)
+
+    def _insert(
+        self,
+        conn: sqlite3.Connection,
+        page_rows: Sequence[Tuple[str, int, int]],
+        finished: Sequence[Tuple[int, int]],
+    ) -> None:
+        """Вставляет страницы и отметки индексации (без фиксации)."""
+        conn.executemany(
+            "INSERT INTO book_pages(text, book_id, page_index) VALUES(?, ?, ?);",
+            [r for r in page_rows if r[0]],
+        )
+        now = self._db.now_iso()
+        conn.executemany(
+            """
+            INSERT INTO book_index(book_id, page_count, indexed_at)
+            VALUES(?, ?, ?)
+            ON CONFLICT(book_id) DO UPDATE SET
+                page_count = excluded.page_count,
+                indexed_at = excluded.indexed_at;
+            """,
+            [(book_id, count, now) for book_id, count in finished],
+        )
+
+    def index_book(self, book_id: int, path: str) -> int:
+        """Извлекает текст PDF и (пере)индексирует книгу.
+
+        Args:
+            book_id: ID книги.
+            path: Путь к PDF.
+
+        Returns:
+            Количество проиндексированных страниц.
+        """
+        return self.write_pages(book_id, self._pdf.iter_page_texts(path))
+
+    def mark_unreadable(self, book_id: int) -> None:
+        """Помечает книгу как проиндексированную без текста.
+
+        Используется для повреждённых файлов, чтобы не пытаться
+        извлекать из них текст при каждом поиске.
+
+        Args:
+            book_id: ID книги.
+        """
+        self.write_pages(book_id, [])
+
+    def unindexed_books(self) -> list[sqlite3.Row]:
+        """Возвращает книги, для которых ещё нет индекса.
+
+        Returns:
+            Строки (id, path, format).
+        """
+        return self._db.query(
+            """
+            SELECT b.id, b.path, b.format FROM books b
+            LEFT JOIN book_index i ON i.book_id = b.id
+            WHERE i.book_id IS NULL;
+            """
+        )
+
+    def match_subquery(self, keyword: str) -> Tuple[str, list]:
+        """Формирует подзапрос, возвращающий id книг, содержащих строку.
+
+        Args:
+            keyword: Искомая строка.
+
+        Returns:
+            Кортеж (SQL подзапроса, параметры).
+        """
+        q = normalize_text(keyword)
+
+        match = fts_match_query(q, self.uses_trigram, TRIGRAM_MIN_QUERY)
+        if match is not None:
+            return "SELECT book_id FROM book_pages WHERE book_pages MATCH ?", [match]
+
+        # Слишком короткий запрос для trigram: просмотр текста без индекса
+        return "SELECT book_id FROM book_pages WHERE instr(text, ?) > 0", [q]
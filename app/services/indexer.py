@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Sequence, Tuple
+
+from app.db import Database
+from app.services.extraction import count_pages, extract_page_range
+from app.services.index_service import IndexService
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# Колбэк прогресса: (обработано книг, всего книг)
+ProgressCallback = Callable[[int, int], None]
+CancelCallback = Callable[[], bool]
+
+
+def default_worker_count() -> int:
+    """Возвращает число процессов-воркеров по умолчанию.
+
+    Returns:
+        Число ядер CPU (не меньше 1).
+    """
+    return max(1, os.cpu_count() or 1)
+
+
+@dataclass
+class IndexStats:
+    """Итог пакетной индексации."""
+
+    books: int = 0
+    pages: int = 0
+    failed: int = 0
+    cancelled: bool = False
+
+
+class IndexingEngine:
+    """Параллельная индексация текста книг пулом процессов.
+
+    Книги (а крупные книги — диапазонами страниц) раздаются процессам
+    `ProcessPoolExecutor`. Извлечённые страницы возвращаются в вызывающий поток,
+    который единолично пишет их в SQLite пачками по `batch_size` страниц.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        workers: Optional[int] = None,
+        batch_size: int = 500,
+        pages_per_task: int = 64,
+        inline_below: int = 8,
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            db: Экземпляр Database (используется только вызывающим потоком).
+            workers: Число процессов; None — по числу ядер, 1 — без пула.
+            batch_size: Число страниц в одной транзакции записи.
+            pages_per_task: Максимум страниц в одной задаче воркера.
+            inline_below: Меньше этого числа книг индексируется без пула
+                (запуск процессов дороже самой работы).
+        """
+        self._index = IndexService(db)
+        self._workers = workers or default_worker_count()
+        self._batch_size = max(1, batch_size)
+        self._pages_per_task = max(1, pages_per_task)
+        self._inline_below = inline_below
+
+    @property
+    def workers(self) -> int:
+        """Число процессов-воркеров."""
+        return self._workers
+
+    def index_books(
+        self,
+        books: Iterable[Tuple[int, str]],
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancelCallback] = None,
+    ) -> IndexStats:
+        """(Пере)индексирует книги.
+
+        Старый индекс книг удаляется в начале, а отметка об индексации
+        ставится только после записи всех страниц книги. Страницы книг,
+        не дочитанных до отмены, удаляются, поэтому прерванная индексация
+        оставляет книги непроиндексированными, а не наполовину.
+
+        Args:
+            books: Пары (ID книги, путь к PDF).
+            progress: Колбэк прогресса (обработано книг, всего).
+            cancel: Функция, возвращающая True, если работу нужно прервать.
+
+        Returns:
+            IndexStats.
+        """
+        items = list(books)
+        stats = IndexStats()
+        if not items:
+            return stats
+
+        self._index.clear_books([book_id for book_id, _ in items])
+
+        if self._workers <= 1 or len(items) < self._inline_below:
+            return self._index_inline(items, stats, progress, cancel)
+
+        # Пул процессов нужен только при индексации: не замедляем запуск
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self._workers, mp_context=ctx) as pool:
+            paths = [path for _, path in items]
+            page_counts = list(pool.map(count_pages, paths, chunksize=16))
+
+            futures: dict[Future, int] = {}
+            remaining: dict[int, int] = {}
+            totals: dict[int, int] = {}
+            empty: list[Tuple[int, int]] = []
+            for (book_id, path), count in zip(items, page_counts):
+                if count <= 0:
+                    # Пустые и нечитаемые книги отмечаются сразу
+                    if count < 0:
+                        stats.failed += 1
+                    empty.append((book_id, 0))
+                    continue
+                ranges = self._split(count)
+                remaining[book_id] = len(ranges)
+                totals[book_id] = count
+                for start, stop in ranges:
+                    fut = pool.submit(extract_page_range, path, start, stop)
+                    futures[fut] = book_id
+
+            self._index.write_batch([], empty)
+            stats.books = len(empty)
+            if progress:
+                progress(stats.books, len(items))
+
+            batch: list[Tuple[str, int, int]] = []
+            finished: list[Tuple[int, int]] = []
+            for fut in as_completed(futures):
+                if cancel and cancel():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    stats.cancelled = True
+                    break
+
+                book_id = futures[fut]
+                try:
+                    pages = fut.result()
+                except Exception:
+                    # Диапазон не прочитан — книга индексируется без него
+                    pages = []
+                batch.extend((text, book_id, i) for i, text in pages)
+                stats.pages += len(pages)
+
+                remaining[book_id] -= 1
+                if remaining[book_id] == 0:
+                    finished.append((book_id, totals[book_id]))
+                    stats.books += 1
+                    if progress:
+                        progress(stats.books, len(items))
+
+                if len(batch) >= self._batch_size:
+                    self._index.write_batch(batch, finished)
+                    batch, finished = [], []
+
+            if batch or finished:
+                self._index.write_batch(batch, finished)
+            if stats.cancelled:
+                # Часть страниц незаконченных книг уже записана промежуточными
+                # пачками: без отметки индексации они не должны находиться
+                unfinished = [b for b, left in remaining.items() if left > 0]
+                self._index.clear_books(unfinished)
+
+        return stats
+
+    def _split(self, page_count: int) -> list[Tuple[int, int]]:
+        """Делит книгу на диапазоны страниц для воркеров.
+
+        Args:
+            page_count: Число страниц.
+
+        Returns:
+            Список диапазонов (start, stop).
+        """
+        step = self._pages_per_task
+        return [(i, min(i + step, page_count)) for i in range(0, page_count, step)]
+
+    def _index_inline(
+        self,
+        items: Sequence[Tuple[int, str]],
+        stats: IndexStats,
+        progress: Optional[ProgressCallback],
+        cancel: Optional[CancelCallback],
+    ) -> IndexStats:
+        """Индексирует книги в текущем процессе (workers=1)."""
+        for done, (book_id, path) in enumerate(items, start=1):
+            if cancel and cancel():
+                stats.cancelled = True
+                break
+
+            count = count_pages(path)
+            pages = extract_page_range(path, 0, count) if count > 0 else []
+            if count < 0:
+                stats.failed += 1
+            self._index.write_batch(
+                [(text, book_id, i) for i, text in pages],
+                [(book_id, max(count, 0))],
+            )
+            stats.books += 1
+            stats.pages += len(pages)
+            if progress:
+                progress(done, len(items))
+        return stats
@@ -1,34 +1,211 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime
-from typing import Literal, Optional, cast
+import sys
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Iterable, Iterator, Literal, Optional, cast
 
 from app.db import Database
+from app.instrumentation import (
+    OperationDetail,
+    argument,
+    describe_argument,
+    instrumented,
+)
 from app.models import Book
+from app.services.duplicates import DuplicateFinder, DuplicateScan, HashCandidate
+from app.services.extraction import read_metadata
+from app.services.fingerprint import file_fingerprint
+from app.services.importer import MetadataStage, PreparedFile
+from app.services.index_service import IndexService
+from app.services.indexer import (
+    CancelCallback,
+    IndexingEngine,
+    IndexStats,
+    ProgressCallback,
+)
 from app.services.pdf_service import PdfService
-from app.services.scanner import ScannedFile
+from app.services.scanner import ScannedFile, Scanner
+from app.text import book_search_text, fts_match_query, normalize_text
 
 SortKey = Literal["title_asc", "added_desc", "added_asc"]
 
 
+def _describe_index(args: tuple, kwargs: dict, result: Any) -> OperationDetail:
+    """Подробности индексации для замеров: число книг и страниц."""
+    return OperationDetail(f"{result.books} книг", result.pages)
+
+
+def _describe_import(args: tuple, kwargs: dict, result: Any) -> OperationDetail:
+    """Подробности импорта для замеров: число обработанных файлов."""
+    return OperationDetail(f"{len(result.results)} файлов")
+
+
+def _describe_folder(args: tuple, kwargs: dict, result: Any) -> OperationDetail:
+    """Подробности сверки папки для замеров."""
+    return OperationDetail(str(argument(args, kwargs, 1, "folder")))
+
+
+# Позиция в отсортированном списке: (значение ключа сортировки, ID книги)
+PageCursor = tuple[Any, int]
+
+# Размер страницы списка книг по умолчанию
+PAGE_SIZE = 200
+
+# Сколько параметров передавать в одно условие IN (...)
+_SQL_VARS_CHUNK = 500
+
+# Колонки списков книг: заметка загружается по требованию (load_note)
+_BOOK_LIST_COLUMNS = "id, title, author, path, size_bytes, format, added_at"
+
+# Ключи сортировки: (SQL выражение, колонка значения, по возрастанию)
+_SORT_COLUMNS: dict[str, tuple[str, str, bool]] = {
+    "title_asc": ("title COLLATE NOCASE", "title", True),
+    "added_desc": ("added_at", "added_at", False),
+    "added_asc": ("added_at", "added_at", True),
+}
+
+# duplicate — путь уже в библиотеке, copy — то же содержимое под другим путём
+ImportOutcome = Literal["added", "duplicate", "copy", "error"]
+
+# Состояние файлов книг для синхронизации
+_SYNC_SELECT = """
+    SELECT b.id, b.path, b.format, b.size_bytes, b.mtime, b.fingerprint,
+           i.book_id IS NOT NULL AS indexed
+    FROM books b
+    LEFT JOIN book_index i ON i.book_id = b.id
+"""
+
+# Сколько книг вставляется одной транзакцией при пакетном импорте
+IMPORT_CHUNK_SIZE = 500
+
+
+@dataclass
+class SyncReport:
+    """Итог синхронизации библиотеки с файлами на диске."""
+
+    checked: int = 0
+    unchanged: int = 0
+    added: int = 0
+    updated: int = 0
+    reindexed: int = 0
+    removed: int = 0
+    unavailable: int = 0
+    copies: int = 0
+    # Текст ошибки, прервавшей синхронизацию (пустой — ошибок не было)
+    error: str = ""
+
+    @property
+    def changed(self) -> bool:
+        """True, если синхронизация изменила библиотеку."""
+        return bool(self.added or self.updated or self.removed)
+
+    def merge(self, other: "SyncReport") -> None:
+        """Добавляет к отчёту счётчики другого отчёта.
+
+        Первая ошибка сохраняется, последующие отбрасываются.
+
+        Args:
+            other: SyncReport.
+        """
+        for f in fields(self):
+            if f.name == "error":
+                self.error = self.error or other.error
+            else:
+                setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+@dataclass(frozen=True)
+class ImportResult:
+    """Итог импорта одного файла."""
+
+    path: str
+    outcome: ImportOutcome
+    book_id: Optional[int] = None
+    format: str = ""
+    error: str = ""
+
+
+@dataclass
+class ImportReport:
+    """Итог пакетного импорта файлов."""
+
+    added: int = 0
+    duplicates: int = 0
+    copies: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    cancelled: bool = False
+    # Текст ошибки, прервавшей импорт (пустой — импорт дошёл до конца)
+    error: str = ""
+    results: list[ImportResult] = field(default_factory=list)
+
+    @property
+    def files_per_second(self) -> float:
+        """Пропускная способность импорта (файлов в секунду)."""
+        return len(self.results) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def add(self, result: ImportResult) -> None:
+        """Учитывает итог импорта файла.
+
+        Args:
+            result: ImportResult.
+        """
+        self.results.append(result)
+        if result.outcome == "added":
+            self.added += 1
+        elif result.outcome == "duplicate":
+            self.duplicates += 1
+        elif result.outcome == "copy":
+            self.copies += 1
+        else:
+            self.errors += 1
+
+    def added_books(self, fmt: str = "pdf") -> list[tuple[int, str]]:
+        """Возвращает добавленные книги для индексации.
+
+        Args:
+            fmt: Формат файлов.
+
+        Returns:
+            Пары (ID книги, путь к файлу).
+        """
+        return [
+            (cast(int, r.book_id), r.path)
+            for r in self.results
+            if r.outcome == "added" and r.format == fmt
+        ]
+
+
 class LibraryService:
     """Бизнес-логика библиотеки: добавление, обновление, удаление, список."""
 
-    def __init__(self, db: Database) -> None:
+    def __init__(self, db: Database, index_workers: Optional[int] = None) -> None:
         """Инициализация.
 
         Args:
             db: Экземпляр Database.
+            index_workers: Число процессов индексации и извлечения метаданных
+                при импорте (None — по числу ядер).
         """
         self._db = db
         self._pdf = PdfService()
+        self._index = IndexService(db, self._pdf)
+        self._engine = IndexingEngine(db, workers=index_workers)
+        self._metadata = MetadataStage(workers=index_workers)
+        self._duplicates = DuplicateFinder(db)
+        self._search_trigram: Optional[bool] = None
 
-    def _row_to_book(self, row) -> Book:
+    def _row_to_book(self, row, with_note: bool = False) -> Book:
         """Преобразует sqlite3.Row в Book.
 
+        Дата добавления остаётся строкой и разбирается при первом обращении;
+        повторяющиеся строки (автор, формат) разделяются между записями.
+
         Args:
             row: sqlite3.Row.
+            with_note: В строке есть колонка `note`.
 
         Returns:
             Book.
@@ -36,46 +213,255 @@ class LibraryService:
         return Book(
             id=row["id"],
             title=row["title"],
-            author=row["author"],
+            author=sys.intern(row["author"]),
             path=row["path"],
             size_bytes=row["size_bytes"],
-            format=row["format"],
-            added_at=datetime.fromisoformat(row["added_at"]),
-            note=row["note"],
+            format=sys.intern(row["format"]),
+            added_at=row["added_at"],
+            note=row["note"] if with_note else None,
         )
 
+    def load_note(self, book: Book) -> str:
+        """Возвращает заметку книги, загружая её при необходимости.
+
+        Args:
+            book: Книга (загруженная заметка сохраняется в ней).
+
+        Returns:
+            Текст заметки.
+        """
+        self.load_notes([book])
+        return book.note or ""
+
+    def load_notes(self, books: list[Book]) -> None:
+        """Загружает заметки книг, у которых они ещё не загружены.
+
+        Args:
+            books: Книги (заметки сохраняются в них).
+        """
+        todo = {b.id: b for b in books if b.note is None and b.id is not None}
+        ids = list(todo)
+        for start in range(0, len(ids), _SQL_VARS_CHUNK):
+            chunk = ids[start : start + _SQL_VARS_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            rows = self._db.query(
+                f"SELECT id, note FROM books WHERE id IN ({marks});", chunk
+            )
+            for row in rows:
+                todo[row["id"]].note = row["note"] or ""
+        # Книги, удалённые из БД, считаются книгами без заметки
+        for book in todo.values():
+            if book.note is None:
+                book.note = ""
+
     def list_books(
         self, sort: SortKey = "title_asc", title_filter: str = ""
     ) -> list[Book]:
-        """Возвращает список книг с сортировкой и фильтром по названию.
+        """Возвращает список книг с сортировкой и фильтром.
 
         Args:
             sort: Ключ сортировки.
-            title_filter: Фильтр по названию (LIKE).
+            title_filter: Подстрока названия, автора или заметки
+                (без учёта регистра, в том числе для кириллицы).
 
         Returns:
             Список Book.
         """
         where = ""
-        params = []
+        params: list = []
         if title_filter.strip():
-            where = "WHERE lower(title) LIKE lower(?)"
-            params.append(f"%{title_filter.strip()}%")
+            clause, params = self._filter_clause(title_filter)
+            where = f"WHERE {clause}"
 
-        order_by = "ORDER BY title COLLATE NOCASE ASC"
-        if sort == "added_desc":
-            order_by = "ORDER BY added_at DESC"
-        elif sort == "added_asc":
-            order_by = "ORDER BY added_at ASC"
-
-        rows = self._db.query(f"SELECT * FROM books {where} {order_by};", params)
+        rows = self._db.query(
+            f"SELECT {_BOOK_LIST_COLUMNS} FROM books {where} {self.order_by_sql(sort)};",
+            params,
+        )
         return [self._row_to_book(r) for r in rows]
 
+    @instrumented("library.list_books_page", describe_argument(2, "title_filter"))
+    def list_books_page(
+        self,
+        sort: SortKey = "title_asc",
+        title_filter: str = "",
+        after: Optional[PageCursor] = None,
+        limit: int = PAGE_SIZE,
+    ) -> tuple[list[Book], Optional[PageCursor]]:
+        """Возвращает страницу отсортированного списка книг (keyset-пагинация).
+
+        Следующая страница запрашивается от последней книги предыдущей,
+        а не через OFFSET, поэтому стоимость запроса не зависит от того,
+        насколько далеко пролистан список.
+
+        Args:
+            sort: Ключ сортировки.
+            title_filter: Подстрока названия, автора или заметки.
+            after: Позиция, после которой начинается страница (None — с начала).
+            limit: Размер страницы.
+
+        Returns:
+            Кортеж (книги, позиция для следующей страницы или None,
+            если страница последняя).
+        """
+        expr, column, ascending = _SORT_COLUMNS.get(sort, _SORT_COLUMNS["title_asc"])
+        op, direction = (">", "ASC") if ascending else ("<", "DESC")
+
+        conditions: list[str] = []
+        params: list = []
+        if title_filter.strip():
+            clause, params = self._filter_clause(title_filter)
+            conditions.append(clause)
+        if after is not None:
+            conditions.append(f"({expr} {op} ? OR ({expr} = ? AND id {op} ?))")
+            params += [after[0], after[0], after[1]]
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._db.query(
+            f"""
+            SELECT {_BOOK_LIST_COLUMNS} FROM books {where}
+            ORDER BY {expr} {direction}, id {direction}
+            LIMIT ?;
+            """,
+            [*params, limit],
+        )
+
+        cursor = None
+        if len(rows) == limit:
+            cursor = (rows[-1][column], rows[-1]["id"])
+        return [self._row_to_book(r) for r in rows], cursor
+
+    @instrumented("library.count_books", describe_argument(1, "title_filter"))
+    def count_books(self, title_filter: str = "") -> int:
+        """Возвращает число книг, подходящих под фильтр.
+
+        Args:
+            title_filter: Подстрока названия, автора или заметки.
+
+        Returns:
+            Число книг.
+        """
+        where = ""
+        params: list = []
+        if title_filter.strip():
+            clause, params = self._filter_clause(title_filter)
+            where = f"WHERE {clause}"
+        rows = self._db.query(f"SELECT count(*) AS n FROM books {where};", params)
+        return rows[0]["n"]
+
+    def book_matches(self, book_id: int, title_filter: str = "") -> bool:
+        """Проверяет, подходит ли книга под фильтр.
+
+        Args:
+            book_id: ID книги.
+            title_filter: Подстрока названия, автора или заметки.
+
+        Returns:
+            True, если книга есть и подходит под фильтр.
+        """
+        where = "id = ?"
+        params: list = [book_id]
+        if title_filter.strip():
+            clause, extra = self._filter_clause(title_filter)
+            where += f" AND {clause}"
+            params += extra
+        return bool(self._db.query(f"SELECT 1 FROM books WHERE {where};", params))
+
+    def is_refinement(self, old_filter: str, new_filter: str) -> bool:
+        """Проверяет, что результат нового фильтра — подмножество старого.
+
+        Верно, когда фильтр ищет подстроку (индекс trigram) и старая строка
+        содержится в новой. Тогда результат можно
+        получить из старого в памяти через `filter_books()`.
+
+        Args:
+            old_filter: Предыдущая строка фильтра.
+            new_filter: Новая строка фильтра.
+
+        Returns:
+            True, если новый фильтр уточняет старый.
+        """
+        old, new = normalize_text(old_filter), normalize_text(new_filter)
+        if not old or old not in new:
+            return False
+        # Префиксный поиск unicode61 не сводится к поиску подстроки
+        return self._search_uses_trigram()
+
+    @instrumented("library.filter_books", describe_argument(2, "title_filter"))
+    def filter_books(self, books: list[Book], title_filter: str) -> list[Book]:
+        """Отбирает книги, подходящие под фильтр, без обращения к БД.
+
+        Применимо, только если фильтр ищет подстроку (см. `is_refinement()`).
+        Заметки догружаются одним запросом только для книг, у которых
+        совпадения нет в названии и авторе.
+
+        Args:
+            books: Исходные книги (порядок сохраняется).
+            title_filter: Строка фильтра.
+
+        Returns:
+            Подходящие книги.
+        """
+        q = normalize_text(title_filter)
+        self.load_notes(
+            [b for b in books if q not in book_search_text(b.title, b.author, "")]
+        )
+        return [
+            b for b in books if q in book_search_text(b.title, b.author, b.note or "")
+        ]
+
+    def _filter_clause(self, text: str) -> tuple[str, list]:
+        """Формирует условие WHERE для фильтра по названию, автору и заметке.
+
+        Запросы от трёх символов ищутся по индексу `book_search`; более
+        короткие — сравнением с нормализованной колонкой `search_text`.
+
+        Args:
+            text: Строка фильтра.
+
+        Returns:
+            Кортеж (SQL условия, параметры).
+        """
+        q = normalize_text(text)
+        match = fts_match_query(q, self._search_uses_trigram())
+        if match is not None:
+            return (
+                "id IN (SELECT rowid FROM book_search WHERE book_search MATCH ?)",
+                [match],
+            )
+        return "instr(search_text, ?) > 0", [q]
+
+    def _search_uses_trigram(self) -> bool:
+        """Признак того, что индекс `book_search` построен токенизатором trigram."""
+        if self._search_trigram is None:
+            rows = self._db.query(
+                "SELECT sql FROM sqlite_master WHERE name = 'book_search';"
+            )
+            self._search_trigram = bool(rows) and "trigram" in (rows[0]["sql"] or "")
+        return self._search_trigram
+
+    @staticmethod
+    def order_by_sql(sort: SortKey) -> str:
+        """Возвращает ORDER BY для ключа сортировки.
+
+        Args:
+            sort: Ключ сортировки.
+
+        Returns:
+            SQL фрагмент ORDER BY.
+        """
+        expr, _, ascending = _SORT_COLUMNS.get(sort, _SORT_COLUMNS["title_asc"])
+        direction = "ASC" if ascending else "DESC"
+        return f"ORDER BY {expr} {direction}, id {direction}"
+
+    @instrumented("library.search_by_content", describe_argument(1, "keyword"))
     def search_books_by_content(
         self, keyword: str, sort: SortKey = "title_asc"
     ) -> list[Book]:
         """Возвращает список книг, содержащих ключевое слово в тексте.
 
+        Ищутся только проиндексированные книги: остальные индексируются
+        `index_missing_books()` или потоковым `iter_books_by_content()`.
+
         Args:
             keyword: Ключевое слово для поиска.
             sort: Ключ сортировки.
@@ -87,25 +473,289 @@ class LibraryService:
         if not keyword:
             return []
 
-        # Получаем все книги
-        all_books = self.list_books(sort=sort)
+        subquery, params = self._index.match_subquery(keyword)
+        rows = self._db.query(
+            f"SELECT {_BOOK_LIST_COLUMNS} FROM books WHERE id IN ({subquery}) "
+            f"{self.order_by_sql(sort)};",
+            params,
+        )
+        return [self._row_to_book(r) for r in rows]
+
+    @instrumented("library.iter_by_content", describe_argument(1, "keyword"))
+    def iter_books_by_content(
+        self,
+        keyword: str,
+        sort: SortKey = "title_asc",
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancelCallback] = None,
+        batch_size: int = 200,
+    ) -> Iterator[list[Book]]:
+        """Потоково ищет книги, содержащие ключевое слово.
+
+        Сначала порциями отдаются совпадения из индекса (в порядке сортировки),
+        затем по одной индексируются ещё не проиндексированные книги и
+        отдаются те из них, что содержат слово.
+
+        Args:
+            keyword: Ключевое слово для поиска.
+            sort: Ключ сортировки.
+            progress: Колбэк прогресса индексации (проверено книг, всего).
+            cancel: Функция, возвращающая True, если поиск нужно прервать.
+            batch_size: Размер порции результатов из индекса.
+
+        Yields:
+            Порции найденных Book.
+        """
+        keyword = keyword.strip()
+        if not keyword:
+            return
+
+        subquery, params = self._index.match_subquery(keyword)
+        rows = self._db.query(
+            f"SELECT {_BOOK_LIST_COLUMNS} FROM books WHERE id IN ({subquery}) "
+            f"{self.order_by_sql(sort)};",
+            params,
+        )
+        for start in range(0, len(rows), batch_size):
+            if cancel and cancel():
+                return
+            yield [self._row_to_book(r) for r in rows[start : start + batch_size]]
+
+        todo = [
+            (row["id"], row["path"])
+            for row in self._index.unindexed_books()
+            if row["format"] == "pdf" and os.path.exists(row["path"])
+        ]
+        if progress:
+            progress(0, len(todo))
+        for done, (book_id, path) in enumerate(todo, start=1):
+            if cancel and cancel():
+                return
+            self._reindex(book_id, path)
+            found = self._db.query(
+                f"SELECT {_BOOK_LIST_COLUMNS} FROM books "
+                f"WHERE id = ? AND id IN ({subquery});",
+                [book_id, *params],
+            )
+            if found:
+                yield [self._row_to_book(r) for r in found]
+            if progress:
+                progress(done, len(todo))
+
+    def index_missing_books(
+        self,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancelCallback] = None,
+    ) -> IndexStats:
+        """Индексирует текст книг, которых ещё нет в полнотекстовом индексе.
+
+        Недоступные файлы пропускаются (будут проиндексированы позже),
+        нечитаемые помечаются как проиндексированные без текста.
+
+        Args:
+            progress: Колбэк прогресса (обработано книг, всего).
+            cancel: Функция, возвращающая True, если работу нужно прервать.
+
+        Returns:
+            IndexStats.
+        """
+        todo = [
+            (row["id"], row["path"])
+            for row in self._index.unindexed_books()
+            if row["format"] == "pdf" and os.path.exists(row["path"])
+        ]
+        return self.index_books(todo, progress=progress, cancel=cancel)
+
+    @instrumented("library.index_books", _describe_index)
+    def index_books(
+        self,
+        books: list[tuple[int, str]],
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancelCallback] = None,
+    ) -> IndexStats:
+        """Индексирует книги: одну — в текущем процессе, несколько — пулом процессов.
+
+        Args:
+            books: Пары (ID книги, путь к PDF).
+            progress: Колбэк прогресса (обработано книг, всего).
+            cancel: Функция, возвращающая True, если работу нужно прервать.
+
+        Returns:
+            IndexStats.
+        """
+        if len(books) == 1:
+            book_id, path = books[0]
+            self._reindex(book_id, path)
+            if progress:
+                progress(1, 1)
+            return IndexStats(books=1)
+        return self._engine.index_books(books, progress=progress, cancel=cancel)
+
+    def _reindex(self, book_id: int, path: str) -> None:
+        """Перестраивает индекс текста книги, не прерывая операцию при ошибке.
+
+        Args:
+            book_id: ID книги.
+            path: Путь к PDF.
+        """
+        try:
+            self._index.index_book(book_id, path)
+        except Exception:
+            self._index.mark_unreadable(book_id)
 
-        # Фильтруем книги, содержащие ключевое слово
-        matching_books = []
-        for book in all_books:
-            if not os.path.exists(book.path):
+    def sync_library(
+        self,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancelCallback] = None,
+    ) -> SyncReport:
+        """Сверяет библиотеку с файлами на диске и переиндексирует изменённые.
+
+        Для каждой книги выполняется только stat: если размер и mtime совпадают
+        с сохранёнными, файл не читается. Иначе сравнивается отпечаток
+        содержимого, и текст извлекается заново только при его изменении.
+        Записи удалённых файлов удаляются, но лишь если папка файла существует
+        (отключённый диск или сетевая папка не приводят к очистке библиотеки).
+
+        Args:
+            progress: Колбэк прогресса переиндексации (обработано книг, всего).
+            cancel: Функция, возвращающая True, если переиндексацию нужно прервать.
+
+        Returns:
+            SyncReport.
+        """
+        report = SyncReport()
+        rows = self._db.query(f"{_SYNC_SELECT};")
+        changed_books = self._sync_rows(rows, report, purge_missing=False)
+        report.reindexed = self.index_books(
+            changed_books, progress=progress, cancel=cancel
+        ).books
+        return report
+
+    @instrumented("library.sync_folder", _describe_folder)
+    def sync_folder(
+        self,
+        folder: str,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancelCallback] = None,
+        directories: Optional[list[str]] = None,
+    ) -> SyncReport:
+        """Сверяет с диском одну папку (рекурсивно).
+
+        Новые файлы папки импортируются, изменённые — обновляются и
+        переиндексируются, записи исчезнувших файлов удаляются. Остальная
+        библиотека не затрагивается. Если самой папки нет (отключённый диск),
+        ничего не удаляется.
+
+        Args:
+            folder: Путь к папке.
+            progress: Колбэк прогресса индексации (обработано книг, всего).
+            cancel: Функция, возвращающая True, если работу нужно прервать.
+            directories: Если передан, в список добавляются все папки
+                внутри `folder` (для наблюдения за ними).
+
+        Returns:
+            SyncReport.
+        """
+        report = SyncReport()
+        root = os.path.abspath(folder)
+        if not os.path.isdir(root):
+            return report
+
+        on_disk = {
+            sf.path: sf
+            for sf in Scanner().iter_folder(root, cancel, directories=directories)
+        }
+        if cancel and cancel():
+            return report
+
+        prefix = os.path.join(root, "")
+        rows = self._db.query(
+            f"{_SYNC_SELECT} WHERE substr(b.path, 1, ?) = ?;", (len(prefix), prefix)
+        )
+        changed_books = self._sync_rows(rows, report, purge_missing=True)
+
+        known = {row["path"] for row in rows}
+        imported = self.import_scanned(
+            [sf for path, sf in on_disk.items() if path not in known], cancel=cancel
+        )
+        report.added = imported.added
+        report.copies = imported.copies
+        changed_books.extend(imported.added_books())
+
+        report.reindexed = self.index_books(
+            changed_books, progress=progress, cancel=cancel
+        ).books
+        return report
+
+    def _sync_rows(
+        self, rows: list, report: SyncReport, purge_missing: bool
+    ) -> list[tuple[int, str]]:
+        """Сверяет записи книг с файлами и обновляет изменённые.
+
+        Для каждой книги выполняется только stat; отпечаток содержимого
+        считается, лишь если изменились размер или mtime. Все изменения
+        записываются одной транзакцией после проверки файлов.
+
+        Args:
+            rows: Строки запроса `_SYNC_SELECT`.
+            report: Отчёт, в котором учитываются итоги.
+            purge_missing: Удалять записи исчезнувших файлов, даже если их
+                папки нет (папка заведомо удалена, а не отключена).
+
+        Returns:
+            Книги (ID, путь), текст которых нужно переиндексировать.
+        """
+        changed_books: list[tuple[int, str]] = []
+        removed: list[tuple[int]] = []
+        updated: list[tuple[int, float, str, int]] = []
+        for row in rows:
+            report.checked += 1
+            path = row["path"]
+            try:
+                st = os.stat(path)
+            except OSError:
+                if purge_missing or os.path.isdir(os.path.dirname(path)):
+                    removed.append((row["id"],))
+                    report.removed += 1
+                else:
+                    report.unavailable += 1
+                continue
+
+            if st.st_size == row["size_bytes"] and st.st_mtime == row["mtime"]:
+                report.unchanged += 1
                 continue
 
             try:
-                # Ищем ключевое слово в PDF
-                matches = self._pdf.search(book.path, keyword, max_hits=1)
-                if matches:  # Если найдено хотя бы одно совпадение
-                    matching_books.append(book)
-            except Exception:
-                # Пропускаем книги с ошибками
+                fingerprint = file_fingerprint(path, st.st_size)
+            except OSError:
+                report.unavailable += 1
                 continue
 
-        return matching_books
+            # Запись из версии без отпечатков: фиксируем текущее состояние файла
+            baseline = (
+                not row["fingerprint"]
+                and row["indexed"]
+                and st.st_size == row["size_bytes"]
+            )
+            changed = fingerprint != row["fingerprint"] and not baseline
+
+            updated.append((st.st_size, st.st_mtime, fingerprint, row["id"]))
+            report.updated += 1
+
+            if changed and row["format"] == "pdf":
+                changed_books.append((row["id"], path))
+
+        with self._db.transaction():
+            self._db.executemany("DELETE FROM books WHERE id = ?;", removed)
+            self._db.executemany(
+                """
+                UPDATE books
+                SET size_bytes = ?, mtime = ?, fingerprint = ?, content_hash = ''
+                WHERE id = ?;
+                """,
+                updated,
+            )
+        return changed_books
 
     def get_book(self, book_id: int) -> Optional[Book]:
         """Возвращает книгу по id.
@@ -117,44 +767,236 @@ class LibraryService:
             Book или None.
         """
         rows = self._db.query("SELECT * FROM books WHERE id = ?;", (book_id,))
-        return self._row_to_book(rows[0]) if rows else None
+        return self._row_to_book(rows[0], with_note=True) if rows else None
 
-    def add_book_from_scanned(self, sf: ScannedFile) -> Optional[int]:
+    def add_book_from_scanned(
+        self, sf: ScannedFile, index: bool = True
+    ) -> ImportResult:
         """Добавляет книгу в БД по результату сканирования.
 
+        Для импорта многих файлов используйте `import_scanned()`.
+
         Args:
             sf: ScannedFile.
+            index: Сразу проиндексировать текст книги.
 
         Returns:
-            ID книги или None (если уже есть/ошибка).
+            ImportResult: "added" с ID новой книги, "copy" с ID книги с тем же
+            содержимым, "duplicate" (путь уже в библиотеке) или "error".
         """
-        title = ""
-        author = ""
-
-        if sf.format == "pdf":
-            try:
-                meta = self._pdf.extract_metadata(sf.path)
-                title = (meta.get("title") or "").strip()
-                author = (meta.get("author") or "").strip()
-            except Exception:
-                title = ""
-                author = ""
+        try:
+            fingerprint = file_fingerprint(sf.path, sf.size_bytes)
+        except OSError:
+            fingerprint = ""
 
-        if not title:
-            title = os.path.splitext(os.path.basename(sf.path))[0]
+        scan = self._find_copies([HashCandidate(sf.path, sf.size_bytes, fingerprint)])
+        copy = scan.copies.get(sf.path)
+        if copy is not None:
+            return ImportResult(sf.path, "copy", copy.book_id, format=sf.format)
+        title, author = read_metadata(sf.path, sf.format)
 
         try:
             cur = self._db.execute(
                 """
-                INSERT INTO books(title, author, path, size_bytes, format, added_at, note)
-                VALUES(?, ?, ?, ?, ?, ?, '');
+                INSERT OR IGNORE INTO books(
+                    title, author, path, size_bytes, format, added_at, note,
+                    mtime, fingerprint, search_text, content_hash
+                )
+                VALUES(?, ?, ?, ?, ?, ?, '', ?, ?, ?, ?);
                 """,
-                (title, author, sf.path, sf.size_bytes, sf.format, self._db.now_iso()),
+                (
+                    title,
+                    author,
+                    sf.path,
+                    sf.size_bytes,
+                    sf.format,
+                    self._db.now_iso(),
+                    sf.mtime,
+                    fingerprint,
+                    book_search_text(title, author, ""),
+                    scan.hashes.get(sf.path, ""),
+                ),
             )
-            # Возвращаем lastrowid напрямую (может быть int или None)
-            return cur.lastrowid  # type: ignore[return-value]
-        except Exception:
-            return None
+        except Exception as e:
+            return ImportResult(sf.path, "error", format=sf.format, error=str(e))
+
+        if not cur.rowcount:
+            rows = self._db.query("SELECT id FROM books WHERE path = ?;", (sf.path,))
+            book_id = rows[0]["id"] if rows else None
+            return ImportResult(sf.path, "duplicate", book_id, format=sf.format)
+
+        book_id = cur.lastrowid
+        if index and book_id is not None and sf.format == "pdf":
+            self._reindex(book_id, sf.path)
+        return ImportResult(sf.path, "added", book_id, format=sf.format)
+
+    def _find_copies(self, candidates: list[HashCandidate]) -> DuplicateScan:
+        """Ищет копии книг библиотеки и сохраняет посчитанные хэши книг.
+
+        Args:
+            candidates: Проверяемые файлы.
+
+        Returns:
+            DuplicateScan.
+        """
+        scan = self._duplicates.find(candidates)
+        if scan.book_hashes:
+            with self._db.transaction():
+                self._db.executemany(
+                    "UPDATE books SET content_hash = ? WHERE id = ?;",
+                    [(h, book_id) for book_id, h in scan.book_hashes.items()],
+                )
+        return scan
+
+    @instrumented("library.import_scanned", _describe_import)
+    def import_scanned(
+        self,
+        files: Iterable[ScannedFile],
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancelCallback] = None,
+    ) -> ImportReport:
+        """Пакетно добавляет книги в БД по результатам сканирования.
+
+        Метаданные и отпечатки файлов извлекаются пулом процессов
+        (`MetadataStage`), а вызывающий поток единолично вставляет книги
+        порциями через `executemany`, по одной транзакции на порцию.
+        Текст книг не индексируется — для этого передайте
+        `report.added_books()` в `index_books()`. Файлы с тем же содержимым,
+        что у книги библиотеки, не добавляются (`report.copies`).
+
+        Args:
+            files: Результаты сканирования (можно передать генератор).
+            chunk_size: Сколько книг вставлять одной транзакцией.
+            progress: Колбэк прогресса (обработано файлов, всего; 0 — неизвестно).
+            cancel: Функция, возвращающая True, если импорт нужно прервать.
+                Уже подготовленные файлы при этом сохраняются.
+
+        Returns:
+            ImportReport с итогом по каждому файлу и пропускной способностью.
+        """
+        total = len(files) if isinstance(files, (list, tuple)) else 0
+        report = ImportReport()
+        started = time.perf_counter()
+        chunk: list[PreparedFile] = []
+
+        for prepared in self._metadata.run(files, cancel=cancel):
+            chunk.append(prepared)
+            if len(chunk) >= chunk_size:
+                self._import_chunk(chunk, report)
+                chunk = []
+            if progress:
+                progress(len(report.results) + len(chunk), total)
+
+        if chunk:
+            self._import_chunk(chunk, report)
+        report.elapsed = time.perf_counter() - started
+        report.cancelled = bool(cancel and cancel())
+        if progress:
+            progress(len(report.results), total)
+        return report
+
+    def _import_chunk(self, chunk: list[PreparedFile], report: ImportReport) -> None:
+        """Вставляет порцию книг одной транзакцией и учитывает итоги в отчёте.
+
+        Перед вставкой файлы сверяются с библиотекой по содержимому
+        (`DuplicateFinder`): копии не добавляются и учитываются как "copy"
+        с ID книги-оригинала.
+
+        Args:
+            chunk: Подготовленные файлы (не более ~500 — лимит параметров SQL).
+            report: Отчёт импорта.
+        """
+        prepared: dict[str, PreparedFile] = {}
+        failed: dict[str, str] = {}
+        for item in chunk:
+            sf = item.file
+            if sf.path in prepared or sf.path in failed:
+                continue
+            if item.error:
+                failed[sf.path] = item.error
+            else:
+                prepared[sf.path] = item
+
+        # Копии уже имеющихся (или импортируемых рядом) книг не добавляются
+        scan = self._find_copies(
+            [
+                HashCandidate(path, item.file.size_bytes, item.fingerprint)
+                for path, item in prepared.items()
+            ]
+        )
+
+        records: dict[str, tuple] = {}
+        added_at = self._db.now_iso()
+        for path, item in prepared.items():
+            if path in scan.copies:
+                continue
+            sf = item.file
+            records[path] = (
+                item.title,
+                item.author,
+                sf.path,
+                sf.size_bytes,
+                sf.format,
+                added_at,
+                sf.mtime,
+                item.fingerprint,
+                book_search_text(item.title, item.author, ""),
+                scan.hashes.get(path, ""),
+            )
+
+        paths = list(records)
+        ids: dict[str, int] = {}
+        existing: set[str] = set()
+        if paths:
+            marks = ",".join("?" * len(paths))
+            try:
+                with self._db.transaction() as conn:
+                    existing = {
+                        row["path"]
+                        for row in conn.execute(
+                            f"SELECT path FROM books WHERE path IN ({marks});", paths
+                        )
+                    }
+                    conn.executemany(
+                        """
+                        INSERT OR IGNORE INTO books(
+                            title, author, path, size_bytes, format, added_at,
+                            note, mtime, fingerprint, search_text, content_hash
+                        )
+                        VALUES(?, ?, ?, ?, ?, ?, '', ?, ?, ?, ?);
+                        """,
+                        [records[p] for p in paths if p not in existing],
+                    )
+                    ids = {
+                        row["path"]: row["id"]
+                        for row in conn.execute(
+                            f"SELECT id, path FROM books WHERE path IN ({marks});",
+                            paths,
+                        )
+                    }
+            except Exception as e:
+                failed.update((p, str(e)) for p in paths)
+                records.clear()
+
+        seen: set[str] = set()
+        for sf in (item.file for item in chunk):
+            if sf.path in failed:
+                result = ImportResult(
+                    sf.path, "error", format=sf.format, error=failed[sf.path]
+                )
+            elif sf.path in existing or sf.path in seen:
+                result = ImportResult(
+                    sf.path, "duplicate", ids.get(sf.path), format=sf.format
+                )
+            elif sf.path in scan.copies:
+                copy = scan.copies[sf.path]
+                original_id = copy.book_id or ids.get(copy.original_path)
+                result = ImportResult(sf.path, "copy", original_id, format=sf.format)
+            else:
+                result = ImportResult(sf.path, "added", ids[sf.path], format=sf.format)
+            report.add(result)
+            seen.add(sf.path)
 
     def update_book(
         self, book_id: int, title: str, author: str, path: str, note: str
@@ -171,19 +1013,61 @@ class LibraryService:
         Returns:
             True, если успешно.
         """
+        old = self.get_book(book_id)
+        # Книга указывает на другой файл — отпечаток и индекс нужно обновить
+        moved = old is not None and old.path != path.strip()
+        file_state = self._file_state(path.strip()) if moved else None
+
         try:
-            self._db.execute(
-                """
-                UPDATE books
-                SET title = ?, author = ?, path = ?, note = ?
-                WHERE id = ?;
-                """,
-                (title.strip(), author.strip(), path.strip(), note, book_id),
-            )
-            return True
+            with self._db.transaction():
+                self._db.execute(
+                    """
+                    UPDATE books
+                    SET title = ?, author = ?, path = ?, note = ?, search_text = ?
+                    WHERE id = ?;
+                    """,
+                    (
+                        title.strip(),
+                        author.strip(),
+                        path.strip(),
+                        note,
+                        book_search_text(title.strip(), author.strip(), note),
+                        book_id,
+                    ),
+                )
+                if file_state is not None:
+                    self._db.execute(
+                        """
+                        UPDATE books
+                        SET size_bytes = ?, mtime = ?, fingerprint = ?,
+                            content_hash = ''
+                        WHERE id = ?;
+                        """,
+                        (*file_state, book_id),
+                    )
         except Exception:
             return False
 
+        if moved and old is not None and old.format == "pdf":
+            self._reindex(book_id, path.strip())
+        return True
+
+    @staticmethod
+    def _file_state(path: str) -> Optional[tuple[int, float, str]]:
+        """Возвращает размер, mtime и отпечаток файла.
+
+        Args:
+            path: Путь к файлу.
+
+        Returns:
+            Кортеж (размер, mtime, отпечаток) или None, если файл недоступен.
+        """
+        try:
+            st = os.stat(path)
+            return st.st_size, st.st_mtime, file_fingerprint(path, st.st_size)
+        except OSError:
+            return None
+
     def delete_book(self, book_id: int) -> bool:
         """Удаляет книгу из БД (файл на диске не удаляется).
 
@@ -193,8 +1077,12 @@ class LibraryService:
         Returns:
             True, если успешно.
         """
+        book = self.get_book(book_id)
         try:
             self._db.execute("DELETE FROM books WHERE id = ?;", (book_id,))
-            return True
         except Exception:
             return False
+
+        if book:
+            self._pdf.release(book.path)
+        return True
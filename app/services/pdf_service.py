@@ -1,9 +1,32 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Any, Iterator, List, Optional, Tuple
 
-import fitz  # PyMuPDF
+from app.instrumentation import OperationDetail, argument, file_detail, instrumented
+from app.services.document_pool import DocumentPool, default_document_pool
+from app.services.fingerprint import current_fingerprint
+from app.services.render_cache import (
+    RenderCache,
+    RenderedPage,
+    RenderKey,
+    default_render_cache,
+)
+
+
+def _describe_render(args: tuple, kwargs: dict, result: Any) -> OperationDetail:
+    """Подробности рендеринга для замеров: файл, одна страница, байты пикселей."""
+    return OperationDetail(str(argument(args, kwargs, 1, "path")), 1, result.nbytes)
+
+
+def _describe_file(args: tuple, kwargs: dict, result: Any) -> OperationDetail:
+    """Подробности операции над PDF для замеров: файл и его размер."""
+    return file_detail(argument(args, kwargs, 1, "path"))
+
+
+def _describe_pages(args: tuple, kwargs: dict, result: Any) -> OperationDetail:
+    """Подробности извлечения текста: файл и число выданных страниц."""
+    return file_detail(argument(args, kwargs, 1, "path"), pages=result)
 
 
 @dataclass(frozen=True)
@@ -17,6 +40,36 @@ class PdfMatch:
 class PdfService:
     """Сервис работы с PDF: метаданные, превью, поиск."""
 
+    def __init__(
+        self,
+        render_cache: Optional[RenderCache] = None,
+        documents: Optional[DocumentPool] = None,
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            render_cache: Кэш отрендеренных страниц (по умолчанию общий кэш приложения).
+            documents: Пул открытых документов (по умолчанию общий пул приложения).
+        """
+        self._render_cache = render_cache
+        self._documents = documents or default_document_pool()
+
+    @property
+    def render_cache(self) -> RenderCache:
+        """Кэш отрендеренных страниц."""
+        if self._render_cache is None:
+            self._render_cache = default_render_cache()
+        return self._render_cache
+
+    def release(self, path: str) -> None:
+        """Закрывает удерживаемый пулом документ (файл перестаёт быть открытым).
+
+        Args:
+            path: Путь к PDF.
+        """
+        self._documents.invalidate(path)
+
+    @instrumented("pdf.extract_metadata", _describe_file)
     def extract_metadata(self, path: str) -> dict:
         """Извлекает метаданные PDF.
 
@@ -26,43 +79,125 @@ class PdfService:
         Returns:
             Словарь метаданных PDF.
         """
-        doc = fitz.open(path)
-        meta = doc.metadata or {}
-        doc.close()
-        return meta
+        with self._documents.open(path) as doc:
+            return dict(doc.metadata or {})
+
+    @instrumented("pdf.render_page", _describe_render)
+    def render_page(
+        self, path: str, page_index: int, max_width: int = 560, dpr: float = 1.0
+    ) -> RenderedPage:
+        """Рендерит страницу PDF в несжатые RGB-пиксели, масштабируя по ширине.
+
+        Пиксели передаются в QImage напрямую, без кодирования в PNG.
+        Результат кэшируется по (отпечаток файла, страница, ширина, DPR),
+        поэтому повторный показ страницы не требует рендеринга.
+
+        Args:
+            path: Путь к PDF.
+            page_index: Индекс страницы (0-based).
+            max_width: Максимальная ширина изображения (в логических пикселях).
+            dpr: Отношение физических пикселей экрана к логическим.
+
+        Returns:
+            RenderedPage (масштаб — в логических пикселях).
+
+        Raises:
+            ValueError: Если индекс страницы некорректный.
+        """
+        try:
+            key: Optional[RenderKey] = RenderKey(
+                current_fingerprint(path), page_index, max_width, round(dpr, 2)
+            )
+        except OSError:
+            key = None
+
+        if key is not None:
+            cached = self.render_cache.get(key)
+            if cached is not None:
+                return cached
+
+        import fitz  # PyMuPDF
+
+        with self._documents.open(path) as doc:
+            # Пока ждали документ, страницу мог отрендерить другой поток
+            # (например, предзагрузка): повторно её не рендерим
+            if key is not None:
+                cached = self.render_cache.get(key)
+                if cached is not None:
+                    return cached
+
+            if page_index < 0 or page_index >= doc.page_count:
+                raise ValueError("Некорректный индекс страницы.")
+
+            page = doc.load_page(page_index)
+            rect = page.rect
+
+            scale = (max_width / rect.width) if rect.width > 0 else 1.0
+            mat = fitz.Matrix(scale * dpr, scale * dpr)
+
+            pix = page.get_pixmap(matrix=mat, alpha=False, colorspace=fitz.csRGB)
+
+            rendered = RenderedPage(
+                samples=pix.samples,
+                width=pix.width,
+                height=pix.height,
+                stride=pix.stride,
+                scale=scale,
+                dpr=dpr,
+            )
+            # В кэш — до освобождения документа, чтобы ждущий поток его нашёл
+            if key is not None:
+                self.render_cache.put(key, rendered)
+        return rendered
 
     def render_page_png_bytes(
-        self, path: str, page_index: int, max_width: int = 560
+        self, path: str, page_index: int, max_width: int = 560, dpr: float = 1.0
     ) -> Tuple[bytes, float]:
         """Рендерит страницу PDF в PNG (bytes), масштабируя по ширине.
 
+        Предназначен для экспорта; для показа на экране используйте render_page().
+
         Args:
             path: Путь к PDF.
             page_index: Индекс страницы (0-based).
-            max_width: Максимальная ширина изображения.
+            max_width: Максимальная ширина изображения (в логических пикселях).
+            dpr: Отношение физических пикселей экрана к логическим.
 
         Returns:
-            Кортеж (PNG bytes, масштаб).
+            Кортеж (PNG bytes, масштаб в логических пикселях).
 
         Raises:
             ValueError: Если индекс страницы некорректный.
         """
-        doc = fitz.open(path)
-        if page_index < 0 or page_index >= doc.page_count:
-            doc.close()
-            raise ValueError("Некорректный индекс страницы.")
+        rendered = self.render_page(path, page_index, max_width, dpr)
+        return rendered.to_png(), rendered.scale
 
-        page = doc.load_page(page_index)
-        rect = page.rect
+    @instrumented("pdf.render_thumbnail", _describe_file)
+    def render_thumbnail_png(self, path: str, height: int = 96) -> bytes:
+        """Рендерит обложку (первую страницу) в PNG заданной высоты.
 
-        scale = (max_width / rect.width) if rect.width > 0 else 1.0
-        mat = fitz.Matrix(scale, scale)
+        Args:
+            path: Путь к PDF.
+            height: Высота миниатюры в пикселях.
 
-        pix = page.get_pixmap(matrix=mat, alpha=False)
-        data = pix.tobytes("png")
-        doc.close()
-        return data, scale
+        Returns:
+            PNG bytes.
 
+        Raises:
+            ValueError: Если в документе нет страниц.
+        """
+        import fitz  # PyMuPDF
+
+        with self._documents.open(path) as doc:
+            if doc.page_count == 0:
+                raise ValueError("Документ не содержит страниц.")
+            page = doc.load_page(0)
+            rect = page.rect
+            scale = (height / rect.height) if rect.height > 0 else 1.0
+            pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+        return pix.tobytes("png")
+
+    @instrumented("pdf.search", _describe_file)
     def search(self, path: str, query: str, max_hits: int = 200) -> list[PdfMatch]:
         """Ищет строку во всём PDF без учета регистра.
 
@@ -82,22 +217,35 @@ class PdfService:
         if not q:
             return []
 
-        doc = fitz.open(path)
         results: list[PdfMatch] = []
         total = 0
 
-        for i in range(doc.page_count):
-            page = doc.load_page(i)
+        with self._documents.open(path) as doc:
+            for i in range(doc.page_count):
+                page = doc.load_page(i)
 
-            # Важно: без учета регистра по умолчанию.
-            rects = page.search_for(q)
+                # Важно: без учета регистра по умолчанию.
+                rects = page.search_for(q)
 
-            if rects:
-                packed = [(r.x0, r.y0, r.x1, r.y1) for r in rects]
-                results.append(PdfMatch(page_index=i, rects=packed))
-                total += len(packed)
-                if total >= max_hits:
-                    break
+                if rects:
+                    packed = [(r.x0, r.y0, r.x1, r.y1) for r in rects]
+                    results.append(PdfMatch(page_index=i, rects=packed))
+                    total += len(packed)
+                    if total >= max_hits:
+                        break
 
-        doc.close()
         return results
+
+    @instrumented("pdf.iter_page_texts", _describe_pages)
+    def iter_page_texts(self, path: str) -> Iterator[Tuple[int, str]]:
+        """Последовательно извлекает текст страниц PDF (для индексации).
+
+        Args:
+            path: Путь к PDF.
+
+        Yields:
+            Кортежи (индекс страницы, текст страницы).
+        """
+        with self._documents.open(path) as doc:
+            for i in range(doc.page_count):
+                yield i, doc.load_page(i).get_text("text")
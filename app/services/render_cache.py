@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from app.settings import get_app_dir
+
+# Лимиты по умолчанию (в памяти хранятся несжатые RGB-пиксели)
+MEMORY_LIMIT_BYTES = 128 * 1024 * 1024
+DISK_LIMIT_BYTES = 512 * 1024 * 1024
+
+# Заголовок файла дискового кэша: масштаб рендеринга (double)
+_HEADER = struct.Struct("<d")
+
+
+class RenderKey(NamedTuple):
+    """Ключ отрендеренной страницы."""
+
+    fingerprint: str
+    page_index: int
+    width: int
+    dpr: float
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    """Отрендеренная страница: несжатые RGB-пиксели (3 байта на пиксель)."""
+
+    samples: bytes
+    width: int
+    height: int
+    stride: int
+    scale: float
+    dpr: float = 1.0
+
+    @property
+    def nbytes(self) -> int:
+        """Размер пиксельных данных в байтах."""
+        return len(self.samples)
+
+    def to_png(self) -> bytes:
+        """Кодирует страницу в PNG (для дискового кэша и экспорта).
+
+        Returns:
+            PNG bytes.
+        """
+        import fitz  # PyMuPDF
+
+        pix = fitz.Pixmap(fitz.csRGB, self.width, self.height, self.samples, False)
+        return pix.tobytes("png")
+
+    @classmethod
+    def from_png(cls, png: bytes, scale: float, dpr: float) -> "RenderedPage":
+        """Декодирует страницу из PNG.
+
+        Args:
+            png: PNG bytes.
+            scale: Масштаб рендеринга.
+            dpr: Отношение физических пикселей к логическим.
+
+        Returns:
+            RenderedPage.
+        """
+        import fitz  # PyMuPDF
+
+        pix = fitz.Pixmap(png)
+        if pix.n != 3 or pix.alpha:
+            pix = fitz.Pixmap(fitz.csRGB, pix, 0)
+        return cls(pix.samples, pix.width, pix.height, pix.stride, scale, dpr)
+
+
+class RenderCache:
+    """Двухуровневый кэш отрендеренных страниц: LRU в памяти + файлы на диске.
+
+    В памяти страницы хранятся несжатыми (готовыми для QImage), на диске — в PNG.
+    Кодирование и запись на диск выполняются отдельным фоновым потоком.
+    Оба уровня ограничены по суммарному размеру в байтах. При переполнении
+    диска удаляются давно не использованные файлы (по mtime, который
+    обновляется при каждом попадании). Потокобезопасен.
+    """
+
+    def __init__(
+        self,
+        memory_limit: int = MEMORY_LIMIT_BYTES,
+        disk_limit: int = DISK_LIMIT_BYTES,
+        disk_dir: Optional[Path] = None,
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            memory_limit: Лимит кэша в памяти (байт).
+            disk_limit: Лимит дискового кэша (байт); 0 — без диска.
+            disk_dir: Папка дискового кэша (по умолчанию ~/.bookvault/render_cache).
+        """
+        self._memory_limit = memory_limit
+        self._disk_limit = disk_limit
+        self._disk_dir = disk_dir or (get_app_dir() / "render_cache")
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[RenderKey, RenderedPage] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="render-cache"
+        )
+
+        # Размеры файлов на диске: {имя файла: размер}; заполняется лениво
+        self._disk_sizes: Optional[dict[str, int]] = None
+        self._disk_bytes = 0
+
+    # ------------------------------------------------------------------ API
+
+    def get(self, key: RenderKey) -> Optional[RenderedPage]:
+        """Возвращает страницу из кэша.
+
+        Args:
+            key: Ключ страницы.
+
+        Returns:
+            RenderedPage или None.
+        """
+        with self._lock:
+            page = self._memory.get(key)
+            if page is not None:
+                self._memory.move_to_end(key)
+                return page
+
+        page = self._disk_get(key)
+        if page is not None:
+            self._memory_put(key, page)
+        return page
+
+    def put(self, key: RenderKey, page: RenderedPage) -> None:
+        """Сохраняет страницу в память и (в фоне) на диск.
+
+        Args:
+            key: Ключ страницы.
+            page: Отрендеренная страница.
+        """
+        self._memory_put(key, page)
+        if self._disk_limit > 0:
+            self._disk_writer.submit(self._disk_put, key, page)
+
+    def clear_memory(self) -> None:
+        """Очищает кэш в памяти."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    # ------------------------------------------------------------------ Memory
+
+    def _memory_put(self, key: RenderKey, page: RenderedPage) -> None:
+        """Кладёт страницу в LRU и вытесняет самые старые при переполнении."""
+        if page.nbytes > self._memory_limit:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= old.nbytes
+            self._memory[key] = page
+            self._memory_bytes += page.nbytes
+            while self._memory_bytes > self._memory_limit:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.nbytes
+
+    # ------------------------------------------------------------------ Disk
+
+    @staticmethod
+    def _file_name(key: RenderKey) -> str:
+        """Имя файла дискового кэша для ключа."""
+        raw = f"{key.fingerprint}:{key.page_index}:{key.width}:{key.dpr:.2f}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest() + ".page"
+
+    def _disk_get(self, key: RenderKey) -> Optional[RenderedPage]:
+        """Читает страницу с диска и отмечает файл как недавно использованный."""
+        if self._disk_limit <= 0:
+            return None
+        path = self._disk_dir / self._file_name(key)
+        try:
+            raw = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        if len(raw) <= _HEADER.size:
+            return None
+        (scale,) = _HEADER.unpack_from(raw)
+        try:
+            return RenderedPage.from_png(raw[_HEADER.size :], scale, key.dpr)
+        except Exception:
+            return None
+
+    def _disk_put(self, key: RenderKey, page: RenderedPage) -> None:
+        """Кодирует страницу в PNG и атомарно записывает на диск (фоновый поток)."""
+        try:
+            png = page.to_png()
+        except Exception:
+            return
+        scale = page.scale
+        name = self._file_name(key)
+        path = self._disk_dir / name
+        tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+        try:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(_HEADER.pack(scale) + png)
+            os.replace(tmp, path)
+        except OSError:
+            return
+
+        with self._lock:
+            sizes = self._load_disk_sizes()
+            self._disk_bytes += _HEADER.size + len(png) - sizes.get(name, 0)
+            sizes[name] = _HEADER.size + len(png)
+            if self._disk_bytes > self._disk_limit:
+                self._evict_disk()
+
+    def _load_disk_sizes(self) -> dict[str, int]:
+        """Однократно читает размеры файлов дискового кэша (под блокировкой)."""
+        if self._disk_sizes is None:
+            self._disk_sizes = {}
+            try:
+                with os.scandir(self._disk_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith(".page"):
+                            self._disk_sizes[entry.name] = entry.stat().st_size
+            except OSError:
+                pass
+            self._disk_bytes = sum(self._disk_sizes.values())
+        return self._disk_sizes
+
+    def _evict_disk(self) -> None:
+        """Удаляет давно не использованные файлы до 90% лимита (под блокировкой)."""
+        sizes = self._load_disk_sizes()
+        by_age = []
+        for name in sizes:
+            try:
+                by_age.append((os.stat(self._disk_dir / name).st_mtime, name))
+            except OSError:
+                by_age.append((0.0, name))
+        by_age.sort()
+
+        target = int(self._disk_limit * 0.9)
+        for _, name in by_age:
+            if self._disk_bytes <= target:
+                break
+            try:
+                os.remove(self._disk_dir / name)
+            except OSError:
+                pass
+            self._disk_bytes -= sizes.pop(name)
+
+
+_default_cache: Optional[RenderCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def default_render_cache() -> RenderCache:
+    """Возвращает общий для приложения кэш рендеринга.
+
+    Returns:
+        RenderCache.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = RenderCache()
+        return _default_cache
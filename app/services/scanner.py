@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
+from fnmatch import fnmatch
 from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+from app.instrumentation import OperationDetail, argument, instrumented
 
 SUPPORTED_EXT = {".pdf"}
 
 
+def _describe_scan(args: tuple, kwargs: dict, result: Any) -> OperationDetail:
+    """Подробности обхода для замеров: папка и число найденных файлов."""
+    return OperationDetail(f"{argument(args, kwargs, 1, 'folder')} ({result} файлов)")
+
+
 @dataclass(frozen=True)
 class ScannedFile:
     """Результат сканирования файла книги."""
@@ -13,11 +23,32 @@ class ScannedFile:
     path: str
     size_bytes: int
     format: str
+    mtime: float = 0.0
 
 
 class Scanner:
     """Сканер папок для поиска поддерживаемых файлов книг."""
 
+    def __init__(
+        self,
+        exclude: Sequence[str] = (),
+        max_depth: Optional[int] = None,
+        follow_symlinks: bool = True,
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            exclude: Glob-шаблоны исключений. Сравниваются с именем файла или
+                папки и с путём относительно сканируемой папки
+                (например, "*.tmp", ".git", "drafts/*").
+            max_depth: Максимальная глубина вложенности (0 — только сама папка,
+                None — без ограничения).
+            follow_symlinks: Переходить по символическим ссылкам на папки.
+        """
+        self._exclude = tuple(exclude)
+        self._max_depth = max_depth
+        self._follow_symlinks = follow_symlinks
+
     def scan_file(self, path: str) -> ScannedFile | None:
         """Проверяет один файл и возвращает описание, если формат поддерживается.
 
@@ -36,11 +67,16 @@ class Scanner:
             return None
 
         try:
-            size = p.stat().st_size
+            st = p.stat()
         except OSError:
             return None
 
-        return ScannedFile(path=str(p), size_bytes=size, format=ext.lstrip("."))
+        return ScannedFile(
+            path=str(p),
+            size_bytes=st.st_size,
+            format=ext.lstrip("."),
+            mtime=st.st_mtime,
+        )
 
     def scan_folder(self, folder: str) -> list[ScannedFile]:
         """Сканирует папку рекурсивно и возвращает поддерживаемые файлы.
@@ -51,14 +87,127 @@ class Scanner:
         Returns:
             Список ScannedFile.
         """
-        root = Path(folder)
-        if not root.exists() or not root.is_dir():
-            return []
-
-        out: list[ScannedFile] = []
-        for p in root.rglob("*"):
-            if p.is_file() and p.suffix.lower() in SUPPORTED_EXT:
-                sf = self.scan_file(str(p))
-                if sf:
-                    out.append(sf)
-        return out
+        return list(self.iter_folder(folder))
+
+    @instrumented("scanner.iter_folder", _describe_scan)
+    def iter_folder(
+        self,
+        folder: str,
+        cancel: Optional[Callable[[], bool]] = None,
+        directories: Optional[list[str]] = None,
+    ) -> Iterator[ScannedFile]:
+        """Потоково сканирует папку, отдавая файлы по мере обнаружения.
+
+        Обход построен на `os.scandir`: тип записи берётся из `DirEntry` без
+        лишних системных вызовов, а stat выполняется один раз на файл.
+        Символическая ссылка на папку обходится, только если она ведёт за
+        пределы сканируемой папки и на папку, ещё не обойдённую по другой
+        ссылке, поэтому циклы ссылок не приводят к бесконечному обходу.
+
+        Args:
+            folder: Путь к папке.
+            cancel: Функция, возвращающая True, если обход нужно прервать.
+            directories: Если передан, в список добавляются все обойдённые
+                папки (например, чтобы поставить их под наблюдение).
+
+        Yields:
+            ScannedFile.
+        """
+        root = os.path.abspath(folder)
+        if not os.path.isdir(root):
+            return
+
+        # Реальные пути папок, в которые уже вели обойдённые ссылки
+        linked = {os.path.realpath(root)}
+        stack: list[tuple[str, int]] = [(root, 0)]
+
+        while stack:
+            if cancel and cancel():
+                return
+            directory, depth = stack.pop()
+            if directories is not None:
+                directories.append(directory)
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            subdirs: list[str] = []
+            for entry in entries:
+                if self._is_excluded(entry, root):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=self._follow_symlinks):
+                        if self._max_depth is not None and depth >= self._max_depth:
+                            continue
+                        if entry.is_symlink() and not self._follow_link(
+                            entry.path, linked
+                        ):
+                            continue
+                        subdirs.append(entry.path)
+                        continue
+
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    if ext not in SUPPORTED_EXT or not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+
+                if cancel and cancel():
+                    return
+                yield ScannedFile(
+                    path=entry.path,
+                    size_bytes=st.st_size,
+                    format=ext.lstrip("."),
+                    mtime=st.st_mtime,
+                )
+
+            # Обратный порядок: папки обходятся по алфавиту
+            stack.extend((path, depth + 1) for path in reversed(subdirs))
+
+    @staticmethod
+    def _follow_link(path: str, linked: set[str]) -> bool:
+        """Решает, обходить ли папку по символической ссылке.
+
+        Сравниваются реальные пути, а не inode: `DirEntry.stat()` в Windows
+        возвращает нулевые st_dev и st_ino.
+
+        Args:
+            path: Путь к ссылке.
+            linked: Реальные пути сканируемой папки и уже обойдённых ссылок
+                (дополняется).
+
+        Returns:
+            True, если папка ещё не обходится ни напрямую, ни по ссылке.
+        """
+        target = os.path.realpath(path)
+        prefix = os.path.join(target, "")
+        for seen in linked:
+            # Папка внутри уже обходимой будет обойдена и без ссылки, а ссылка
+            # на папку выше по дереву замыкает цикл
+            if target == seen or target.startswith(os.path.join(seen, "")):
+                return False
+            if seen.startswith(prefix):
+                return False
+        linked.add(target)
+        return True
+
+    def _is_excluded(self, entry: os.DirEntry, root: str) -> bool:
+        """Проверяет запись по шаблонам исключений.
+
+        Args:
+            entry: Запись каталога.
+            root: Сканируемая папка.
+
+        Returns:
+            True, если запись нужно пропустить.
+        """
+        if not self._exclude:
+            return False
+        rel = os.path.relpath(entry.path, root).replace(os.sep, "/")
+        return any(
+            fnmatch(entry.name, pattern) or fnmatch(rel, pattern)
+            for pattern in self._exclude
+        )
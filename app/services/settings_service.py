@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+from typing import Callable
+
 from app.db import Database
 
+# Подписчик на изменения: (ключ, новое значение)
+SettingsListener = Callable[[str, str], None]
+
 
 class SettingsService:
-    """Сервис для хранения пользовательских настроек в SQLite."""
+    """Сервис для хранения пользовательских настроек в SQLite.
+
+    Все настройки читаются из БД один раз, дальше чтение идёт из памяти.
+    Изменения сразу видны через `get()`, а в БД записываются пачкой при
+    `flush()` (или `take_pending()` + `write()` из фонового потока).
+    Подписчики `subscribe()` узнают о каждом изменении значения.
+    Рассчитан на один экземпляр на приложение.
+    """
 
     def __init__(self, db: Database) -> None:
         """Инициализация.
@@ -13,6 +25,9 @@ class SettingsService:
             db: Экземпляр Database.
         """
         self._db = db
+        self._values: dict[str, str] | None = None
+        self._pending: dict[str, str] = {}
+        self._listeners: list[SettingsListener] = []
 
     def get(self, key: str, default: str) -> str:
         """Возвращает значение настройки.
@@ -24,8 +39,37 @@ class SettingsService:
         Returns:
             Значение настройки или default.
         """
-        rows = self._db.query("SELECT value FROM settings WHERE key = ?;", (key,))
-        return rows[0]["value"] if rows else default
+        return self._cache().get(key, default)
+
+    def get_int(self, key: str, default: int) -> int:
+        """Возвращает целочисленную настройку.
+
+        Args:
+            key: Ключ настройки.
+            default: Значение по умолчанию (и при нечисловом значении).
+
+        Returns:
+            Значение настройки.
+        """
+        try:
+            return int(self._cache()[key])
+        except (KeyError, ValueError):
+            return default
+
+    def get_bool(self, key: str, default: bool) -> bool:
+        """Возвращает логическую настройку ("1"/"0").
+
+        Args:
+            key: Ключ настройки.
+            default: Значение по умолчанию.
+
+        Returns:
+            Значение настройки.
+        """
+        value = self._cache().get(key)
+        if value is None:
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
 
     def set(self, key: str, value: str) -> None:
         """Сохраняет настройку.
@@ -34,11 +78,107 @@ class SettingsService:
             key: Ключ настройки.
             value: Значение.
         """
-        self._db.execute(
+        self.set_many({key: value})
+
+    def set_int(self, key: str, value: int) -> None:
+        """Сохраняет целочисленную настройку.
+
+        Args:
+            key: Ключ настройки.
+            value: Значение.
+        """
+        self.set(key, str(int(value)))
+
+    def set_bool(self, key: str, value: bool) -> None:
+        """Сохраняет логическую настройку.
+
+        Args:
+            key: Ключ настройки.
+            value: Значение.
+        """
+        self.set(key, "1" if value else "0")
+
+    def set_many(self, values: dict[str, str]) -> None:
+        """Сохраняет несколько настроек (запись в БД — при `flush()`).
+
+        Args:
+            values: Значения по ключам.
+        """
+        cache = self._cache()
+        changed = {k: v for k, v in values.items() if cache.get(k) != v}
+        cache.update(changed)
+        self._pending.update(changed)
+        for key, value in changed.items():
+            for listener in list(self._listeners):
+                listener(key, value)
+
+    def subscribe(self, listener: SettingsListener) -> None:
+        """Подписывает на изменения настроек.
+
+        Args:
+            listener: Функция (ключ, новое значение).
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: SettingsListener) -> None:
+        """Отменяет подписку на изменения настроек.
+
+        Args:
+            listener: Ранее подписанная функция.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def has_pending(self) -> bool:
+        """Есть ли изменения, ещё не записанные в БД."""
+        return bool(self._pending)
+
+    def take_pending(self) -> dict[str, str]:
+        """Забирает изменения, ещё не записанные в БД.
+
+        Returns:
+            Значения по ключам (их нужно передать в `write()`).
+        """
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def restore_pending(self, values: dict[str, str]) -> None:
+        """Возвращает в очередь записи значения, которые не удалось записать.
+
+        Значения, изменённые после `take_pending()`, не перезаписываются.
+
+        Args:
+            values: Значения по ключам.
+        """
+        for key, value in values.items():
+            self._pending.setdefault(key, value)
+
+    def flush(self) -> None:
+        """Записывает накопленные изменения в БД одной транзакцией."""
+        self.write(self.take_pending())
+
+    def write(self, values: dict[str, str]) -> None:
+        """Записывает настройки в БД одной транзакцией (без кэша).
+
+        Можно вызывать из фонового потока на клоне БД.
+
+        Args:
+            values: Значения по ключам.
+        """
+        if not values:
+            return
+        self._db.executemany(
             """
             INSERT INTO settings(key, value)
             VALUES(?, ?)
             ON CONFLICT(key) DO UPDATE SET value = excluded.value;
             """,
-            (key, value),
+            values.items(),
         )
+
+    def _cache(self) -> dict[str, str]:
+        """Возвращает настройки в памяти, при первом обращении читая их из БД."""
+        if self._values is None:
+            rows = self._db.query("SELECT key, value FROM settings;")
+            self._values = {row["key"]: row["value"] for row in rows}
+        return self._values
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from app.db import Database
+from app.models import Book
+from app.services.library_service import LibraryService, SortKey
+
+# Сколько первых книг списка сохраняется в снимке (с запасом на высокое окно)
+SNAPSHOT_SIZE = 100
+
+# Версия формата файла снимка
+_FORMAT_VERSION = 1
+
+# Поля книги в снимке (колонки списка книг)
+_BOOK_FIELDS = ("id", "title", "author", "path", "size_bytes", "format", "added_at")
+
+
+class StartupSnapshot:
+    """Снимок первого экрана списка книг для быстрого запуска.
+
+    При закрытии окна сохраняются первые книги списка и их общее число
+    (небольшой JSON рядом с файлом БД); при запуске окно сразу показывает
+    их, а полный список загружается после первой отрисовки. Снимок —
+    только подсказка: он может устареть, и любая ошибка чтения означает,
+    что снимка нет.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Инициализация.
+
+        Args:
+            path: Путь к файлу снимка.
+        """
+        self._path = path
+
+    @classmethod
+    def for_database(cls, db: Database) -> "StartupSnapshot":
+        """Снимок, хранящийся рядом с файлом БД.
+
+        Args:
+            db: Экземпляр Database.
+
+        Returns:
+            StartupSnapshot.
+        """
+        return cls(Path(db.path + "-snapshot.json"))
+
+    def load(self, sort: SortKey) -> Optional[tuple[list[Book], int]]:
+        """Читает снимок списка с указанной сортировкой.
+
+        Args:
+            sort: Ключ сортировки, с которой открывается окно.
+
+        Returns:
+            Кортеж (первые книги, общее число книг) или None, если снимка
+            нет, он повреждён или снят с другой сортировкой.
+        """
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            if data["version"] != _FORMAT_VERSION or data["sort"] != sort:
+                return None
+            books = [
+                Book(**{name: item[name] for name in _BOOK_FIELDS})
+                for item in data["books"]
+            ]
+            return books, int(data["count"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, db: Database, sort: SortKey) -> None:
+        """Сохраняет начало списка книг без фильтра.
+
+        Args:
+            db: Экземпляр Database.
+            sort: Ключ сортировки.
+        """
+        # Прямой запрос: сервисы библиотеки для сотни строк не нужны
+        rows = db.query(
+            f"SELECT {', '.join(_BOOK_FIELDS)} FROM books "
+            f"{LibraryService.order_by_sql(sort)} LIMIT ?;",
+            (SNAPSHOT_SIZE,),
+        )
+        data = {
+            "version": _FORMAT_VERSION,
+            "sort": sort,
+            "count": db.query("SELECT COUNT(*) AS c FROM books;")[0]["c"],
+            "books": [{name: row[name] for name in _BOOK_FIELDS} for row in rows],
+        }
+        # Запись через временный файл: прерванное сохранение не портит снимок
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except OSError:
+            pass
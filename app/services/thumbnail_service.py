@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional, Sequence
+
+from app.db import Database
+from app.services.pdf_service import PdfService
+
+# Высота хранимой миниатюры (с запасом для экранов с DPR 2)
+THUMBNAIL_HEIGHT = 96
+
+
+class ThumbnailService:
+    """Хранилище миниатюр обложек книг (PNG в таблице `thumbnails`).
+
+    Миниатюра привязана к отпечатку файла: после изменения файла
+    она считается устаревшей и создаётся заново.
+    """
+
+    def __init__(self, db: Database, pdf: Optional[PdfService] = None) -> None:
+        """Инициализация.
+
+        Args:
+            db: Экземпляр Database.
+            pdf: Сервис PDF для рендеринга обложек.
+        """
+        self._db = db
+        self._pdf = pdf or PdfService()
+
+    def load(self, book_ids: Sequence[int]) -> dict[int, bytes]:
+        """Возвращает актуальные миниатюры указанных книг.
+
+        Args:
+            book_ids: ID книг.
+
+        Returns:
+            Словарь {ID книги: PNG bytes}; книги без миниатюры отсутствуют.
+        """
+        if not book_ids:
+            return {}
+        marks = ",".join("?" * len(book_ids))
+        rows = self._db.query(
+            f"""
+            SELECT t.book_id, t.png FROM thumbnails t
+            JOIN books b ON b.id = t.book_id AND b.fingerprint = t.fingerprint
+            WHERE t.book_id IN ({marks});
+            """,
+            list(book_ids),
+        )
+        return {row["book_id"]: bytes(row["png"]) for row in rows}
+
+    def missing(self, limit: int = 500, after_id: int = 0) -> list[int]:
+        """Возвращает книги без актуальной миниатюры (по возрастанию ID).
+
+        Args:
+            limit: Максимальное число книг.
+            after_id: Вернуть только книги с ID больше указанного.
+
+        Returns:
+            Список ID книг.
+        """
+        rows = self._db.query(
+            """
+            SELECT b.id FROM books b
+            LEFT JOIN thumbnails t ON t.book_id = b.id
+            WHERE b.id > ? AND b.format = 'pdf'
+              AND (t.book_id IS NULL OR t.fingerprint != b.fingerprint)
+            ORDER BY b.id
+            LIMIT ?;
+            """,
+            (after_id, limit),
+        )
+        return [row["id"] for row in rows]
+
+    def generate(self, book_ids: Iterable[int]) -> dict[int, bytes]:
+        """Рендерит и сохраняет миниатюры книг одной транзакцией.
+
+        Для нечитаемых файлов сохраняется пустая миниатюра, чтобы не
+        повторять попытку до изменения файла.
+
+        Args:
+            book_ids: ID книг.
+
+        Returns:
+            Словарь {ID книги: PNG bytes} успешно созданных миниатюр.
+        """
+        ids = list(book_ids)
+        if not ids:
+            return {}
+        marks = ",".join("?" * len(ids))
+        rows = self._db.query(
+            f"SELECT id, path, fingerprint FROM books WHERE id IN ({marks});", ids
+        )
+
+        created: dict[int, bytes] = {}
+        records = []
+        for row in rows:
+            try:
+                png = self._pdf.render_thumbnail_png(row["path"], THUMBNAIL_HEIGHT)
+            except Exception:
+                png = b""
+            records.append((row["id"], row["fingerprint"], png))
+            if png:
+                created[row["id"]] = png
+
+        with self._db.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO thumbnails(book_id, fingerprint, png) VALUES(?, ?, ?)
+                ON CONFLICT(book_id) DO UPDATE SET
+                    fingerprint = excluded.fingerprint,
+                    png = excluded.png;
+                """,
+                records,
+            )
+        return created
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+
+from app.db import Database
+
+
+class WatchService:
+    """Список отслеживаемых папок, которые синхронизируются автоматически."""
+
+    def __init__(self, db: Database) -> None:
+        """Инициализация.
+
+        Args:
+            db: Экземпляр Database.
+        """
+        self._db = db
+
+    def list_folders(self) -> list[str]:
+        """Возвращает отслеживаемые папки.
+
+        Returns:
+            Список абсолютных путей.
+        """
+        rows = self._db.query("SELECT path FROM watched_folders ORDER BY path;")
+        return [row["path"] for row in rows]
+
+    def add_folder(self, path: str) -> str:
+        """Добавляет папку в список отслеживаемых.
+
+        Args:
+            path: Путь к папке.
+
+        Returns:
+            Нормализованный абсолютный путь.
+        """
+        path = os.path.abspath(path)
+        self._db.execute(
+            "INSERT OR IGNORE INTO watched_folders(path, added_at) VALUES(?, ?);",
+            (path, self._db.now_iso()),
+        )
+        return path
+
+    def remove_folder(self, path: str) -> None:
+        """Убирает папку из отслеживаемых (книги остаются в библиотеке).
+
+        Args:
+            path: Путь к папке.
+        """
+        self._db.execute(
+            "DELETE FROM watched_folders WHERE path = ?;", (os.path.abspath(path),)
+        )
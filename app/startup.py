@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Optional
+
+# Переменная окружения, включающая отчёт о времени запуска
+STARTUP_TIMING_ENV = "BOOKVAULT_STARTUP_TIMING"
+
+
+class StartupTimer:
+    """Замеры этапов запуска приложения (импорт, открытие БД, первый кадр).
+
+    Каждая отметка `mark()` хранит время от предыдущей, `report()` собирает
+    их в одну строку. Отчёт печатается, только если задана переменная
+    окружения `BOOKVAULT_STARTUP_TIMING`.
+    """
+
+    def __init__(self, started: Optional[float] = None) -> None:
+        """Инициализация.
+
+        Args:
+            started: Момент начала запуска (`time.perf_counter()`); по
+                умолчанию — момент создания объекта.
+        """
+        self._started = time.perf_counter() if started is None else started
+        self._last = self._started
+        self._stages: list[tuple[str, float]] = []
+        self._reported = False
+
+    def mark(self, stage: str) -> None:
+        """Отмечает завершение этапа.
+
+        Повторная отметка того же этапа игнорируется.
+
+        Args:
+            stage: Название этапа.
+        """
+        if self.has(stage):
+            return
+        now = time.perf_counter()
+        self._stages.append((stage, (now - self._last) * 1000))
+        self._last = now
+
+    def has(self, stage: str) -> bool:
+        """Отмечен ли этап."""
+        return any(name == stage for name, _ in self._stages)
+
+    def stages(self) -> list[tuple[str, float]]:
+        """Возвращает этапы в порядке отметки.
+
+        Returns:
+            Список (название, длительность в миллисекундах).
+        """
+        return list(self._stages)
+
+    def total_ms(self) -> float:
+        """Время от начала запуска до последней отметки, в миллисекундах."""
+        return (self._last - self._started) * 1000
+
+    def report(self) -> str:
+        """Возвращает отчёт о запуске одной строкой."""
+        parts = [f"{name} {ms:.0f} ms" for name, ms in self._stages]
+        parts.append(f"всего {self.total_ms():.0f} ms")
+        return "[STARTUP] " + ", ".join(parts)
+
+    def print_report(self) -> None:
+        """Печатает отчёт один раз, если это включено переменной окружения."""
+        if self._reported or not os.environ.get(STARTUP_TIMING_ENV):
+            return
+        self._reported = True
+        print(self.report())
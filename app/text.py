@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Optional
+
+
+def normalize_text(text: str) -> str:
+    """Нормализует текст для индекса и запросов.
+
+    Пробельные символы (включая переносы строк PDF) схлопываются в один пробел,
+    регистр приводится через `casefold()` (корректно и для кириллицы).
+
+    Args:
+        text: Исходный текст.
+
+    Returns:
+        Нормализованная строка.
+    """
+    return " ".join(text.split()).casefold()
+
+
+def book_search_text(title: str, author: str, note: str) -> str:
+    """Формирует текст для поиска книги по названию, автору и заметке.
+
+    Args:
+        title: Название.
+        author: Автор.
+        note: Заметка.
+
+    Returns:
+        Нормализованная строка.
+    """
+    return normalize_text(f"{title} {author} {note}")
+
+
+def fts_match_query(query: str, trigram: bool, min_trigram: int = 3) -> Optional[str]:
+    """Формирует выражение MATCH для FTS5 по нормализованной строке.
+
+    Args:
+        query: Нормализованная строка запроса.
+        trigram: Индекс построен токенизатором trigram.
+        min_trigram: Минимальная длина запроса для trigram.
+
+    Returns:
+        Выражение MATCH или None, если индекс для запроса неприменим
+        (тогда нужен поиск подстроки без индекса).
+    """
+    if trigram:
+        if len(query) < min_trigram:
+            return None
+        return '"' + query.replace('"', '""') + '"'
+
+    terms = [t.replace('"', '""') for t in query.split()]
+    if not terms:
+        return None
+    return " ".join(f'"{t}"*' for t in terms)
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from PySide6.QtCore import QRect, QSize, Qt
 from PySide6.QtGui import QColor, QFont, QPainter, QPalette
 from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate
 
+from app.ui.thumbnails import THUMBNAIL_DISPLAY_HEIGHT, ThumbnailStore
+
+# Ширина места под обложку (пропорции страницы A4)
+THUMBNAIL_SLOT_WIDTH = 36
+
 
 class BookItemDelegate(QStyledItemDelegate):
     """Delegate для отрисовки карточки книги в списке."""
 
+    def __init__(self, thumbnails: Optional[ThumbnailStore] = None) -> None:
+        """Инициализация.
+
+        Args:
+            thumbnails: Хранилище миниатюр обложек (без него обложки не рисуются).
+        """
+        super().__init__()
+        self._thumbnails = thumbnails
+
     def sizeHint(self, option, index) -> QSize:
         """Возвращает предпочтительный размер элемента списка."""
         return QSize(option.rect.width(), 66)
@@ -72,11 +88,37 @@ class BookItemDelegate(QStyledItemDelegate):
             title_color = QColor(0, 0, 0)
             meta_color = QColor(100, 100, 100)
 
+        # Обложка (только из памяти — PDF во время отрисовки не открывается)
+        text_left = rect.left() + 12
+        if self._thumbnails is not None:
+            slot = QRect(
+                rect.left() + 8,
+                rect.top() + (rect.height() - THUMBNAIL_DISPLAY_HEIGHT) // 2,
+                THUMBNAIL_SLOT_WIDTH,
+                THUMBNAIL_DISPLAY_HEIGHT,
+            )
+            pix = self._thumbnails.pixmap(book.id) if book.id is not None else None
+            if pix is not None:
+                size = pix.deviceIndependentSize().toSize()
+                painter.drawPixmap(
+                    slot.left() + (slot.width() - size.width()) // 2, slot.top(), pix
+                )
+            else:
+                # Заглушка, пока миниатюра не готова
+                if is_dark:
+                    painter.setBrush(QColor(255, 255, 255, 35))
+                else:
+                    painter.setBrush(QColor(0, 0, 0, 25))
+                painter.drawRoundedRect(slot, 3, 3)
+            text_left = slot.right() + 10
+
+        text_width = rect.right() - 12 - text_left
+
         # Название книги
         painter.setFont(title_font)
         painter.setPen(title_color)
         painter.drawText(
-            QRect(rect.left() + 12, rect.top() + 8, rect.width() - 24, 20),
+            QRect(text_left, rect.top() + 8, text_width, 20),
             Qt.TextFlag.TextSingleLine,
             book.title,
         )
@@ -86,7 +128,7 @@ class BookItemDelegate(QStyledItemDelegate):
         painter.setPen(meta_color)
         author = book.author or "—"
         painter.drawText(
-            QRect(rect.left() + 12, rect.top() + 32, rect.width() - 24, 18),
+            QRect(text_left, rect.top() + 32, text_width, 18),
             Qt.TextFlag.TextSingleLine,
             f"{author} • {book.format.upper()}",
         )
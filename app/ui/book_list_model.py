@@ -1,23 +1,101 @@
 from __future__ import annotations
 
-from typing import Any
+from bisect import bisect_left
+from typing import Any, Callable, Optional
 
 from PySide6.QtCore import QAbstractListModel, QModelIndex, QPersistentModelIndex, Qt
 
 from app.models import Book
+from app.services.library_service import PAGE_SIZE, PageCursor
+
+# Загрузка страницы: (позиция или None, размер) -> (книги, следующая позиция)
+PageFetcher = Callable[
+    [Optional[PageCursor], int], tuple[list[Book], Optional[PageCursor]]
+]
+
+# Сколько уже загруженных строк перечитывать при смене источника
+_RELOAD_LIMIT = 2000
+
+# Больше перемещений — дешевле сбросить модель (например, смена сортировки)
+_MAX_MOVES = 64
+
+
+def _stable_positions(positions: list[int]) -> set[int]:
+    """Возвращает позиции, образующие наибольшую возрастающую подпоследовательность.
+
+    Книги на этих позициях остаются на месте, остальные перемещаются.
+
+    Args:
+        positions: Текущие позиции книг в порядке нового списка.
+
+    Returns:
+        Множество позиций, которые не нужно перемещать.
+    """
+    tails: list[int] = []
+    tail_idx: list[int] = []
+    prev = [-1] * len(positions)
+    for i, pos in enumerate(positions):
+        k = bisect_left(tails, pos)
+        if k == len(tails):
+            tails.append(pos)
+            tail_idx.append(i)
+        else:
+            tails[k] = pos
+            tail_idx[k] = i
+        prev[i] = tail_idx[k - 1] if k else -1
+
+    stable: set[int] = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i >= 0:
+        stable.add(positions[i])
+        i = prev[i]
+    return stable
+
+
+def _same_display(old: Book, new: Book) -> bool:
+    """Совпадают ли поля, которые показывает список (заметка не показывается).
+
+    Дата добавления сравнивается без разбора строки из БД.
+    """
+    return (
+        old.title == new.title
+        and old.author == new.author
+        and old.path == new.path
+        and old.size_bytes == new.size_bytes
+        and old.format == new.format
+        and old.same_added_at(new)
+    )
 
 
 class BookListModel(QAbstractListModel):
-    """Модель данных для списка книг (QListView)."""
+    """Модель данных для списка книг (QListView).
 
-    def __init__(self, books: list[Book] | None = None) -> None:
+    Работает в двух режимах: с источником страниц (`set_source`) книги
+    подгружаются по мере прокрутки через `canFetchMore`/`fetchMore`, поэтому
+    открытие и сортировка большой библиотеки не зависят от её размера;
+    без источника модель показывает переданный список (`set_books`).
+
+    Новый список применяется по разнице с текущим (по ID книг): удалённые,
+    вставленные и перемещённые строки передаются представлению точечными
+    сигналами, поэтому выделение, прокрутка и раскладка карточек
+    сохраняются. Полный сброс модели — только когда списки почти не
+    совпадают.
+    """
+
+    def __init__(
+        self, books: list[Book] | None = None, page_size: int = PAGE_SIZE
+    ) -> None:
         """Инициализация.
 
         Args:
             books: Начальный список книг.
+            page_size: Сколько книг подгружать за раз.
         """
         super().__init__()
         self._books: list[Book] = books or []
+        self._page_size = page_size
+        self._fetch: Optional[PageFetcher] = None
+        self._cursor: Optional[PageCursor] = None
 
     def rowCount(
         self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()
@@ -25,8 +103,10 @@ class BookListModel(QAbstractListModel):
         """Возвращает количество строк.
 
         Returns:
-            Количество книг.
+            Количество загруженных книг.
         """
+        if parent.isValid():
+            return 0
         return len(self._books)
 
     def data(
@@ -59,12 +139,197 @@ class BookListModel(QAbstractListModel):
 
         return None
 
+    def canFetchMore(self, parent: QModelIndex | QPersistentModelIndex) -> bool:
+        """Есть ли ещё не загруженные книги.
+
+        Args:
+            parent: Родительский индекс (у списка — невалидный).
+
+        Returns:
+            True, если источник может отдать следующую страницу.
+        """
+        if parent.isValid():
+            return False
+        return self._fetch is not None and self._cursor is not None
+
+    def fetchMore(self, parent: QModelIndex | QPersistentModelIndex) -> None:
+        """Подгружает следующую страницу книг.
+
+        Args:
+            parent: Родительский индекс (у списка — невалидный).
+        """
+        if not self.canFetchMore(parent):
+            return
+        assert self._fetch is not None
+        books, self._cursor = self._fetch(self._cursor, self._page_size)
+        self._append(books)
+
+    def set_source(self, fetch: PageFetcher) -> None:
+        """Переключает модель на постраничную загрузку.
+
+        Загружается столько книг, сколько уже было показано (но не меньше
+        страницы), чтобы сохранить позицию прокрутки.
+
+        Args:
+            fetch: Функция загрузки страницы.
+        """
+        books, cursor = fetch(None, self.reload_limit())
+        self.set_page(fetch, books, cursor)
+
+    def set_page(
+        self, fetch: PageFetcher, books: list[Book], cursor: Optional[PageCursor]
+    ) -> None:
+        """Показывает начало списка, уже загруженное источником (например, в фоне).
+
+        Args:
+            fetch: Функция загрузки следующих страниц.
+            books: Загруженные книги.
+            cursor: Позиция следующей страницы (None — загружено всё).
+        """
+        self._fetch = fetch
+        self._cursor = cursor
+        self.update_books(books)
+
+    def reload_limit(self) -> int:
+        """Сколько книг загружать при смене источника.
+
+        Returns:
+            Число книг: не меньше страницы и не меньше уже показанных
+            (в пределах разумного), чтобы сохранить позицию прокрутки.
+        """
+        return max(self._page_size, min(len(self._books), _RELOAD_LIMIT))
+
     def set_books(self, books: list[Book]) -> None:
-        """Заменяет список книг в модели.
+        """Заменяет список книг в модели (без постраничной загрузки).
+
+        Args:
+            books: Новый список книг.
+        """
+        self._fetch = None
+        self._cursor = None
+        self.update_books(books)
+
+    def update_books(self, books: list[Book]) -> None:
+        """Приводит загруженный список к новому минимальным числом изменений.
 
         Args:
             books: Новый список книг.
         """
+        new_ids = [b.id for b in books]
+        if len(set(new_ids)) != len(new_ids) or None in new_ids:
+            # Без уникальных ID разницу не вычислить
+            self._reset(books)
+            return
+
+        wanted = set(new_ids)
+        self._remove_missing(wanted)
+
+        index = {b.id: row for row, b in enumerate(self._books)}
+        positions = [index[i] for i in new_ids if i in index]
+        if not positions and self._books:
+            self._reset(books)
+            return
+
+        stable = _stable_positions(positions)
+        if len(positions) - len(stable) > _MAX_MOVES:
+            self._reset(books)
+            return
+
+        self._move_to_order([i for i in new_ids if i in index], stable)
+        self._insert_new(books)
+
+    def _reset(self, books: list[Book]) -> None:
+        """Заменяет список со сбросом модели."""
         self.beginResetModel()
-        self._books = books
+        self._books = list(books)
         self.endResetModel()
+
+    def _remove_missing(self, wanted: set[Optional[int]]) -> None:
+        """Удаляет строки книг, которых нет в новом списке (снизу вверх)."""
+        row = len(self._books) - 1
+        while row >= 0:
+            if self._books[row].id in wanted:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self._books[row].id not in wanted:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self._books[row + 1 : last + 1]
+            self.endRemoveRows()
+
+    def _move_to_order(self, order: list[Optional[int]], stable: set[int]) -> None:
+        """Переставляет строки в порядок `order`.
+
+        Строки из `stable` (исходные позиции) остаются на месте; каждая
+        другая ставится сразу после своего предшественника в `order`.
+        """
+        stable_ids = {self._books[pos].id for pos in stable}
+        for k, book_id in enumerate(order):
+            if book_id in stable_ids:
+                continue
+            src = next(r for r, b in enumerate(self._books) if b.id == book_id)
+            if k == 0:
+                dest = 0
+            else:
+                prev = order[k - 1]
+                dest = next(r for r, b in enumerate(self._books) if b.id == prev)
+                dest += 0 if dest > src else 1
+            if dest == src:
+                continue
+            # Для Qt позиция назначения считается до удаления строки
+            qt_dest = dest + 1 if dest > src else dest
+            self.beginMoveRows(QModelIndex(), src, src, QModelIndex(), qt_dest)
+            self._books.insert(dest, self._books.pop(src))
+            self.endMoveRows()
+
+    def _insert_new(self, books: list[Book]) -> None:
+        """Вставляет недостающие книги и обновляет данные изменившихся.
+
+        Книга с прежними показываемыми полями остаётся прежним объектом,
+        вместе с уже загруженной заметкой.
+        """
+        row = 0
+        while row < len(books):
+            current = self._books[row] if row < len(self._books) else None
+            if current is not None and current.id == books[row].id:
+                if not _same_display(current, books[row]):
+                    self._books[row] = books[row]
+                    idx = self.index(row)
+                    self.dataChanged.emit(idx, idx)
+                row += 1
+                continue
+            end = row
+            while end < len(books) and (
+                current is None or books[end].id != current.id
+            ):
+                end += 1
+            self.beginInsertRows(QModelIndex(), row, end - 1)
+            self._books[row:row] = books[row:end]
+            self.endInsertRows()
+            row = end
+
+    def append_books(self, books: list[Book]) -> None:
+        """Добавляет книги в конец списка (для потоковой выдачи результатов).
+
+        Args:
+            books: Добавляемые книги.
+        """
+        self._append(books)
+
+    def book_ids(self) -> set[int]:
+        """Возвращает id загруженных в модель книг.
+
+        Returns:
+            Множество id.
+        """
+        return {b.id for b in self._books if b.id is not None}
+
+    def _append(self, books: list[Book]) -> None:
+        """Вставляет книги в конец списка с уведомлением представления."""
+        if not books:
+            return
+        first = len(self._books)
+        self.beginInsertRows(QModelIndex(), first, first + len(books) - 1)
+        self._books.extend(books)
+        self.endInsertRows()
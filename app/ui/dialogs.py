@@ -1,16 +1,29 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 
+from PySide6.QtGui import QFontDatabase
 from PySide6.QtWidgets import (
     QDialog,
     QDialogButtonBox,
+    QFileDialog,
     QFormLayout,
+    QHBoxLayout,
+    QLabel,
     QLineEdit,
+    QListWidget,
+    QMessageBox,
+    QPlainTextEdit,
+    QPushButton,
     QTextEdit,
+    QVBoxLayout,
     QWidget,
 )
 
+from app import instrumentation
+from app.settings import get_app_dir
+
 
 @dataclass
 class BookEditData:
@@ -71,3 +84,148 @@ class BookEditDialog(QDialog):
             path=self.path_edit.text().strip(),
             note=self.note_edit.toPlainText(),
         )
+
+
+class WatchedFoldersDialog(QDialog):
+    """Диалог управления отслеживаемыми папками."""
+
+    def __init__(self, parent: QWidget | None, folders: list[str]) -> None:
+        """Создает диалог.
+
+        Args:
+            parent: Родительский виджет.
+            folders: Текущие отслеживаемые папки.
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Отслеживаемые папки")
+        self.resize(520, 320)
+
+        hint = QLabel(
+            "Новые, изменённые и удалённые файлы в этих папках "
+            "автоматически синхронизируются с библиотекой."
+        )
+        hint.setWordWrap(True)
+
+        self.folders_list = QListWidget()
+        self.folders_list.addItems(folders)
+
+        add_btn = QPushButton("Добавить…")
+        add_btn.clicked.connect(self._add_folder)
+        remove_btn = QPushButton("Убрать")
+        remove_btn.clicked.connect(self._remove_folder)
+
+        btn_row = QHBoxLayout()
+        btn_row.addWidget(add_btn)
+        btn_row.addWidget(remove_btn)
+        btn_row.addStretch(1)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addWidget(hint)
+        layout.addWidget(self.folders_list)
+        layout.addLayout(btn_row)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def _add_folder(self) -> None:
+        """Добавляет папку в список."""
+        folder = QFileDialog.getExistingDirectory(self, "Выберите папку")
+        if folder and folder not in self.get_folders():
+            self.folders_list.addItem(folder)
+
+    def _remove_folder(self) -> None:
+        """Убирает выбранную папку из списка."""
+        row = self.folders_list.currentRow()
+        if row >= 0:
+            self.folders_list.takeItem(row)
+
+    def get_folders(self) -> list[str]:
+        """Возвращает папки из списка.
+
+        Returns:
+            Список путей.
+        """
+        return [
+            self.folders_list.item(i).text() for i in range(self.folders_list.count())
+        ]
+
+
+class DiagnosticsDialog(QDialog):
+    """Диалог с отчётом о производительности (счётчики и медленные операции)."""
+
+    def __init__(self, parent: QWidget | None) -> None:
+        """Создает диалог.
+
+        Args:
+            parent: Родительский виджет.
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Диагностика")
+        self.resize(860, 520)
+
+        self.report = QPlainTextEdit()
+        self.report.setReadOnly(True)
+        self.report.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.report.setFont(
+            QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+        )
+
+        refresh_btn = QPushButton("Обновить")
+        refresh_btn.clicked.connect(self._refresh)
+        save_btn = QPushButton("Сохранить…")
+        save_btn.clicked.connect(self._save)
+        reset_btn = QPushButton("Сбросить")
+        reset_btn.clicked.connect(self._reset)
+        for btn in (refresh_btn, save_btn, reset_btn):
+            btn.setEnabled(instrumentation.ENABLED)
+
+        btn_row = QHBoxLayout()
+        btn_row.addWidget(refresh_btn)
+        btn_row.addWidget(save_btn)
+        btn_row.addWidget(reset_btn)
+        btn_row.addStretch(1)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.report)
+        layout.addLayout(btn_row)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        self._refresh()
+
+    def _refresh(self) -> None:
+        """Показывает текущий отчёт."""
+        if not instrumentation.ENABLED:
+            self.report.setPlainText(
+                "Замеры выключены. Запустите приложение с переменной окружения "
+                f"{instrumentation.PROFILE_ENV}=1, чтобы собирать счётчики, "
+                "гистограммы задержек и журнал медленных операций."
+            )
+            return
+        self.report.setPlainText(instrumentation.metrics().dump())
+
+    def _save(self) -> None:
+        """Сохраняет отчёт в текстовый файл."""
+        default = str(get_app_dir() / "diagnostics.txt")
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Сохранить отчёт", default, "Текст (*.txt)"
+        )
+        if not path:
+            return
+        try:
+            Path(path).write_text(self.report.toPlainText(), encoding="utf-8")
+        except OSError as e:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось сохранить отчёт:\n{e}")
+
+    def _reset(self) -> None:
+        """Сбрасывает накопленную статистику."""
+        instrumentation.metrics().reset()
+        self._refresh()
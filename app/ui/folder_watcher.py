@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QThreadPool, QTimer, Signal
+
+from app.db import Database
+from app.services.library_service import SyncReport
+from app.services.watch_service import WatchService
+from app.ui.workers import FolderSyncWorker
+
+# Задержка, за которую серия событий файловой системы собирается в одну пачку
+DEBOUNCE_MS = 2000
+
+# Период полной сверки отслеживаемых папок по умолчанию
+RECONCILE_MINUTES = 10
+
+
+class FolderWatcher(QObject):
+    """Автоматическая синхронизация отслеживаемых папок с библиотекой.
+
+    За всеми папками внутри отслеживаемых наблюдает `QFileSystemWatcher`.
+    События собираются в течение `DEBOUNCE_MS` и синхронизируются одной
+    фоновой задачей — только изменившиеся папки, без полного пересканирования.
+    Файлы, изменённые на месте (без изменения содержимого папки), и события,
+    пропущенные наблюдателем, подхватывает периодическая сверка.
+    """
+
+    synced = Signal(object)
+
+    def __init__(
+        self,
+        db: Database,
+        reconcile_minutes: int = RECONCILE_MINUTES,
+        parent: QObject | None = None,
+        index_workers: Optional[int] = None,
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            db: Экземпляр Database.
+            reconcile_minutes: Период полной сверки (0 — без сверки).
+            parent: Родительский объект.
+            index_workers: Число процессов импорта и индексации при
+                синхронизации (None — по числу ядер).
+        """
+        super().__init__(parent)
+        self._db = db
+        self._index_workers = index_workers
+        self._service = WatchService(db)
+        self._pending: set[str] = set()
+        self._worker: Optional[FolderSyncWorker] = None
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._run_pending)
+
+        self._reconcile = QTimer(self)
+        self._reconcile.setInterval(max(0, reconcile_minutes) * 60_000)
+        self._reconcile.timeout.connect(self.reconcile)
+        self._reconcile_enabled = reconcile_minutes > 0
+
+    def folders(self) -> list[str]:
+        """Возвращает отслеживаемые папки.
+
+        Returns:
+            Список путей.
+        """
+        return self._service.list_folders()
+
+    def start(self) -> None:
+        """Сверяет отслеживаемые папки и начинает наблюдение за ними."""
+        if self._reconcile_enabled:
+            self._reconcile.start()
+        self.reconcile()
+
+    def stop(self) -> None:
+        """Останавливает наблюдение и фоновую синхронизацию."""
+        self._debounce.stop()
+        self._reconcile.stop()
+        self._pending.clear()
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def add_folder(self, path: str) -> None:
+        """Добавляет папку в отслеживаемые и сразу синхронизирует её.
+
+        Args:
+            path: Путь к папке.
+        """
+        self._schedule([self._service.add_folder(path)])
+
+    def remove_folder(self, path: str) -> None:
+        """Прекращает отслеживать папку (книги остаются в библиотеке).
+
+        Args:
+            path: Путь к папке.
+        """
+        self._service.remove_folder(path)
+        roots = self._service.list_folders()
+        stale = [d for d in self._watcher.directories() if not _is_under(d, roots)]
+        if stale:
+            self._watcher.removePaths(stale)
+
+    def reconcile(self) -> None:
+        """Ставит в очередь полную сверку всех отслеживаемых папок."""
+        self._schedule(self._service.list_folders())
+
+    def _schedule(self, folders: list[str]) -> None:
+        """Добавляет папки в очередь синхронизации и запускает её."""
+        self._pending.update(folders)
+        self._run_pending()
+
+    def _on_directory_changed(self, path: str) -> None:
+        """Копит изменившиеся папки до окончания серии событий."""
+        self._pending.add(path)
+        self._debounce.start()
+
+    def _run_pending(self) -> None:
+        """Запускает фоновую синхронизацию накопленных папок."""
+        if self._worker is not None or not self._pending:
+            # Очередь будет обработана после завершения текущей задачи
+            return
+
+        folders = _outermost(self._pending)
+        self._pending.clear()
+
+        worker = FolderSyncWorker(self._db, folders, self._index_workers)
+        worker.signals.finished.connect(self._on_synced)
+        self._worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_synced(self, report: SyncReport, directories: list) -> None:
+        """Ставит новые папки под наблюдение и сообщает об изменениях и ошибках."""
+        self._worker = None
+
+        watched = set(self._watcher.directories())
+        new = [d for d in directories if d not in watched]
+        if new:
+            self._watcher.addPaths(new)
+
+        if report.changed or report.error:
+            self.synced.emit(report)
+        if self._pending and not self._debounce.isActive():
+            self._run_pending()
+
+
+def _is_under(path: str, roots: list[str]) -> bool:
+    """Проверяет, лежит ли папка внутри одной из корневых папок."""
+    return any(
+        path == root or path.startswith(os.path.join(root, "")) for root in roots
+    )
+
+
+def _outermost(folders: set[str]) -> list[str]:
+    """Убирает папки, вложенные в другие папки набора (их обойдёт родитель)."""
+    out: list[str] = []
+    for folder in sorted(folders):
+        if not _is_under(folder, out):
+            out.append(folder)
+    return out
@@ -6,7 +6,8 @@ import subprocess
 from dataclasses import dataclass
 from typing import Optional
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThreadPool, QTimer
+from PySide6.QtGui import QCloseEvent, QKeySequence, QPaintEvent, QShortcut
 from PySide6.QtWidgets import (
     QApplication,
     QComboBox,
@@ -20,6 +21,7 @@ from PySide6.QtWidgets import (
     QListWidgetItem,
     QMainWindow,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QSplitter,
     QVBoxLayout,
@@ -28,15 +30,48 @@ from PySide6.QtWidgets import (
 
 from app.db import Database
 from app.models import Book
-from app.services.library_service import LibraryService
+from app.services.library_service import (
+    ImportReport,
+    LibraryService,
+    SortKey,
+    SyncReport,
+)
 from app.services.pdf_service import PdfService
 from app.services.scanner import Scanner
 from app.services.settings_service import SettingsService
+from app.services.startup_snapshot import StartupSnapshot
+from app.startup import StartupTimer
 from app.ui.book_item_delegate import BookItemDelegate
-from app.ui.book_list_model import BookListModel
-from app.ui.dialogs import BookEditData, BookEditDialog
+from app.ui.book_list_model import BookListModel, PageFetcher
+from app.ui.dialogs import (
+    BookEditData,
+    BookEditDialog,
+    DiagnosticsDialog,
+    WatchedFoldersDialog,
+)
+from app.ui.folder_watcher import RECONCILE_MINUTES, FolderWatcher
+from app.ui.prefetcher import PagePrefetcher
+from app.ui.thumbnails import ThumbnailStore
 from app.ui.theme import apply_dark_palette, apply_light_palette, get_theme_stylesheet
+from app.ui.title_search import TitleQueryScheduler
 from app.ui.widgets import ImagePreview
+from app.ui.workers import (
+    ContentSearchWorker,
+    FolderImportWorker,
+    LibrarySyncWorker,
+    SettingsFlushWorker,
+    TitleQueryResult,
+)
+
+
+# Сколько страниц из результатов поиска по книге предзагружать
+PREFETCH_HITS = 8
+
+# Пауза после изменения настроек, после которой они записываются в БД
+SETTINGS_FLUSH_MS = 1000
+
+# Сколько ждать первой отрисовки окна, прежде чем загрузить список книг
+STARTUP_LOAD_FALLBACK_MS = 500
 
 
 @dataclass
@@ -50,21 +85,71 @@ class SearchHitItem:
 class MainWindow(QMainWindow):
     """Главное окно приложения BookVault."""
 
-    def __init__(self, db: Database) -> None:
+    def __init__(
+        self,
+        db: Database,
+        startup: Optional[StartupTimer] = None,
+        settings: Optional[SettingsService] = None,
+    ) -> None:
         super().__init__()
         self.setWindowTitle("BookVault")
 
         self._db = db
-        self._library = LibraryService(db)
+        self._startup = startup
+        self._snapshot = StartupSnapshot.for_database(db)
+        # Настройки — один экземпляр на приложение (кэш с отложенной записью)
+        self._settings = settings if settings is not None else SettingsService(db)
+        # Число процессов импорта и индексации (0 в настройках — по числу ядер)
+        self._index_workers = self._settings.get_int("index_workers", 0) or None
+        self._library = LibraryService(db, index_workers=self._index_workers)
         self._scanner = Scanner()
         self._pdf = PdfService()
-        self._settings = SettingsService(db)
+        self._prefetcher = PagePrefetcher(self._pdf)
+        self._thumbnails = ThumbnailStore(db, parent=self)
+        self._watcher = FolderWatcher(
+            db,
+            reconcile_minutes=self._settings.get_int(
+                "watch_reconcile_minutes", RECONCILE_MINUTES
+            ),
+            parent=self,
+            index_workers=self._index_workers,
+        )
+        self._watcher.synced.connect(self._on_folders_synced)
+        self._title_query = TitleQueryScheduler(db, parent=self)
+        self._title_query.ready.connect(self._on_title_query_ready)
+
+        # Изменённые настройки записываются в БД пачкой, когда окно простаивает
+        self._settings_flush = QTimer(self)
+        self._settings_flush.setSingleShot(True)
+        self._settings_flush.setInterval(SETTINGS_FLUSH_MS)
+        self._settings_flush.timeout.connect(self._flush_settings)
+        self._settings.subscribe(lambda key, value: self._settings_flush.start())
+        # Выполняющаяся запись настроек: записи идут строго по очереди
+        self._settings_worker: Optional[SettingsFlushWorker] = None
 
         self._current_book: Optional[Book] = None
 
+        # Фоновый поиск по содержимому
+        self._search_worker: Optional[ContentSearchWorker] = None
+        self._import_worker: Optional[FolderImportWorker] = None
+        self._import_dialog: Optional[QProgressDialog] = None
+        self._sync_worker: Optional[LibrarySyncWorker] = None
+        self._search_generation = 0
+        self._search_keyword = ""
+        self._search_found = 0
+        # В списке показаны результаты поиска по содержимому
+        self._showing_content = False
+
         self._build_ui()
         self._restore_theme()
-        self._refresh_books()
+
+        # Полный список, миниатюры и наблюдение за папками — после первой
+        # отрисовки окна; до неё показывается снимок с прошлого закрытия
+        self._startup_pending = True
+        if self._show_snapshot():
+            QTimer.singleShot(STARTUP_LOAD_FALLBACK_MS, self._finish_startup)
+        else:
+            QTimer.singleShot(0, self._finish_startup)
 
     # ------------------------------------------------------------------ UI
 
@@ -79,15 +164,15 @@ class MainWindow(QMainWindow):
         sidebar.setFixedWidth(320)
 
         self.title_search = QLineEdit()
-        self.title_search.setPlaceholderText("Поиск по названию…")
-        self.title_search.textChanged.connect(self._refresh_books)
+        self.title_search.setPlaceholderText("Название, автор или заметка…")
+        self.title_search.textChanged.connect(self._on_title_changed)
 
         self.content_search = QLineEdit()
         self.content_search.setPlaceholderText("Поиск по содержимому…")
         self.content_search.returnPressed.connect(self._search_by_content)
 
         self.content_search_btn = QPushButton("Искать в текстах")
-        self.content_search_btn.clicked.connect(self._search_by_content)
+        self.content_search_btn.clicked.connect(self._on_content_search_btn)
 
         self.books_count_label = QLabel("Всего книг: 0")
         self.books_count_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -104,7 +189,7 @@ class MainWindow(QMainWindow):
         self.theme_combo.currentIndexChanged.connect(self._on_theme_changed)
 
         self.books_view = QListView()
-        self.books_view.setItemDelegate(BookItemDelegate())
+        self.books_view.setItemDelegate(BookItemDelegate(self._thumbnails))
         self.books_view.setUniformItemSizes(True)
         self.books_view.setMouseTracking(True)
         self.books_view.clicked.connect(self._on_book_clicked)
@@ -112,6 +197,7 @@ class MainWindow(QMainWindow):
 
         self.book_model = BookListModel()
         self.books_view.setModel(self.book_model)
+        self._thumbnails.updated.connect(self.books_view.viewport().update)
 
         self.add_file_btn = QPushButton("Добавить файл")
         self.add_file_btn.clicked.connect(self._add_book_file)
@@ -119,6 +205,26 @@ class MainWindow(QMainWindow):
         self.add_folder_btn = QPushButton("Добавить папку")
         self.add_folder_btn.clicked.connect(self._add_books_folder)
 
+        self.sync_btn = QPushButton("Синхронизировать")
+        self.sync_btn.setToolTip(
+            "Проверить файлы библиотеки: переиндексировать изменённые "
+            "и убрать удалённые"
+        )
+        self.sync_btn.clicked.connect(self._sync_library)
+
+        self.watch_btn = QPushButton("Отслеживаемые папки…")
+        self.watch_btn.setToolTip(
+            "Папки, изменения в которых автоматически попадают в библиотеку"
+        )
+        self.watch_btn.clicked.connect(self._edit_watched_folders)
+
+        self.diagnostics_btn = QPushButton("Диагностика…")
+        self.diagnostics_btn.setToolTip(
+            "Счётчики и задержки операций, медленные операции (Ctrl+Shift+D)"
+        )
+        self.diagnostics_btn.clicked.connect(self._show_diagnostics)
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self._show_diagnostics)
+
         left_layout = QVBoxLayout()
         left_layout.setContentsMargins(12, 12, 12, 12)
         left_layout.setSpacing(10)
@@ -158,6 +264,9 @@ class MainWindow(QMainWindow):
         btn_row.addWidget(self.add_file_btn)
         btn_row.addWidget(self.add_folder_btn)
         left_layout.addLayout(btn_row)
+        left_layout.addWidget(self.sync_btn)
+        left_layout.addWidget(self.watch_btn)
+        left_layout.addWidget(self.diagnostics_btn)
 
         sidebar.setLayout(left_layout)
 
@@ -231,6 +340,33 @@ class MainWindow(QMainWindow):
         if idx >= 0:
             self.theme_combo.setCurrentIndex(idx)
 
+    def _flush_settings(self) -> None:
+        """Записывает изменённые настройки в БД в фоновом потоке.
+
+        Одновременно выполняется не больше одной записи, иначе более старые
+        значения могли бы зафиксироваться позже новых. Изменения, сделанные
+        во время записи, записываются следующей.
+        """
+        if self._settings_worker is not None:
+            return
+        values = self._settings.take_pending()
+        if not values:
+            return
+        worker = SettingsFlushWorker(self._db, values)
+        # Объект нужен и после run(): при закрытии окна из него берутся
+        # незаписанные значения
+        worker.setAutoDelete(False)
+        worker.signals.finished.connect(self._on_settings_flushed)
+        self._settings_worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_settings_flushed(self, failed: dict) -> None:
+        """Возвращает незаписанные настройки в очередь и запускает следующую запись."""
+        self._settings_worker = None
+        self._settings.restore_pending(failed)
+        if self._settings.has_pending():
+            self._settings_flush.start()
+
     def _on_theme_changed(self) -> None:
         """Сохраняет и применяет выбранную тему."""
         theme = self.theme_combo.currentData()
@@ -257,65 +393,264 @@ class MainWindow(QMainWindow):
         self.books_view.viewport().update()
         print("[DEBUG] Список книг обновлен")
 
+    # ------------------------------------------------------------------ Startup
+
+    def _show_snapshot(self) -> bool:
+        """Показывает сохранённое начало списка до загрузки из БД.
+
+        Returns:
+            True, если снимок найден и показан.
+        """
+        loaded = self._snapshot.load(self.sort_combo.currentData())
+        if loaded is None:
+            return False
+        books, count = loaded
+        self.book_model.set_books(books)
+        self.books_count_label.setText(f"Найдено книг: {count}")
+        return True
+
+    def _finish_startup(self) -> None:
+        """Загружает список книг и запускает фоновые задачи после показа окна."""
+        if not self._startup_pending:
+            return
+        self._startup_pending = False
+        self._refresh_books()
+        # Обложки книг без миниатюр создаются в фоне
+        self._thumbnails.fill_missing()
+        self._watcher.start()
+        if self._startup is not None:
+            self._startup.mark("список")
+            self._report_startup()
+
+    def _report_startup(self) -> None:
+        """Печатает замеры запуска, когда окно отрисовано и список загружен."""
+        assert self._startup is not None
+        if self._startup.has("первый кадр") and self._startup.has("список"):
+            self._startup.print_report()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """После первой отрисовки окна запускает загрузку списка книг."""
+        super().paintEvent(event)
+        if self._startup_pending:
+            QTimer.singleShot(0, self._finish_startup)
+        if self._startup is not None and not self._startup.has("первый кадр"):
+            self._startup.mark("первый кадр")
+            self._report_startup()
+
     # ------------------------------------------------------------------ Books
 
     def _refresh_books(self) -> None:
-        """Обновляет список книг."""
-        # Сбрасываем поиск по содержимому при изменении названия
+        """Обновляет список книг, сбрасывая поиск по содержимому."""
+        self._cancel_content_search()
         self.content_search.clear()
+        self._showing_content = False
+        self._reload_books()
+
+    def _reload_books(self) -> None:
+        """Перечитывает список книг по текущему фильтру названия."""
+        self._title_query.invalidate()
+
+        sort = self.sort_combo.currentData()
+        title_filter = self.title_search.text()
+
+        # Книги загружаются страницами по мере прокрутки списка
+        self.book_model.set_source(self._page_fetcher(sort, title_filter))
+        self._show_found(self._library.count_books(title_filter), title_filter)
 
-        books = self._library.list_books(
-            sort=self.sort_combo.currentData(),
-            title_filter=self.title_search.text(),
+    def _on_title_changed(self, text: str) -> None:
+        """Ввод фильтра: список обновляется фоновым запросом после паузы."""
+        self._cancel_content_search()
+        self.content_search.clear()
+        self._showing_content = False
+        self._title_query.schedule(
+            text, self.sort_combo.currentData(), self.book_model.reload_limit()
+        )
+
+    def _on_title_query_ready(self, result: TitleQueryResult) -> None:
+        """Показывает результат фонового запроса по названию."""
+        if result.error:
+            # Список остаётся прежним, ошибка видна под ним
+            self.books_count_label.setText(f"Ошибка загрузки: {result.error}")
+            return
+        self.book_model.set_page(
+            self._page_fetcher(result.sort, result.title_filter),
+            result.books,
+            result.cursor,
+        )
+        loaded = {b.id for b in result.books} if result.cursor is None else None
+        self._show_found(result.count, result.title_filter, loaded)
+
+    def _page_fetcher(self, sort: SortKey, title_filter: str) -> PageFetcher:
+        """Возвращает функцию загрузки страниц списка для модели."""
+        library = self._library
+        return lambda after, limit: library.list_books_page(
+            sort, title_filter, after=after, limit=limit
         )
-        self.book_model.set_books(books)
-        self.books_count_label.setText(f"Найдено книг: {len(books)}")
 
-        if self._current_book and self._current_book.id not in {b.id for b in books}:
+    def _show_found(
+        self,
+        count: int,
+        title_filter: str,
+        found_ids: Optional[set[Optional[int]]] = None,
+    ) -> None:
+        """Показывает число найденных книг и снимает выбор с отфильтрованной.
+
+        Args:
+            count: Число книг под фильтром.
+            title_filter: Строка фильтра.
+            found_ids: ID всех найденных книг, если они известны.
+        """
+        self.books_count_label.setText(f"Найдено книг: {count}")
+
+        book = self._current_book
+        if not book:
+            return
+        if found_ids is not None:
+            matches = book.id in found_ids
+        else:
+            matches = book.id is not None and self._library.book_matches(
+                book.id, title_filter
+            )
+        if not matches:
             self._set_current_book(None)
 
+    def _on_content_search_btn(self) -> None:
+        """Кнопка поиска по содержимому: запускает поиск или останавливает текущий."""
+        if self._search_worker is not None:
+            self._cancel_content_search()
+            self.books_count_label.setText(
+                f"Поиск остановлен. Найдено книг с '{self._search_keyword}': "
+                f"{self._search_found}"
+            )
+            return
+        self._search_by_content()
+
     def _search_by_content(self) -> None:
-        """Поиск книг по содержимому."""
+        """Запускает фоновый поиск книг по содержимому.
+
+        Найденные книги добавляются в список по мере поступления,
+        новый запрос отменяет выполняющийся.
+        """
         keyword = self.content_search.text().strip()
+        self._cancel_content_search()
 
         if not keyword:
             # Если поле пустое, показываем все книги
             self._refresh_books()
             return
 
-        # Сбрасываем поиск по названию
+        # Сбрасываем поиск по названию (без повторного обновления списка)
+        self.title_search.blockSignals(True)
         self.title_search.clear()
+        self.title_search.blockSignals(False)
+
+        self._search_generation += 1
+        self._search_keyword = keyword
+        self._search_found = 0
+        self._showing_content = True
+        self.book_model.set_books([])
+        self.books_count_label.setText(f"Поиск '{keyword}'…")
+
+        worker = ContentSearchWorker(
+            self._db,
+            self._search_generation,
+            keyword,
+            self.sort_combo.currentData(),
+            self._index_workers,
+        )
+        worker.signals.found.connect(self._on_content_found)
+        worker.signals.progress.connect(self._on_content_progress)
+        worker.signals.finished.connect(self._on_content_finished)
+        self._search_worker = worker
 
-        # Показываем индикатор загрузки
-        self.content_search_btn.setEnabled(False)
-        self.content_search_btn.setText("Поиск...")
+        self.content_search_btn.setText("Остановить")
+        QThreadPool.globalInstance().start(worker)
 
-        try:
-            # Ищем книги по содержимому
-            books = self._library.search_books_by_content(
-                keyword=keyword,
-                sort=self.sort_combo.currentData(),
+    def _cancel_content_search(self) -> None:
+        """Отменяет выполняющийся поиск по содержимому."""
+        if self._search_worker is None:
+            return
+        self._search_worker.cancel()
+        self._search_worker = None
+        # Результаты отменённого поиска отбрасываются по номеру поиска
+        self._search_generation += 1
+        self.content_search_btn.setText("Искать в текстах")
+
+    def _on_content_found(self, generation: int, books: list) -> None:
+        """Добавляет порцию найденных книг в список."""
+        if generation != self._search_generation:
+            return
+        self.book_model.append_books(books)
+        self._search_found += len(books)
+        self.books_count_label.setText(
+            f"Поиск '{self._search_keyword}'… найдено: {self._search_found}"
+        )
+
+    def _on_content_progress(self, generation: int, done: int, total: int) -> None:
+        """Показывает прогресс индексации ещё не проиндексированных книг."""
+        if generation != self._search_generation or not total:
+            return
+        self.books_count_label.setText(
+            f"Поиск '{self._search_keyword}'… найдено: {self._search_found} "
+            f"(проверено {done} из {total})"
+        )
+
+    def _on_content_finished(
+        self, generation: int, cancelled: bool, error: str
+    ) -> None:
+        """Завершение фонового поиска по содержимому."""
+        if generation != self._search_generation:
+            return
+
+        self._search_worker = None
+        self.content_search_btn.setText("Искать в текстах")
+        keyword = self._search_keyword
+        self.books_count_label.setText(
+            f"Найдено книг с '{keyword}': {self._search_found}"
+        )
+
+        if self._current_book and self._current_book.id not in (
+            self.book_model.book_ids()
+        ):
+            self._set_current_book(None)
+
+        if error:
+            QMessageBox.warning(
+                self, "Ошибка поиска", f"Поиск прерван из-за ошибки:\n{error}"
             )
-            self.book_model.set_books(books)
-            self.books_count_label.setText(f"Найдено книг с '{keyword}': {len(books)}")
-
-            if self._current_book and self._current_book.id not in {
-                b.id for b in books
-            }:
-                self._set_current_book(None)
-
-            # Показываем сообщение, если ничего не найдено
-            if not books:
-                QMessageBox.information(
-                    self,
-                    "Поиск завершён",
-                    f"Книги, содержащие слово '{keyword}', не найдены.",
-                )
-
-        finally:
-            # Восстанавливаем кнопку
-            self.content_search_btn.setEnabled(True)
-            self.content_search_btn.setText("Искать в текстах")
+        # Показываем сообщение, если ничего не найдено
+        elif not cancelled and not self._search_found:
+            QMessageBox.information(
+                self,
+                "Поиск завершён",
+                f"Книги, содержащие слово '{keyword}', не найдены.",
+            )
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """Останавливает фоновые задачи при закрытии окна."""
+        self._cancel_content_search()
+        self._title_query.invalidate()
+        self._title_query.wait(3000)
+        self._watcher.stop()
+        if self._import_worker is not None:
+            self._import_worker.cancel()
+        if self._sync_worker is not None:
+            self._sync_worker.cancel()
+        self._prefetcher.cancel()
+        self._prefetcher.wait(3000)
+        self._thumbnails.cancel()
+        self._thumbnails.wait(3000)
+        self._settings_flush.stop()
+        QThreadPool.globalInstance().waitForDone(3000)
+        if self._settings_worker is not None:
+            # Сигнал о завершении уже не будет обработан циклом событий
+            self._settings.restore_pending(self._settings_worker.failed)
+            self._settings_worker = None
+        # После фоновых записей, чтобы не перезаписать новые значения старыми
+        self._settings.flush()
+        # Окно всегда открывается с первой сортировкой и без фильтра
+        self._snapshot.save(self._db, self.sort_combo.itemData(0))
+        super().closeEvent(event)
 
     def _on_book_clicked(self, index) -> None:
         """Обработчик выбора книги."""
@@ -353,6 +688,8 @@ class MainWindow(QMainWindow):
 
     def _set_current_book(self, book: Optional[Book]) -> None:
         """Устанавливает текущую книгу."""
+        # Предзагрузка страниц прежней книги больше не нужна
+        self._prefetcher.cancel()
         self._current_book = book
         self.hits_list.clear()
         self.keyword_search.clear()
@@ -374,7 +711,7 @@ class MainWindow(QMainWindow):
             f"Формат: {book.format.upper()}\n"
             f"Размер: {size_mb:.2f} MB\n"
             f"Добавлено: {book.added_at}\n\n"
-            f"Заметка:\n{book.note or ''}"
+            f"Заметка:\n{self._library.load_note(book)}"
         )
 
     # ------------------------------------------------------------------ Import
@@ -390,19 +727,164 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Ошибка", "Файл не поддерживается.")
             return
 
-        self._library.add_book_from_scanned(sf)
+        result = self._library.add_book_from_scanned(sf)
+        if result.outcome == "copy" and result.book_id is not None:
+            original = self._library.get_book(result.book_id)
+            QMessageBox.information(
+                self,
+                "Книга уже есть",
+                "Такая книга уже есть в библиотеке:\n"
+                f"{original.path if original else path}",
+            )
+            return
         self._refresh_books()
 
     def _add_books_folder(self) -> None:
-        """Добавляет книги из папки."""
+        """Импортирует книги из папки в фоновом потоке."""
+        if self._import_worker is not None:
+            return
         folder = QFileDialog.getExistingDirectory(self, "Выберите папку")
         if not folder:
             return
 
-        for sf in self._scanner.scan_folder(folder):
-            self._library.add_book_from_scanned(sf)
+        worker = FolderImportWorker(self._db, folder, self._index_workers)
+        worker.signals.progress.connect(self._on_import_progress)
+        worker.signals.indexing.connect(self._on_import_indexing)
+        worker.signals.finished.connect(self._on_import_finished)
+        self._import_worker = worker
+
+        dlg = QProgressDialog("Импорт книг…", "Отмена", 0, 0, self)
+        dlg.setWindowTitle("Импорт")
+        dlg.setMinimumDuration(500)
+        dlg.canceled.connect(worker.cancel)
+        self._import_dialog = dlg
+
+        self.add_file_btn.setEnabled(False)
+        self.add_folder_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_import_progress(self, done: int, total: int, rate: int) -> None:
+        """Обновляет прогресс импорта папки."""
+        dlg = self._import_dialog
+        if dlg is None:
+            return
+        # Пока папка сканируется, общее число файлов неизвестно (total == 0)
+        dlg.setMaximum(total)
+        dlg.setLabelText(f"Импорт книг… обработано {done} ({rate} файлов/с)")
+        dlg.setValue(done)
+
+    def _on_import_indexing(self, done: int, total: int) -> None:
+        """Обновляет прогресс индексации импортированных книг."""
+        dlg = self._import_dialog
+        if dlg is None:
+            return
+        dlg.setMaximum(total)
+        dlg.setLabelText(f"Индексация текста книг… {done} из {total}")
+        dlg.setValue(done)
+
+    def _on_import_finished(self, report: ImportReport) -> None:
+        """Обновляет список книг после импорта и индексации."""
+        self._import_worker = None
+        if self._import_dialog is not None:
+            self._import_dialog.close()
+            self._import_dialog = None
+        self.add_file_btn.setEnabled(True)
+        self.add_folder_btn.setEnabled(True)
+
+        self._refresh_books()
+        self._thumbnails.fill_missing()
+
+        if report.error:
+            QMessageBox.warning(
+                self,
+                "Импорт прерван",
+                f"Импорт остановлен из-за ошибки:\n{report.error}\n\n"
+                f"Добавлено книг до ошибки: {report.added}",
+            )
+        elif report.errors or report.copies:
+            QMessageBox.warning(
+                self,
+                "Импорт завершён",
+                f"Добавлено книг: {report.added}\n"
+                f"Уже были в библиотеке: {report.duplicates}\n"
+                f"Копии книг из библиотеки (пропущены): {report.copies}\n"
+                f"Не удалось добавить: {report.errors}",
+            )
 
+    def _sync_library(self) -> None:
+        """Синхронизирует библиотеку с файлами на диске в фоновом потоке."""
+        if self._sync_worker is not None:
+            return
+        self.sync_btn.setEnabled(False)
+        self.sync_btn.setText("Синхронизация...")
+
+        worker = LibrarySyncWorker(self._db, self._index_workers)
+        worker.signals.finished.connect(self._on_library_synced)
+        self._sync_worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_library_synced(self, report: SyncReport) -> None:
+        """Обновляет список книг и обложки после синхронизации библиотеки."""
+        self._sync_worker = None
+        self.sync_btn.setEnabled(True)
+        self.sync_btn.setText("Синхронизировать")
+
+        # Изменённые файлы получат новые обложки
+        self._thumbnails.clear()
+        self._thumbnails.fill_missing()
         self._refresh_books()
+        if report.error:
+            QMessageBox.warning(
+                self,
+                "Синхронизация прервана",
+                f"Синхронизация остановлена из-за ошибки:\n{report.error}",
+            )
+            return
+        QMessageBox.information(
+            self,
+            "Синхронизация завершена",
+            f"Проверено книг: {report.checked}\n"
+            f"Переиндексировано: {report.reindexed}\n"
+            f"Удалено записей: {report.removed}\n"
+            f"Недоступно: {report.unavailable}",
+        )
+
+    def _edit_watched_folders(self) -> None:
+        """Редактирует список отслеживаемых папок."""
+        current = self._watcher.folders()
+        dlg = WatchedFoldersDialog(self, current)
+        if dlg.exec() != QDialog.DialogCode.Accepted:
+            return
+
+        folders = dlg.get_folders()
+        for folder in current:
+            if folder not in folders:
+                self._watcher.remove_folder(folder)
+        for folder in folders:
+            if folder not in current:
+                self._watcher.add_folder(folder)
+
+    def _show_diagnostics(self) -> None:
+        """Показывает отчёт о производительности."""
+        DiagnosticsDialog(self).exec()
+
+    def _on_folders_synced(self, report: SyncReport) -> None:
+        """Обновляет список книг после автоматической синхронизации папок.
+
+        Поиск по содержимому не прерывается: пока показаны его результаты,
+        список не перечитывается (это произойдёт при сбросе поиска).
+        """
+        if report.updated:
+            self._thumbnails.clear()
+        self._thumbnails.fill_missing()
+        if not self._showing_content:
+            self._reload_books()
+        if report.error:
+            # Автоматическая синхронизация повторится при следующей сверке —
+            # ошибка показывается без модального окна
+            self.books_count_label.setText(
+                f"Ошибка синхронизации папок: {report.error}"
+            )
 
     # ------------------------------------------------------------------ Edit / Delete
 
@@ -417,7 +899,7 @@ class MainWindow(QMainWindow):
                 title=self._current_book.title,
                 author=self._current_book.author,
                 path=self._current_book.path,
-                note=self._current_book.note,
+                note=self._library.load_note(self._current_book),
             ),
         )
         if dlg.exec() != QDialog.DialogCode.Accepted:
@@ -428,13 +910,16 @@ class MainWindow(QMainWindow):
         if book_id is None:
             return
 
-        self._library.update_book(
+        updated = self._library.update_book(
             book_id,
             data.title,
             data.author,
             data.path,
             data.note,
         )
+        # Список сохраняет книги с прежними полями — заметку обновляем в них
+        if updated:
+            self._current_book.note = data.note
 
         self._refresh_books()
 
@@ -466,10 +951,20 @@ class MainWindow(QMainWindow):
             self.preview.clear()
             return
 
-        png, scale = self._pdf.render_page_png_bytes(
-            self._current_book.path, page_index
-        )
-        self.preview.set_png_bytes(png, highlights, scale)
+        path = self._current_book.path
+        dpr = self.preview.devicePixelRatioF()
+        try:
+            page = self._pdf.render_page(path, page_index, dpr=dpr)
+        except (ValueError, RuntimeError, OSError):
+            # Повреждённый PDF или PDF без страниц: документ не держим в пуле,
+            # чтобы исправленный файл открылся заново
+            self._pdf.release(path)
+            self.preview.clear()
+            return
+        self.preview.set_rendered_page(page, highlights)
+
+        # Соседние страницы — наиболее вероятный следующий переход
+        self._prefetcher.prefetch(path, [page_index + 1, page_index - 1], dpr=dpr)
 
     def _run_keyword_search(self) -> None:
         """Поиск по тексту PDF."""
@@ -495,6 +990,13 @@ class MainWindow(QMainWindow):
             item.setData(Qt.ItemDataRole.UserRole + 1, hit.rects)
             self.hits_list.addItem(item)
 
+        # Первые страницы с совпадениями, скорее всего, будут открыты
+        self._prefetcher.prefetch(
+            self._current_book.path,
+            [hit.page_index for hit in hits[:PREFETCH_HITS]],
+            dpr=self.preview.devicePixelRatioF(),
+        )
+
     def _on_hit_clicked(self, item: QListWidgetItem) -> None:
         """Переход к найденной странице."""
         data = item.data(Qt.ItemDataRole.UserRole)
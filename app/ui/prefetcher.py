@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable
+
+from PySide6.QtCore import QRunnable, QThread, QThreadPool
+
+from app.services.pdf_service import PdfService
+
+# Сколько байт несжатых страниц может добавить в кэш один запрос предзагрузки
+PREFETCH_BUDGET_BYTES = 32 * 1024 * 1024
+
+
+class _PrefetchJob(QRunnable):
+    """Последовательно рендерит страницы в кэш, пока не исчерпан бюджет."""
+
+    def __init__(
+        self,
+        pdf: PdfService,
+        cancelled: threading.Event,
+        path: str,
+        pages: list[int],
+        max_width: int,
+        dpr: float,
+        budget: int,
+    ) -> None:
+        super().__init__()
+        self._pdf = pdf
+        self._cancelled = cancelled
+        self._path = path
+        self._pages = pages
+        self._max_width = max_width
+        self._dpr = dpr
+        self._budget = budget
+
+    def run(self) -> None:
+        """Рендерит страницы; останавливается при отмене или исчерпании бюджета."""
+        spent = 0
+        for page_index in self._pages:
+            if self._cancelled.is_set() or spent >= self._budget:
+                return
+            try:
+                page = self._pdf.render_page(
+                    self._path, page_index, self._max_width, self._dpr
+                )
+            except Exception:
+                # Страницы нет или файл недоступен — просто пропускаем
+                continue
+            spent += page.nbytes
+
+
+class PagePrefetcher:
+    """Фоновая предзагрузка страниц в кэш рендеринга с низким приоритетом.
+
+    Работает в собственном пуле из одного потока с наименьшим приоритетом,
+    чтобы не конкурировать с рендерингом страницы, которую пользователь
+    открыл прямо сейчас. Смена книги отменяет всю начатую предзагрузку.
+    """
+
+    def __init__(
+        self, pdf: PdfService, budget_bytes: int = PREFETCH_BUDGET_BYTES
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            pdf: Сервис PDF (рендерит в общий кэш).
+            budget_bytes: Бюджет памяти одного запроса предзагрузки.
+        """
+        self._pdf = pdf
+        self._budget = budget_bytes
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(1)
+        self._pool.setThreadPriority(QThread.Priority.LowestPriority)
+        self._cancelled = threading.Event()
+        # Уже поставленные в очередь страницы: (путь, страница, ширина, DPR)
+        self._requested: set[tuple[str, int, int, float]] = set()
+
+    def prefetch(
+        self,
+        path: str,
+        pages: Iterable[int],
+        max_width: int = 560,
+        dpr: float = 1.0,
+    ) -> None:
+        """Ставит страницы книги в очередь предзагрузки.
+
+        Args:
+            path: Путь к PDF.
+            pages: Индексы страниц в порядке важности.
+            max_width: Ширина рендеринга (как у предпросмотра).
+            dpr: Отношение физических пикселей экрана к логическим.
+        """
+        todo = [
+            p
+            for p in pages
+            if p >= 0 and (path, p, max_width, dpr) not in self._requested
+        ]
+        if not todo:
+            return
+        self._requested.update((path, p, max_width, dpr) for p in todo)
+        self._pool.start(
+            _PrefetchJob(
+                self._pdf, self._cancelled, path, todo, max_width, dpr, self._budget
+            )
+        )
+
+    def cancel(self) -> None:
+        """Отменяет всю запланированную и выполняющуюся предзагрузку."""
+        self._cancelled.set()
+        self._pool.clear()
+        self._cancelled = threading.Event()
+        self._requested.clear()
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Ожидает завершения предзагрузки.
+
+        Args:
+            msecs: Таймаут в миллисекундах (-1 — без ограничения).
+
+        Returns:
+            True, если все задачи завершены.
+        """
+        return self._pool.waitForDone(msecs)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional, cast
+
+from PySide6.QtCore import (
+    QObject,
+    QRunnable,
+    Qt,
+    QThread,
+    QThreadPool,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QGuiApplication, QPixmap
+
+from app.db import Database
+from app.services.thumbnail_service import ThumbnailService
+
+# Высота миниатюры на карточке (логические пиксели)
+THUMBNAIL_DISPLAY_HEIGHT = 48
+
+# Сколько книг обрабатывает одна фоновая задача
+_GENERATE_CHUNK = 16
+
+
+class _GenerateSignals(QObject):
+    """Сигналы фоновой генерации миниатюр."""
+
+    ready = Signal(list, object)
+    # ID последней книги пачки при заполнении (0 — книг без миниатюр больше нет)
+    filled = Signal(int)
+
+
+class _GenerateJob(QRunnable):
+    """Рендерит и сохраняет миниатюры пачки книг в фоновом потоке.
+
+    Без явного списка книг берёт следующую пачку книг без миниатюр
+    (после `after_id`) — так библиотека заполняется по частям.
+    """
+
+    def __init__(
+        self, db: Database, book_ids: Optional[list[int]] = None, after_id: int = 0
+    ) -> None:
+        super().__init__()
+        self.signals = _GenerateSignals()
+        self._db = db
+        self._book_ids = book_ids
+        self._after_id = after_id
+
+    def run(self) -> None:
+        """Генерирует миниатюры через собственное соединение с БД."""
+        ids = self._book_ids or []
+        created: dict[int, bytes] = {}
+        db = self._db.clone()
+        try:
+            service = ThumbnailService(db)
+            if self._book_ids is None:
+                ids = service.missing(limit=_GENERATE_CHUNK, after_id=self._after_id)
+            created = service.generate(ids)
+        except Exception:
+            # Пачка будет показана с заглушкой; повтор — при следующем запуске
+            pass
+        finally:
+            db.close()
+            self.signals.ready.emit(ids, created)
+            if self._book_ids is None:
+                self.signals.filled.emit(ids[-1] if ids else 0)
+
+
+class ThumbnailStore(QObject):
+    """Кэш миниатюр обложек для отрисовки списка книг.
+
+    `pixmap()` никогда не обращается к PDF и не блокирует отрисовку:
+    отсутствующие в памяти миниатюры загружаются из БД пачкой на следующей
+    итерации цикла событий, а отсутствующие в БД — создаются фоновым потоком.
+    По готовности испускается `updated`. Миниатюры видимых книг создаются
+    раньше фонового заполнения всей библиотеки (`fill_missing`).
+    """
+
+    updated = Signal()
+
+    def __init__(
+        self, db: Database, capacity: int = 2000, parent: QObject | None = None
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            db: Экземпляр Database.
+            capacity: Сколько миниатюр держать в памяти.
+            parent: Родительский объект.
+        """
+        super().__init__(parent)
+        self._db = db
+        self._service = ThumbnailService(db)
+        self._capacity = capacity
+
+        # None — у книги нет обложки (рисуется заглушка)
+        self._pixmaps: OrderedDict[int, Optional[QPixmap]] = OrderedDict()
+        self._requested: set[int] = set()
+        self._generating: set[int] = set()
+        self._filling = False
+
+        self._load_timer = QTimer(self)
+        self._load_timer.setSingleShot(True)
+        self._load_timer.setInterval(0)
+        self._load_timer.timeout.connect(self._load_requested)
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pool.setThreadPriority(QThread.Priority.LowPriority)
+
+    def pixmap(self, book_id: int) -> Optional[QPixmap]:
+        """Возвращает миниатюру книги, если она уже в памяти.
+
+        Args:
+            book_id: ID книги.
+
+        Returns:
+            QPixmap или None (пока не загружена или обложки нет).
+        """
+        if book_id in self._pixmaps:
+            self._pixmaps.move_to_end(book_id)
+            return self._pixmaps[book_id]
+
+        if book_id not in self._generating and book_id not in self._requested:
+            self._requested.add(book_id)
+            self._load_timer.start()
+        return None
+
+    def fill_missing(self) -> None:
+        """Запускает фоновое создание миниатюр всех книг, у которых их нет."""
+        if not self._filling:
+            self._filling = True
+            self._fill_from(0)
+
+    def clear(self) -> None:
+        """Сбрасывает миниатюры в памяти (например, после синхронизации)."""
+        self._pixmaps.clear()
+
+    def cancel(self) -> None:
+        """Отменяет ещё не начатую фоновую генерацию миниатюр."""
+        self._pool.clear()
+        self._generating.clear()
+        self._filling = False
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Ожидает завершения фоновой генерации.
+
+        Args:
+            msecs: Таймаут в миллисекундах (-1 — без ограничения).
+
+        Returns:
+            True, если все задачи завершены.
+        """
+        return self._pool.waitForDone(msecs)
+
+    def _load_requested(self) -> None:
+        """Загружает запрошенные миниатюры из БД одним запросом."""
+        ids = list(self._requested)
+        self._requested.clear()
+        blobs = self._service.load(ids)
+
+        for book_id, png in blobs.items():
+            self._put(book_id, png)
+        self._generate([i for i in ids if i not in blobs])
+
+        if blobs:
+            self.updated.emit()
+
+    def _generate(self, book_ids: list[int]) -> None:
+        """Ставит книги в очередь фоновой генерации миниатюр."""
+        todo = [i for i in book_ids if i not in self._generating]
+        self._generating.update(todo)
+        for start in range(0, len(todo), _GENERATE_CHUNK):
+            job = _GenerateJob(self._db, todo[start : start + _GENERATE_CHUNK])
+            job.signals.ready.connect(self._on_generated)
+            # Видимые книги обрабатываются раньше фонового заполнения
+            self._pool.start(job, 1)
+
+    def _fill_from(self, after_id: int) -> None:
+        """Ставит в очередь следующую пачку фонового заполнения."""
+        job = _GenerateJob(self._db, after_id=after_id)
+        job.signals.ready.connect(self._on_generated)
+        job.signals.filled.connect(self._on_filled)
+        self._pool.start(job, 0)
+
+    def _on_filled(self, last_id: int) -> None:
+        """Продолжает фоновое заполнение со следующей пачки."""
+        if last_id and self._filling:
+            self._fill_from(last_id)
+        else:
+            self._filling = False
+
+    def _on_generated(self, book_ids: list, created: object) -> None:
+        """Принимает готовые миниатюры из фонового потока.
+
+        В память попадают только миниатюры, которые запрашивала отрисовка;
+        остальные будут загружены из БД, когда книга появится на экране.
+        """
+        blobs = cast(dict, created)
+        shown = False
+        for book_id in book_ids:
+            if book_id in self._generating:
+                self._generating.discard(book_id)
+                self._put(book_id, blobs.get(book_id, b""))
+                shown = True
+        if shown:
+            self.updated.emit()
+
+    def _put(self, book_id: int, png: bytes) -> None:
+        """Декодирует PNG в QPixmap нужного размера и кладёт в LRU."""
+        pix: Optional[QPixmap] = None
+        if png:
+            loaded = QPixmap()
+            if loaded.loadFromData(png, "PNG"):
+                dpr = QGuiApplication.primaryScreen().devicePixelRatio()
+                pix = loaded.scaledToHeight(
+                    int(THUMBNAIL_DISPLAY_HEIGHT * dpr),
+                    Qt.TransformationMode.SmoothTransformation,
+                )
+                pix.setDevicePixelRatio(dpr)
+
+        self._pixmaps[book_id] = pix
+        self._pixmaps.move_to_end(book_id)
+        while len(self._pixmaps) > self._capacity:
+            self._pixmaps.popitem(last=False)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import Optional, cast
+
+from PySide6.QtCore import QObject, QThread, QThreadPool, QTimer, Signal
+
+from app.db import Database
+from app.services.library_service import LibraryService, SortKey
+from app.ui.workers import TitleQueryResult, TitleQueryWorker
+
+# Пауза после последнего нажатия, после которой выполняется запрос
+DEBOUNCE_MS = 150
+
+
+class TitleQueryScheduler(QObject):
+    """Планировщик запросов списка книг при вводе фильтра по названию.
+
+    Серия быстрых нажатий сводится к одному запросу (после паузы
+    `DEBOUNCE_MS`), который выполняется в фоновом потоке; результаты
+    устаревших запросов отбрасываются. Если новый фильтр уточняет предыдущий,
+    а тот вернул все подходящие книги, результат отбирается из них в памяти
+    без обращения к БД.
+    """
+
+    ready = Signal(object)
+
+    def __init__(self, db: Database, parent: QObject | None = None) -> None:
+        """Инициализация.
+
+        Args:
+            db: Экземпляр Database.
+            parent: Родительский объект.
+        """
+        super().__init__(parent)
+        self._db = db
+        self._library = LibraryService(db)
+        self._generation = 0
+        self._pending: Optional[tuple[str, SortKey, int]] = None
+        self._worker: Optional[TitleQueryWorker] = None
+        self._last: Optional[TitleQueryResult] = None
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._run_pending)
+
+        # Один поток: новые запросы всё равно вытесняют ещё не начатые
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pool.setThreadPriority(QThread.Priority.HighPriority)
+
+    def schedule(self, title_filter: str, sort: SortKey, limit: int) -> None:
+        """Запрашивает список книг по фильтру.
+
+        Args:
+            title_filter: Строка фильтра.
+            sort: Ключ сортировки.
+            limit: Сколько книг загрузить сразу.
+        """
+        self._generation += 1
+        last = self._last
+        if (
+            last is not None
+            and last.cursor is None
+            and last.sort == sort
+            and self._library.is_refinement(last.title_filter, title_filter)
+        ):
+            # Уточнение полного результата: отбор в памяти, без ожидания
+            self._debounce.stop()
+            self._pending = None
+            books = self._library.filter_books(last.books, title_filter)
+            self._finish(TitleQueryResult(title_filter, sort, books, None, len(books)))
+            return
+
+        self._pending = (title_filter, sort, limit)
+        self._debounce.start()
+
+    def invalidate(self) -> None:
+        """Отменяет ожидающий запрос и забывает предыдущий результат.
+
+        Вызывается, когда список обновлён в обход планировщика (например,
+        после изменения библиотеки).
+        """
+        self._generation += 1
+        self._debounce.stop()
+        self._pending = None
+        self._last = None
+        self._pool.clear()
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Ожидает завершения фонового запроса.
+
+        Args:
+            msecs: Таймаут в миллисекундах (-1 — без ограничения).
+
+        Returns:
+            True, если запросы завершены.
+        """
+        return self._pool.waitForDone(msecs)
+
+    def _run_pending(self) -> None:
+        """Запускает отложенный запрос в фоновом потоке."""
+        if self._pending is None:
+            return
+        title_filter, sort, limit = self._pending
+        self._pending = None
+
+        self._pool.clear()
+        worker = TitleQueryWorker(
+            self._db, self._generation, title_filter, sort, limit
+        )
+        worker.signals.ready.connect(self._on_ready)
+        # Ссылка держит сигналы воркера живыми до доставки результата
+        self._worker = worker
+        self._pool.start(worker)
+
+    def _on_ready(self, generation: int, result: object) -> None:
+        """Принимает результат фонового запроса."""
+        if generation != self._generation:
+            return
+        self._worker = None
+        self._finish(cast(TitleQueryResult, result))
+
+    def _finish(self, result: TitleQueryResult) -> None:
+        """Запоминает результат и передаёт его окну."""
+        # Неудачный запрос не годится как основа для уточнений
+        self._last = None if result.error else result
+        self.ready.emit(result)
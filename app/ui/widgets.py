@@ -6,6 +6,8 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QImage, QPainter, QPen, QPixmap
 from PySide6.QtWidgets import QLabel
 
+from app.services.render_cache import RenderedPage
+
 
 class ImagePreview(QLabel):
     """Виджет предпросмотра изображения PDF-страницы с подсветкой совпадений."""
@@ -36,20 +38,49 @@ class ImagePreview(QLabel):
         png_bytes: bytes,
         highlights: List[Tuple[float, float, float, float]] | None = None,
         scale: float = 1.0,
+        dpr: float = 1.0,
     ) -> None:
         """Устанавливает PNG и подсветки.
 
         Args:
             png_bytes: PNG bytes.
             highlights: Прямоугольники подсветки (в оригинальных координатах страницы).
-            scale: Масштаб рендеринга страницы.
+            scale: Масштаб рендеринга страницы (в логических пикселях).
+            dpr: Отношение физических пикселей изображения к логическим.
         """
         img = QImage.fromData(png_bytes, "PNG")
         self._pix = QPixmap.fromImage(img)
+        self._pix.setDevicePixelRatio(dpr)
         self._highlights = highlights or []
         self._scale = scale
         self.setPixmap(self._draw())
 
+    def set_rendered_page(
+        self,
+        page: RenderedPage,
+        highlights: List[Tuple[float, float, float, float]] | None = None,
+    ) -> None:
+        """Устанавливает отрендеренную страницу без декодирования PNG.
+
+        QImage строится прямо поверх RGB-пикселей страницы.
+
+        Args:
+            page: Отрендеренная страница.
+            highlights: Прямоугольники подсветки (в оригинальных координатах страницы).
+        """
+        img = QImage(
+            page.samples,
+            page.width,
+            page.height,
+            page.stride,
+            QImage.Format.Format_RGB888,
+        )
+        self._pix = QPixmap.fromImage(img)
+        self._pix.setDevicePixelRatio(page.dpr)
+        self._highlights = highlights or []
+        self._scale = page.scale
+        self.setPixmap(self._draw())
+
     def clear(self) -> None:
         """Очищает предпросмотр."""
         self._pix = None
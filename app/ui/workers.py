@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from app.db import Database
+from app.models import Book
+from app.services.library_service import (
+    ImportReport,
+    LibraryService,
+    PageCursor,
+    SortKey,
+    SyncReport,
+)
+from app.services.scanner import Scanner
+from app.services.settings_service import SettingsService
+
+
+class ContentSearchSignals(QObject):
+    """Сигналы фонового поиска по содержимому.
+
+    Первый аргумент каждого сигнала — номер поиска, по которому окно
+    отбрасывает результаты устаревших запросов.
+    """
+
+    found = Signal(int, list)
+    progress = Signal(int, int, int)
+    # (номер поиска, отменён, текст ошибки — пустой, если ошибки не было)
+    finished = Signal(int, bool, str)
+
+
+class ContentSearchWorker(QRunnable):
+    """Фоновый поиск книг по содержимому с потоковой выдачей результатов."""
+
+    def __init__(
+        self,
+        db: Database,
+        generation: int,
+        keyword: str,
+        sort: SortKey,
+        index_workers: Optional[int] = None,
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            db: Database главного потока (воркер открывает своё соединение).
+            generation: Номер поиска.
+            keyword: Ключевое слово.
+            sort: Ключ сортировки.
+            index_workers: Число процессов индексации (None — по числу ядер).
+        """
+        super().__init__()
+        self.signals = ContentSearchSignals()
+        self._db = db
+        self._index_workers = index_workers
+        self._generation = generation
+        self._keyword = keyword
+        self._sort = sort
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Запрашивает остановку поиска."""
+        self._cancelled.set()
+
+    def run(self) -> None:
+        """Выполняет поиск в потоке пула."""
+        gen = self._generation
+        error = ""
+        db = self._db.clone()
+        try:
+            library = LibraryService(db, index_workers=self._index_workers)
+            for books in library.iter_books_by_content(
+                self._keyword,
+                sort=self._sort,
+                progress=lambda done, total: self.signals.progress.emit(
+                    gen, done, total
+                ),
+                cancel=self._cancelled.is_set,
+            ):
+                self.signals.found.emit(gen, books)
+        except (sqlite3.Error, OSError) as e:
+            error = str(e) or type(e).__name__
+        finally:
+            db.close()
+            self.signals.finished.emit(gen, self._cancelled.is_set(), error)
+
+
+@dataclass
+class TitleQueryResult:
+    """Результат запроса списка книг по фильтру."""
+
+    title_filter: str
+    sort: SortKey
+    books: list[Book]
+    # Позиция следующей страницы (None — загружены все подходящие книги)
+    cursor: Optional[PageCursor]
+    count: int
+    # Текст ошибки запроса (пустой — запрос выполнен, иначе список не менялся)
+    error: str = ""
+
+
+class TitleQuerySignals(QObject):
+    """Сигналы фонового запроса по названию.
+
+    Первый аргумент — номер запроса, по которому устаревшие результаты
+    отбрасываются.
+    """
+
+    ready = Signal(int, object)
+
+
+class TitleQueryWorker(QRunnable):
+    """Фоновая загрузка первой страницы списка книг по фильтру."""
+
+    def __init__(
+        self,
+        db: Database,
+        generation: int,
+        title_filter: str,
+        sort: SortKey,
+        limit: int,
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            db: Database главного потока (воркер открывает своё соединение).
+            generation: Номер запроса.
+            title_filter: Строка фильтра.
+            sort: Ключ сортировки.
+            limit: Сколько книг загрузить.
+        """
+        super().__init__()
+        self.signals = TitleQuerySignals()
+        self._db = db
+        self._generation = generation
+        self._title_filter = title_filter
+        self._sort = sort
+        self._limit = limit
+
+    def run(self) -> None:
+        """Выполняет запрос в потоке пула."""
+        db = self._db.clone()
+        try:
+            library = LibraryService(db)
+            books, cursor = library.list_books_page(
+                self._sort, self._title_filter, limit=self._limit
+            )
+            count = (
+                len(books)
+                if cursor is None
+                else library.count_books(self._title_filter)
+            )
+            result = TitleQueryResult(
+                self._title_filter, self._sort, books, cursor, count
+            )
+        except (sqlite3.Error, OSError) as e:
+            result = TitleQueryResult(
+                self._title_filter,
+                self._sort,
+                [],
+                None,
+                0,
+                error=str(e) or type(e).__name__,
+            )
+        finally:
+            db.close()
+        self.signals.ready.emit(self._generation, result)
+
+
+class FolderImportSignals(QObject):
+    """Сигналы фонового импорта папки."""
+
+    # (обработано файлов, всего файлов, файлов в секунду)
+    progress = Signal(int, int, int)
+    # (проиндексировано книг, всего книг)
+    indexing = Signal(int, int)
+    finished = Signal(object)
+
+
+class FolderImportWorker(QRunnable):
+    """Фоновый импорт папки: сканирование, метаданные, запись в БД и индексация."""
+
+    def __init__(
+        self, db: Database, folder: str, index_workers: Optional[int] = None
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            db: Database главного потока (воркер открывает своё соединение).
+            folder: Папка с книгами.
+            index_workers: Число процессов импорта и индексации (None — по
+                числу ядер).
+        """
+        super().__init__()
+        self.signals = FolderImportSignals()
+        self._db = db
+        self._index_workers = index_workers
+        self._folder = folder
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Запрашивает остановку импорта."""
+        self._cancelled.set()
+
+    def run(self) -> None:
+        """Выполняет импорт и индексацию добавленных книг в потоке пула.
+
+        По завершении испускает ImportReport.
+        """
+        report = ImportReport()
+        db = self._db.clone()
+        try:
+            # Импорт начинается, не дожидаясь окончания обхода папки
+            files = Scanner().iter_folder(self._folder, cancel=self._cancelled.is_set)
+            started = time.perf_counter()
+
+            def on_progress(done: int, total: int) -> None:
+                elapsed = time.perf_counter() - started
+                rate = done / elapsed if elapsed > 0 else 0.0
+                self.signals.progress.emit(done, total, round(rate))
+
+            library = LibraryService(db, index_workers=self._index_workers)
+            report = library.import_scanned(
+                files, progress=on_progress, cancel=self._cancelled.is_set
+            )
+
+            added = report.added_books()
+            if added and not self._cancelled.is_set():
+                # Непроиндексированные при отмене книги доиндексирует поиск
+                library.index_books(
+                    added,
+                    progress=self.signals.indexing.emit,
+                    cancel=self._cancelled.is_set,
+                )
+        except (sqlite3.Error, OSError) as e:
+            report.error = str(e) or type(e).__name__
+        finally:
+            db.close()
+            self.signals.finished.emit(report)
+
+
+class FolderSyncSignals(QObject):
+    """Сигналы фоновой синхронизации папок."""
+
+    # (SyncReport, все папки внутри синхронизированных)
+    finished = Signal(object, list)
+
+
+class FolderSyncWorker(QRunnable):
+    """Фоновая синхронизация нескольких папок с библиотекой."""
+
+    def __init__(
+        self, db: Database, folders: list[str], index_workers: Optional[int] = None
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            db: Database главного потока (воркер открывает своё соединение).
+            folders: Папки для синхронизации.
+            index_workers: Число процессов импорта и индексации (None — по
+                числу ядер).
+        """
+        super().__init__()
+        self.signals = FolderSyncSignals()
+        self._db = db
+        self._index_workers = index_workers
+        self._folders = folders
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Запрашивает остановку синхронизации."""
+        self._cancelled.set()
+
+    def run(self) -> None:
+        """Синхронизирует папки в потоке пула."""
+        report = SyncReport()
+        directories: list[str] = []
+        db = self._db.clone()
+        try:
+            library = LibraryService(db, index_workers=self._index_workers)
+            for folder in self._folders:
+                if self._cancelled.is_set():
+                    break
+                report.merge(
+                    library.sync_folder(
+                        folder,
+                        cancel=self._cancelled.is_set,
+                        directories=directories,
+                    )
+                )
+        except (sqlite3.Error, OSError) as e:
+            report.error = str(e) or type(e).__name__
+        finally:
+            db.close()
+            self.signals.finished.emit(report, directories)
+
+
+class LibrarySyncSignals(QObject):
+    """Сигналы фоновой синхронизации всей библиотеки."""
+
+    finished = Signal(object)
+
+
+class LibrarySyncWorker(QRunnable):
+    """Фоновая сверка всей библиотеки с файлами на диске."""
+
+    def __init__(self, db: Database, index_workers: Optional[int] = None) -> None:
+        """Инициализация.
+
+        Args:
+            db: Database главного потока (воркер открывает своё соединение).
+            index_workers: Число процессов индексации (None — по числу ядер).
+        """
+        super().__init__()
+        self.signals = LibrarySyncSignals()
+        self._db = db
+        self._index_workers = index_workers
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Запрашивает остановку синхронизации."""
+        self._cancelled.set()
+
+    def run(self) -> None:
+        """Синхронизирует библиотеку в потоке пула; испускает SyncReport."""
+        report = SyncReport()
+        db = self._db.clone()
+        try:
+            library = LibraryService(db, index_workers=self._index_workers)
+            report = library.sync_library(cancel=self._cancelled.is_set)
+        except (sqlite3.Error, OSError) as e:
+            report.error = str(e) or type(e).__name__
+        finally:
+            db.close()
+            self.signals.finished.emit(report)
+
+
+class SettingsFlushSignals(QObject):
+    """Сигналы фоновой записи настроек."""
+
+    # Значения, которые не удалось записать (пустой словарь — всё записано)
+    finished = Signal(object)
+
+
+class SettingsFlushWorker(QRunnable):
+    """Фоновая запись изменённых настроек в БД."""
+
+    def __init__(self, db: Database, values: dict[str, str]) -> None:
+        """Инициализация.
+
+        Args:
+            db: Database главного потока (воркер открывает своё соединение).
+            values: Изменённые настройки (`SettingsService.take_pending()`).
+        """
+        super().__init__()
+        self.signals = SettingsFlushSignals()
+        self._db = db
+        self._values = values
+        # Незаписанные значения доступны и после остановки цикла событий
+        self.failed: dict[str, str] = {}
+
+    def run(self) -> None:
+        """Записывает настройки в потоке пула; испускает незаписанные значения."""
+        try:
+            db = self._db.clone()
+            try:
+                SettingsService(db).write(self._values)
+            finally:
+                db.close()
+        except (sqlite3.Error, OSError):
+            self.failed = dict(self._values)
+        self.signals.finished.emit(self.failed)
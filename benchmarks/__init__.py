@@ -0,0 +1,4 @@
+"""Воспроизводимые замеры производительности BookVault.
+
+Запуск: `python -m benchmarks --help`.
+"""
@@ -0,0 +1,8 @@
+import sys
+
+from benchmarks.run import main
+
+# Защита обязательна: пулы процессов импорта и индексации запускаются
+# методом spawn и повторно импортируют этот модуль
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+# Словари генератора: текст детерминирован при одинаковом зерне
+LATIN_WORDS = (
+    "library", "archive", "chapter", "volume", "reader", "margin", "index",
+    "journal", "letter", "window", "garden", "river", "mountain", "signal",
+    "harbor", "lantern", "orbit", "meadow", "thunder", "compass", "quartz",
+    "ember", "glacier", "velvet", "pepper", "saddle", "anchor", "violet",
+)
+CYRILLIC_WORDS = (
+    "библиотека", "архив", "глава", "том", "читатель", "поле", "указатель",
+    "журнал", "письмо", "окно", "сад", "река", "гора", "сигнал", "гавань",
+    "фонарь", "орбита", "луг", "гроза", "компас", "кварц", "уголь", "ледник",
+    "бархат", "перец", "седло", "якорь", "фиалка",
+)
+AUTHORS = (
+    "Anna Petrova", "Boris Volkov", "Clara Stein", "David Marsh",
+    "Елена Смирнова", "Фёдор Орлов", "Галина Руденко", "Игорь Лесков",
+)
+
+# Редкие слова для поиска: встречаются не в каждой книге
+RARE_LATIN = "zephyrine"
+RARE_CYRILLIC = "щеглов"
+# Доля книг, в текст которых добавлено редкое слово
+RARE_WORD_SHARE = 0.1
+
+# Файл с описанием корпуса внутри его папки
+MANIFEST_NAME = "corpus.json"
+
+# Страница A4 и поля текста (пункты)
+_PAGE_WIDTH = 595
+_PAGE_HEIGHT = 842
+_MARGIN = 56
+_FONT_SIZE = 10
+_MIN_FONT_SIZE = 3
+_PDF_DATE = "D:20240101000000"
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Параметры синтетического корпуса книг.
+
+    Attributes:
+        books: Число книг.
+        pages: Число страниц в книге.
+        words_per_page: Плотность текста (слов на странице).
+        cyrillic_share: Доля кириллических слов (0 — только латиница).
+        seed: Зерно генератора (одинаковое зерно — одинаковый корпус).
+    """
+
+    books: int = 200
+    pages: int = 20
+    words_per_page: int = 250
+    cyrillic_share: float = 0.5
+    seed: int = 1
+
+
+@dataclass(frozen=True)
+class CorpusBook:
+    """Сгенерированная книга корпуса."""
+
+    path: str
+    title: str
+    author: str
+    pages: int
+    has_rare_word: bool
+
+
+def book_title(rng: random.Random, spec: CorpusSpec, number: int) -> str:
+    """Название книги из словарных слов (с номером — для уникальности).
+
+    Args:
+        rng: Генератор случайных чисел.
+        spec: Параметры корпуса.
+        number: Номер книги.
+
+    Returns:
+        Название.
+    """
+    words = [_word(rng, spec).capitalize() for _ in range(rng.randint(1, 3))]
+    return f"{' '.join(words)} {number}"
+
+
+def generate_corpus(folder: Path, spec: CorpusSpec) -> list[CorpusBook]:
+    """Создаёт корпус PDF в папке (или использует уже созданный).
+
+    Корпус с теми же параметрами повторно не генерируется: рядом с книгами
+    сохраняется описание `corpus.json`, и если оно совпадает со `spec`,
+    возвращается его содержимое.
+
+    Args:
+        folder: Папка корпуса.
+        spec: Параметры корпуса.
+
+    Returns:
+        Список книг корпуса.
+    """
+    import fitz  # PyMuPDF
+
+    cached = load_corpus(folder, spec)
+    if cached is not None:
+        return cached
+
+    folder.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(spec.seed)
+    books: list[CorpusBook] = []
+
+    for number in range(spec.books):
+        title = book_title(rng, spec, number)
+        author = rng.choice(AUTHORS)
+        rare = rng.random() < RARE_WORD_SHARE
+        # Книги раскладываются по подпапкам, как в настоящей библиотеке
+        path = folder / f"shelf_{number % 10}" / f"book_{number:05d}.pdf"
+        path.parent.mkdir(exist_ok=True)
+
+        doc = fitz.open()
+        for text in _page_texts(rng, spec, rare):
+            page = doc.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+            _insert_text(page, text, cyrillic=spec.cyrillic_share > 0)
+        # Фиксированные даты и без нового ID: файлы совпадают побайтно
+        doc.set_metadata(
+            {
+                "title": title,
+                "author": author,
+                "creationDate": _PDF_DATE,
+                "modDate": _PDF_DATE,
+            }
+        )
+        doc.save(str(path), garbage=1, deflate=True, no_new_id=True)
+        doc.close()
+
+        books.append(CorpusBook(str(path), title, author, spec.pages, rare))
+
+    manifest = {"spec": asdict(spec), "books": [asdict(b) for b in books]}
+    (folder / MANIFEST_NAME).write_text(
+        json.dumps(manifest, ensure_ascii=False), encoding="utf-8"
+    )
+    return books
+
+
+def load_corpus(folder: Path, spec: CorpusSpec) -> list[CorpusBook] | None:
+    """Читает описание уже созданного корпуса.
+
+    Args:
+        folder: Папка корпуса.
+        spec: Ожидаемые параметры.
+
+    Returns:
+        Список книг или None, если корпуса нет или он создан с другими
+        параметрами.
+    """
+    try:
+        manifest = json.loads((folder / MANIFEST_NAME).read_text(encoding="utf-8"))
+        if manifest["spec"] != asdict(spec):
+            return None
+        books = [CorpusBook(**item) for item in manifest["books"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not all(Path(b.path).is_file() for b in books):
+        return None
+    return books
+
+
+def iter_titles(spec: CorpusSpec, count: int) -> Iterator[tuple[str, str]]:
+    """Названия и авторы книг без создания PDF (для больших списков).
+
+    Args:
+        spec: Параметры корпуса (словарь и зерно).
+        count: Сколько записей создать.
+
+    Yields:
+        Пары (название, автор).
+    """
+    rng = random.Random(spec.seed)
+    for number in range(count):
+        yield book_title(rng, spec, number), rng.choice(AUTHORS)
+
+
+def _insert_text(page, text: str, cyrillic: bool) -> None:
+    """Размещает текст на странице, уменьшая шрифт, пока текст не поместится."""
+    import fitz  # PyMuPDF
+
+    rect = fitz.Rect(_MARGIN, _MARGIN, _PAGE_WIDTH - _MARGIN, _PAGE_HEIGHT - _MARGIN)
+    # Встроенный CJK-шрифт содержит кириллицу и не встраивается в файл
+    fontname = "china-s" if cyrillic else "helv"
+    fontsize = _FONT_SIZE
+    while page.insert_textbox(rect, text, fontname=fontname, fontsize=fontsize) < 0:
+        if fontsize <= _MIN_FONT_SIZE:
+            # Не поместилось даже мелким шрифтом: страница остаётся пустой
+            break
+        fontsize = max(_MIN_FONT_SIZE, fontsize * 0.8)
+
+
+def _word(rng: random.Random, spec: CorpusSpec) -> str:
+    """Случайное слово с заданной долей кириллицы."""
+    words = CYRILLIC_WORDS if rng.random() < spec.cyrillic_share else LATIN_WORDS
+    return rng.choice(words)
+
+
+def _page_texts(
+    rng: random.Random, spec: CorpusSpec, rare: bool
+) -> Iterator[str]:
+    """Тексты страниц книги."""
+    rare_page = rng.randrange(spec.pages) if rare else -1
+    for index in range(spec.pages):
+        words = [_word(rng, spec) for _ in range(spec.words_per_page)]
+        if index == rare_page:
+            words[len(words) // 2] = RARE_LATIN
+            if spec.cyrillic_share > 0:
+                words[len(words) // 3] = RARE_CYRILLIC
+        yield " ".join(words)
@@ -0,0 +1,601 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from app.db import Database
+from app.models import Book
+from app.services.document_pool import DocumentPool
+from app.services.extraction import read_import_metadata
+from app.services.library_service import LibraryService
+from app.services.pdf_service import PdfService
+from app.services.render_cache import RenderCache
+from app.services.scanner import Scanner
+from app.text import book_search_text
+from benchmarks.corpus import (
+    LATIN_WORDS,
+    RARE_CYRILLIC,
+    RARE_LATIN,
+    CorpusBook,
+    CorpusSpec,
+    generate_corpus,
+    iter_titles,
+)
+
+# Версия формата файла результатов
+RESULTS_VERSION = 1
+
+# Все замеры в порядке выполнения
+BENCHMARKS = (
+    "scan",
+    "metadata",
+    "import",
+    "index",
+    "content_search",
+    "book_search",
+    "render",
+    "list_page",
+    "list_filter",
+)
+
+# Допустимое замедление относительно базовой линии (0.25 — на 25%)
+DEFAULT_TOLERANCE = 0.25
+
+# Сколько книг участвуют в поиске внутри книги и рендеринге
+_SAMPLE_BOOKS = 10
+# Сколько первых страниц книги рендерится
+_RENDER_PAGES = 3
+# Ширина рендеринга (как у панели предпросмотра)
+_RENDER_WIDTH = 560
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Итог одного замера.
+
+    Attributes:
+        name: Название замера.
+        seconds: Медиана времени прогона.
+        best: Лучшее время прогона.
+        runs: Число прогонов.
+        items: Сколько единиц работы в одном прогоне.
+        unit: Единица работы (файлы, страницы, запросы).
+    """
+
+    name: str
+    seconds: float
+    best: float
+    runs: int
+    items: int
+    unit: str
+
+    @property
+    def per_second(self) -> float:
+        """Пропускная способность по медиане (единиц в секунду)."""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class Regression:
+    """Замедление замера относительно базовой линии."""
+
+    name: str
+    seconds: float
+    baseline: float
+
+    @property
+    def ratio(self) -> float:
+        """Во сколько раз медленнее базовой линии."""
+        return self.seconds / self.baseline if self.baseline > 0 else float("inf")
+
+
+def measure(
+    name: str,
+    run: Callable[[], object],
+    items: int,
+    unit: str,
+    repeat: int,
+    setup: Optional[Callable[[], None]] = None,
+) -> BenchmarkResult:
+    """Замеряет функцию несколько раз.
+
+    Args:
+        name: Название замера.
+        run: Замеряемая функция.
+        items: Сколько единиц работы выполняет один вызов.
+        unit: Единица работы.
+        repeat: Число прогонов.
+        setup: Подготовка перед каждым прогоном (в замер не входит).
+
+    Returns:
+        BenchmarkResult.
+    """
+    timings = []
+    for _ in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return BenchmarkResult(
+        name=name,
+        seconds=statistics.median(timings),
+        best=min(timings),
+        runs=len(timings),
+        items=items,
+        unit=unit,
+    )
+
+
+class BenchmarkSuite:
+    """Замеры основных операций BookVault на синтетическом корпусе.
+
+    Каждый замер выполняется на отдельной временной БД; пользовательские
+    данные и кэши (`~/.bookvault`) не используются.
+    """
+
+    def __init__(
+        self,
+        corpus_dir: Path,
+        spec: CorpusSpec,
+        list_rows: int = 50_000,
+        repeat: int = 3,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Инициализация.
+
+        Args:
+            corpus_dir: Папка корпуса PDF (создаётся при необходимости).
+            spec: Параметры корпуса.
+            list_rows: Число книг в БД для замеров списка (без PDF).
+            repeat: Число прогонов каждого замера.
+            workers: Число процессов импорта и индексации (None — по ядрам).
+        """
+        self._corpus_dir = corpus_dir
+        self._spec = spec
+        self._list_rows = list_rows
+        self._repeat = repeat
+        self._workers = workers
+        self._books: list[CorpusBook] = []
+        # Временная папка БД замеров существует только во время `run()`
+        self._work_dir = Path()
+        self._library_db: Optional[Database] = None
+        self._list_db: Optional[Database] = None
+
+    def run(
+        self,
+        only: Optional[set[str]] = None,
+        log: Callable[[str], None] = print,
+    ) -> list[BenchmarkResult]:
+        """Выполняет замеры.
+
+        Args:
+            only: Названия замеров (None — все).
+            log: Куда писать ход выполнения.
+
+        Returns:
+            Результаты в порядке `BENCHMARKS`.
+        """
+        started = time.perf_counter()
+        self._books = generate_corpus(self._corpus_dir, self._spec)
+        log(
+            f"[BENCH] Корпус: {len(self._books)} книг за "
+            f"{time.perf_counter() - started:.1f} с ({self._corpus_dir})"
+        )
+
+        results = []
+        with tempfile.TemporaryDirectory(prefix="bookvault-bench-") as work_dir:
+            self._work_dir = Path(work_dir)
+            try:
+                for name in BENCHMARKS:
+                    if only is not None and name not in only:
+                        continue
+                    result = getattr(self, f"_bench_{name}")()
+                    log(format_result(result))
+                    results.append(result)
+            finally:
+                # БД закрываются до удаления папки
+                self._close_databases()
+        return results
+
+    # ------------------------------------------------------------------ Import
+
+    def _bench_scan(self) -> BenchmarkResult:
+        """Обход папки корпуса."""
+        scanner = Scanner()
+        return measure(
+            "scan",
+            lambda: scanner.scan_folder(str(self._corpus_dir)),
+            len(self._books),
+            "files",
+            self._repeat,
+        )
+
+    def _bench_metadata(self) -> BenchmarkResult:
+        """Чтение метаданных и отпечатков в одном процессе."""
+        files = [(b.path, os.path.getsize(b.path), "pdf") for b in self._books]
+        return measure(
+            "metadata",
+            lambda: read_import_metadata(files),
+            len(files),
+            "files",
+            self._repeat,
+        )
+
+    def _bench_import(self) -> BenchmarkResult:
+        """Импорт корпуса в пустую БД.
+
+        Метаданные извлекаются пулом процессов, только если в корпусе не
+        меньше файлов, чем порог `MetadataStage` (256); меньший корпус
+        импортируется в одном процессе.
+        """
+        files = Scanner().scan_folder(str(self._corpus_dir))
+        state: dict[str, Database] = {}
+
+        def setup() -> None:
+            if "db" in state:
+                state["db"].close()
+            state["db"] = self._new_database("import")
+
+        def run() -> None:
+            LibraryService(state["db"], index_workers=self._workers).import_scanned(
+                files
+            )
+
+        try:
+            return measure("import", run, len(files), "files", self._repeat, setup)
+        finally:
+            state["db"].close()
+
+    def _bench_index(self) -> BenchmarkResult:
+        """Полнотекстовая индексация всех книг (пулом процессов)."""
+        db = self._library_database()
+        library = LibraryService(db, index_workers=self._workers)
+        books = [(r["id"], r["path"]) for r in db.query("SELECT id, path FROM books;")]
+        return measure(
+            "index",
+            lambda: library.index_books(books),
+            len(books) * self._spec.pages,
+            "pages",
+            self._repeat,
+        )
+
+    # ------------------------------------------------------------------ Search
+
+    def _bench_content_search(self) -> BenchmarkResult:
+        """Поиск книг по содержимому (FTS5)."""
+        library = LibraryService(self._library_database(), index_workers=self._workers)
+        library.index_missing_books()
+        queries = [RARE_LATIN, RARE_CYRILLIC, LATIN_WORDS[0]]
+
+        def run() -> None:
+            for query in queries:
+                library.search_books_by_content(query)
+
+        return measure("content_search", run, len(queries), "queries", self._repeat)
+
+    def _bench_book_search(self) -> BenchmarkResult:
+        """Поиск внутри книги по всем страницам (документы уже открыты)."""
+        documents = DocumentPool(capacity=_SAMPLE_BOOKS)
+        pdf = PdfService(documents=documents)
+        sample = self._books[:_SAMPLE_BOOKS]
+        # Открытие файлов в замер не входит: пул вмещает все книги выборки
+        for book in sample:
+            with documents.open(book.path):
+                pass
+
+        def run() -> None:
+            for book in sample:
+                pdf.search(book.path, RARE_LATIN)
+
+        pages = sum(b.pages for b in sample)
+        try:
+            return measure("book_search", run, pages, "pages", self._repeat)
+        finally:
+            documents.close_all()
+
+    def _bench_render(self) -> BenchmarkResult:
+        """Рендеринг первых страниц книг без кэша."""
+        pdf = PdfService(
+            render_cache=RenderCache(memory_limit=0, disk_limit=0),
+            documents=DocumentPool(),
+        )
+        sample = self._books[:_SAMPLE_BOOKS]
+        pages = [
+            (b.path, i) for b in sample for i in range(min(_RENDER_PAGES, b.pages))
+        ]
+
+        def run() -> None:
+            for path, index in pages:
+                pdf.render_page(path, index, max_width=_RENDER_WIDTH)
+
+        return measure("render", run, len(pages), "pages", self._repeat)
+
+    # ------------------------------------------------------------------ List
+
+    def _bench_list_page(self) -> BenchmarkResult:
+        """Первая и следующая страницы списка при каждой сортировке."""
+        library = LibraryService(self._list_database())
+        sorts = ("title_asc", "added_desc", "added_asc")
+
+        def run() -> None:
+            for sort in sorts:
+                _, cursor = library.list_books_page(sort)
+                library.list_books_page(sort, after=cursor)
+
+        return measure("list_page", run, len(sorts) * 2, "pages", self._repeat)
+
+    def _bench_list_filter(self) -> BenchmarkResult:
+        """Фильтр по названию при наборе: запросы к БД и уточнение в памяти."""
+        library = LibraryService(self._list_database())
+        typed = [LATIN_WORDS[1][:n] for n in range(2, len(LATIN_WORDS[1]) + 1)]
+
+        def run() -> None:
+            # Как при вводе в окне: полный результат уточняется в памяти
+            books: list[Book] = []
+            complete = False
+            for index, text in enumerate(typed):
+                if complete and library.is_refinement(typed[index - 1], text):
+                    books = library.filter_books(books, text)
+                    continue
+                library.count_books(text)
+                books, cursor = library.list_books_page("title_asc", text)
+                complete = cursor is None
+
+        return measure("list_filter", run, len(typed), "queries", self._repeat)
+
+    # ------------------------------------------------------------------ Helpers
+
+    def _new_database(self, name: str) -> Database:
+        """Создаёт пустую БД во временной папке замеров."""
+        path = self._work_dir / f"{name}-{time.monotonic_ns()}.sqlite3"
+        db = Database(path)
+        db.initialize()
+        return db
+
+    def _library_database(self) -> Database:
+        """БД с импортированным корпусом (создаётся один раз)."""
+        if self._library_db is None:
+            self._library_db = self._new_database("library")
+            library = LibraryService(self._library_db, index_workers=self._workers)
+            library.import_scanned(Scanner().scan_folder(str(self._corpus_dir)))
+        return self._library_db
+
+    def _list_database(self) -> Database:
+        """БД с большим списком книг без файлов (создаётся один раз)."""
+        if self._list_db is not None:
+            return self._list_db
+        db = self._list_db = Database(self._work_dir / "list.sqlite3")
+        db.initialize()
+
+        now = Database.now_iso()
+        rows = [
+            (
+                title,
+                author,
+                f"/bench/{number}.pdf",
+                now,
+                book_search_text(title, author, ""),
+            )
+            for number, (title, author) in enumerate(
+                iter_titles(self._spec, self._list_rows)
+            )
+        ]
+        db.executemany(
+            "INSERT INTO books(title, author, path, added_at, search_text) "
+            "VALUES(?, ?, ?, ?, ?);",
+            rows,
+        )
+        return db
+
+    def _close_databases(self) -> None:
+        """Закрывает БД библиотеки и списка."""
+        for db in (self._library_db, self._list_db):
+            if db is not None:
+                db.close()
+        self._library_db = None
+        self._list_db = None
+
+
+def environment() -> dict[str, str]:
+    """Сведения об окружении для сравнения результатов."""
+    import fitz  # PyMuPDF
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": str(os.cpu_count() or 0),
+        "sqlite": sqlite3.sqlite_version,
+        "pymupdf": fitz.VersionBind,
+    }
+
+
+def results_to_json(spec: CorpusSpec, results: list[BenchmarkResult]) -> dict:
+    """Собирает результаты в словарь для сохранения в JSON.
+
+    Args:
+        spec: Параметры корпуса.
+        results: Результаты замеров.
+
+    Returns:
+        Словарь с версией формата, параметрами, окружением и замерами.
+    """
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": Database.now_iso(),
+        "spec": asdict(spec),
+        "environment": environment(),
+        "results": {
+            r.name: {**asdict(r), "per_second": round(r.per_second, 2)}
+            for r in results
+        },
+    }
+
+
+def compare(
+    results: list[BenchmarkResult], baseline: dict, tolerance: float
+) -> list[Regression]:
+    """Находит замеры, ставшие медленнее базовой линии.
+
+    Сравниваются медианы; замеры, которых нет в базовой линии, пропускаются.
+
+    Args:
+        results: Текущие результаты.
+        baseline: Ранее сохранённые результаты (`results_to_json`).
+        tolerance: Допустимое замедление (0.25 — на 25%).
+
+    Returns:
+        Список замедлений.
+    """
+    saved = baseline.get("results", {})
+    regressions = []
+    for result in results:
+        base = saved.get(result.name)
+        if base is None:
+            continue
+        if result.seconds > base["seconds"] * (1 + tolerance):
+            regressions.append(
+                Regression(result.name, result.seconds, base["seconds"])
+            )
+    return regressions
+
+
+def format_result(result: BenchmarkResult, baseline: Optional[dict] = None) -> str:
+    """Строка отчёта об одном замере.
+
+    Args:
+        result: Результат замера.
+        baseline: Результаты базовой линии (для столбца изменения).
+
+    Returns:
+        Строка вида "[BENCH] render  120.5 ms  249 pages/s".
+    """
+    line = (
+        f"[BENCH] {result.name:<15} {result.seconds * 1000:10.1f} ms "
+        f"{result.per_second:12.1f} {result.unit}/s"
+    )
+    base = (baseline or {}).get("results", {}).get(result.name)
+    if base and base["seconds"] > 0:
+        change = (result.seconds / base["seconds"] - 1) * 100
+        line += f"  {change:+.1f}%"
+    return line
+
+
+def load_baseline(path: Path) -> dict:
+    """Читает файл базовой линии.
+
+    Args:
+        path: Путь к JSON с результатами.
+
+    Returns:
+        Словарь результатов.
+
+    Raises:
+        ValueError: Если файл другой версии формата.
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Неподдерживаемая версия файла результатов: {path}")
+    return data
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Запуск замеров из командной строки.
+
+    Returns:
+        0 — без замедлений, 1 — есть замедления относительно базовой линии.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Замеры производительности BookVault на синтетическом корпусе.",
+    )
+    parser.add_argument("--books", type=int, default=CorpusSpec.books)
+    parser.add_argument("--pages", type=int, default=CorpusSpec.pages)
+    parser.add_argument(
+        "--words", type=int, default=CorpusSpec.words_per_page, help="слов на странице"
+    )
+    parser.add_argument(
+        "--cyrillic",
+        type=float,
+        default=CorpusSpec.cyrillic_share,
+        help="доля кириллических слов (0..1)",
+    )
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed)
+    parser.add_argument(
+        "--list-rows", type=int, default=50_000, help="книг в БД для замеров списка"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="прогонов замера")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="процессов импорта/индексации"
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=BENCHMARKS, help="выполнить только эти замеры"
+    )
+    parser.add_argument(
+        "--corpus-dir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "bookvault-bench-corpus",
+        help="папка корпуса (переиспользуется при тех же параметрах)",
+    )
+    parser.add_argument("--output", type=Path, help="сохранить результаты в JSON")
+    parser.add_argument("--baseline", type=Path, help="сравнить с результатами JSON")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="допустимое замедление (0.25 — на 25%%)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.books < 1 or args.pages < 1 or args.words < 1:
+        parser.error("--books, --pages и --words должны быть положительными")
+    if not 0.0 <= args.cyrillic <= 1.0:
+        parser.error("--cyrillic должна быть от 0 до 1")
+
+    spec = CorpusSpec(
+        books=args.books,
+        pages=args.pages,
+        words_per_page=args.words,
+        cyrillic_share=args.cyrillic,
+        seed=args.seed,
+    )
+    baseline = load_baseline(args.baseline) if args.baseline else None
+
+    suite = BenchmarkSuite(
+        args.corpus_dir,
+        spec,
+        list_rows=args.list_rows,
+        repeat=args.repeat,
+        workers=args.workers,
+    )
+    results = suite.run(set(args.only) if args.only else None)
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(results_to_json(spec, results), ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        print(f"[BENCH] Результаты сохранены: {args.output}")
+
+    if baseline is None:
+        return 0
+
+    print(f"[BENCH] Сравнение с {args.baseline}:")
+    for result in results:
+        print(format_result(result, baseline))
+    regressions = compare(results, baseline, args.tolerance)
+    for r in regressions:
+        print(f"[BENCH] Замедление: {r.name} в {r.ratio:.2f} раза")
+    return 1 if regressions else 0
+
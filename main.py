@@ -1,11 +1,21 @@
-import sys
+import time
 
-from PySide6.QtWidgets import QApplication
+# Отсчёт времени запуска — до импорта Qt и модулей приложения
+_STARTED = time.perf_counter()
 
-from app.db import Database
-from app.services.settings_service import SettingsService
-from app.ui.main_window import MainWindow
-from app.ui.theme import apply_dark_palette, apply_light_palette, get_theme_stylesheet
+import sys  # noqa: E402
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from app.db import Database  # noqa: E402
+from app.services.settings_service import SettingsService  # noqa: E402
+from app.startup import StartupTimer  # noqa: E402
+from app.ui.main_window import MainWindow  # noqa: E402
+from app.ui.theme import (  # noqa: E402
+    apply_dark_palette,
+    apply_light_palette,
+    get_theme_stylesheet,
+)
 
 # ----------------------------------------------------------------------
 # Точка входа
@@ -13,11 +23,17 @@ from app.ui.theme import apply_dark_palette, apply_light_palette, get_theme_styl
 
 
 def main() -> int:
+    # Замеры запуска печатаются при BOOKVAULT_STARTUP_TIMING=1
+    startup = StartupTimer(_STARTED)
+    startup.mark("импорт")
+
     app = QApplication(sys.argv)
+    startup.mark("Qt")
 
     # База данных
     db = Database()
     db.initialize()
+    startup.mark("БД")
 
     settings = SettingsService(db)
     theme = settings.get("theme", "dark")
@@ -31,9 +47,10 @@ def main() -> int:
     app.setStyleSheet(get_theme_stylesheet(theme))
 
     # Главное окно
-    window = MainWindow(db=db)
+    window = MainWindow(db=db, startup=startup, settings=settings)
     window.resize(1200, 720)
     window.show()
+    startup.mark("окно")
 
     return app.exec()
 